@@ -0,0 +1,53 @@
+// Measure the main-thread cost of ambient playback for the original
+// ScriptProcessorNode engine (from the baseline commit) and the current one:
+//
+//     node benchmarks/audio.mjs [--seconds 60] [--baseline REV]
+//
+// Both engines run against the mock contexts in webaudio.mjs. For the original
+// engine, every onaudioprocess callback that a second of audio needs is run on
+// this thread; for the current engine, playback is scheduled entirely on audio
+// nodes, so the only main-thread work is play() itself (including the one-off
+// noise buffer). Times are the best of five runs, in milliseconds.
+
+import { baselineRevision, loadPage, option, time } from './page.mjs';
+import { audioGlobals } from './webaudio.mjs';
+
+const seconds = option('seconds', 60);
+const baseline = option('baseline', baselineRevision());
+const TRACKS = { ocean: 1, rain: 2, bowls: 3, wind: 5, calm: 4 };
+
+const legacy = loadPage(['AmbientSoundEngine'], { revision: baseline, globals: audioGlobals() });
+const current = loadPage(['AmbientSoundEngine'], { globals: audioGlobals() });
+
+const processors = (engine) => engine.audioContext.nodes.filter(node => node.kind === 'script-processor');
+
+const report = Object.entries(TRACKS).map(([kind, track]) => {
+  const old = new legacy.AmbientSoundEngine();
+  old.play(track);
+  const callbacks = processors(old).map(node => {
+    const event = { outputBuffer: node.outputBuffer };
+    return { run: () => node.onaudioprocess(event), perSecond: Math.ceil(old.audioContext.sampleRate / node.bufferSize) };
+  });
+  const legacyMs = time(() => callbacks.forEach(({ run, perSecond }) => {
+    for (let i = 0; i < perSecond * seconds; i++) run();
+  }));
+  const legacyStartMs = time(() => new legacy.AmbientSoundEngine().play(track));
+  
+  let engine = null;
+  const currentStartMs = time(() => {
+    engine = new current.AmbientSoundEngine();
+    engine.play(track);
+  });
+  
+  return {
+    kind,
+    legacyProcessors: callbacks.length,
+    legacyStartMs,
+    legacyMsPerSecond: legacyMs / seconds,
+    currentProcessors: processors(engine).length,
+    currentStartMs,
+    currentMsPerSecond: 0
+  };
+});
+
+console.log(JSON.stringify({ seconds, baseline, tracks: report }));
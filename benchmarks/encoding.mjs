@@ -0,0 +1,53 @@
+// Compare the columnar chunk encoding in the current page with plain JSON on
+// a synthetic history, chunked the way SegmentedLog seals it:
+//
+//     node benchmarks/encoding.mjs [--records 50000]
+//
+// Reports total bytes for each format and the best-of-five time, in
+// milliseconds, to parse every chunk back into records. It also times the
+// projected read the analytics worker does (id, type, date and moods only).
+
+import { loadPage, option, random, time } from './page.mjs';
+
+const records = option('records', 50000);
+const {
+  encodeChunk, decodeChunk, forEachChunkRecord, LOG_CHUNK_SIZE, MEDITATION_TYPE_IDS, ANALYTICS_FIELDS
+} = loadPage(['encodeChunk', 'decodeChunk', 'forEachChunkRecord', 'LOG_CHUNK_SIZE', 'MEDITATION_TYPE_IDS', 'ANALYTICS_FIELDS']);
+
+const next = random();
+const pick = (list) => list[Math.floor(next() * list.length)];
+const mood = () => 1 + Math.floor(next() * 5);
+const FEELINGS = ['', '', 'calmer', 'lighter', 'a bit restless', 'rested and clear', 'tired but okay'];
+const START = Date.UTC(2023, 0, 1);
+
+const sessions = Array.from({ length: records }, (_, i) => {
+  const id = START + i * 3600000 + Math.floor(next() * 1000);
+  return {
+    type: pick(MEDITATION_TYPE_IDS),
+    duration: pick([5, 10, 15, 20]),
+    moodBefore: mood(),
+    moodAfter: mood(),
+    prePrompts: { intention: pick(FEELINGS), bodyState: pick(FEELINGS) },
+    postPrompts: { feelingNow: pick(FEELINGS), emotions: pick(FEELINGS), oneWord: pick(['calm', 'peace', 'ok', '']) },
+    id,
+    date: new Date(id).toISOString()
+  };
+});
+
+const chunks = [];
+for (let i = 0; i < sessions.length; i += LOG_CHUNK_SIZE) chunks.push(sessions.slice(i, i + LOG_CHUNK_SIZE));
+const json = chunks.map(chunk => JSON.stringify(chunk));
+const encoded = chunks.map(chunk => encodeChunk(chunk));
+const bytes = (texts) => texts.reduce((sum, text) => sum + Buffer.byteLength(text), 0);
+const visit = () => {};
+
+console.log(JSON.stringify({
+  records,
+  chunkSize: LOG_CHUNK_SIZE,
+  bytes: { json: bytes(json), encoded: bytes(encoded) },
+  parseMs: {
+    json: time(() => json.forEach(text => JSON.parse(text))),
+    encoded: time(() => encoded.forEach(text => decodeChunk(text))),
+    encodedAnalytics: time(() => encoded.forEach(text => forEachChunkRecord(text, visit, ANALYTICS_FIELDS.session)))
+  }
+}));
@@ -0,0 +1,52 @@
+// Helpers shared by the benchmark scripts.
+//
+// loadPage evaluates the part of index.html above the SukoonApp component in a
+// fresh VM context and returns the named declarations. Pass a git revision to
+// load the page as it was at that commit instead of the working tree.
+
+import { execFileSync } from 'node:child_process';
+import { readFileSync } from 'node:fs';
+import { runInNewContext } from 'node:vm';
+
+const ROOT = new URL('../', import.meta.url);
+
+export const baselineRevision = () => execFileSync('git', ['rev-list', '--max-parents=0', 'HEAD'], { cwd: ROOT, encoding: 'utf8' })
+  .trim()
+  .split('\n')[0];
+
+export const pageSource = (revision) => revision
+  ? execFileSync('git', ['show', `${revision}:index.html`], { cwd: ROOT, encoding: 'utf8', maxBuffer: 1 << 26 })
+  : readFileSync(new URL('index.html', ROOT), 'utf8');
+
+export const loadPage = (names, { revision, globals = {} } = {}) => {
+  const html = pageSource(revision);
+  const prelude = html
+    .slice(0, html.indexOf('export default function SukoonApp'))
+    .split('\n')
+    .filter(line => !line.startsWith('import '))
+    .join('\n');
+  return runInNewContext(`${prelude}\n({ ${names.join(', ')} });`, { ...globals });
+};
+
+export const option = (name, fallback) => {
+  const index = process.argv.indexOf(`--${name}`);
+  if (index === -1) return fallback;
+  const value = process.argv[index + 1];
+  return typeof fallback === 'number' ? Number(value) : value;
+};
+
+export const random = (seed = 1) => () => {
+  seed = (seed * 1664525 + 1013904223) >>> 0;
+  return seed / 2 ** 32;
+};
+
+export const time = (run, repeat = 5) => {
+  run();
+  let best = Infinity;
+  for (let i = 0; i < repeat; i++) {
+    const start = performance.now();
+    run();
+    best = Math.min(best, performance.now() - start);
+  }
+  return best;
+};
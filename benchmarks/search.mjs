@@ -0,0 +1,82 @@
+// Build the full-text SearchIndex from the current page over a synthetic
+// history and time prefix, tag and date-range queries against it:
+//
+//     node benchmarks/search.mjs [--sizes 10000,100000] [--words 40]
+//
+// For each size, half of the entries are journals and half are sessions with
+// prompts. The report gives the index build time and, per query, the best of
+// twenty runs for the index and for a naive filter over the same documents,
+// all in milliseconds, and whether both return the same documents.
+
+import { loadPage, option, random, time } from './page.mjs';
+
+const sizes = option('sizes', '10000,100000').split(',').map(Number);
+const words = option('words', 40);
+
+const { SearchIndex, searchDocument, MEDITATION_TYPE_IDS } = loadPage(['SearchIndex', 'searchDocument', 'MEDITATION_TYPE_IDS']);
+
+const next = random();
+const pick = (list) => list[Math.floor(next() * list.length)];
+const syllables = ['ka', 'lo', 'mi', 'ne', 'ru', 'sa', 'ti', 'vo', 'pe', 'da', 'ge', 'hu'];
+const vocabulary = [
+  ...Array.from({ length: 3000 }, () => Array.from({ length: 2 + Math.floor(next() * 3) }, () => pick(syllables)).join('')),
+  'calm', 'calmer', 'calming', 'breath', 'breathing', 'grateful', 'gratitude', 'sleep', 'sleepy', 'tired'
+];
+const text = (count) => Array.from({ length: count }, () => pick(vocabulary)).join(' ');
+const START = Date.UTC(2022, 0, 1);
+const DAY = 86400000;
+
+const history = (size) => Array.from({ length: size }, (_, i) => {
+  const date = new Date(START + Math.floor(i * (3 * 365 * DAY) / size)).toISOString();
+  const type = pick(MEDITATION_TYPE_IDS);
+  return i % 2
+    ? searchDocument('journal', { id: i, date, type: 'Manual Entry', reflection: text(words), tags: [type] })
+    : searchDocument('session', {
+      id: i,
+      date,
+      type,
+      prePrompts: { intention: text(words / 4) },
+      postPrompts: { feelingNow: text(words / 4), emotions: text(words / 4), oneWord: pick(vocabulary) }
+    });
+});
+
+const naive = (docs, { query = '', tags = [], from = null, to = null, limit = 50 }) => {
+  const terms = query.toLowerCase().split(/\s+/).filter(Boolean);
+  return docs
+    .filter(doc => {
+      const time = new Date(doc.date).getTime();
+      return (from === null || time >= from) && (to === null || time < to) &&
+        tags.every(tag => doc.tags.includes(tag)) &&
+        terms.every(term => doc.tokens.some(token => token.startsWith(term)));
+    })
+    .sort((a, b) => b.date.localeCompare(a.date))
+    .slice(0, limit);
+};
+
+const month = { from: START + 400 * DAY, to: START + 430 * DAY };
+const QUERIES = {
+  prefix: { query: 'cal' },
+  terms: { query: 'calm breath' },
+  tag: { tags: ['sleep'] },
+  range: month,
+  combined: { query: 'gra', tags: ['gratitude'], ...month }
+};
+
+const reports = sizes.map(size => {
+  const docs = history(size);
+  let index;
+  const buildMs = time(() => {
+    index = new SearchIndex('sukoon-search-benchmark', {});
+    docs.forEach(doc => index.indexDocument(doc));
+    index.search({ query: 'warmup' });
+  }, 2);
+  const queries = Object.fromEntries(Object.entries(QUERIES).map(([name, query]) => [name, {
+    results: index.search(query).length,
+    matchesNaive: index.search(query).map(doc => doc.ref).join() === naive(docs, query).map(doc => doc.ref).join(),
+    indexMs: time(() => index.search(query), 20),
+    naiveMs: time(() => naive(docs, query), 3)
+  }]));
+  return { size, buildMs, queries };
+});
+
+console.log(JSON.stringify(reports));
@@ -0,0 +1,37 @@
+// Score a synthetic journal history with the original analyzeSentiment (from
+// the baseline commit) and with the compiled scorer in the current page:
+//
+//     node benchmarks/sentiment.mjs [--entries 10000] [--words 60] [--baseline REV]
+//
+// Prints the best of five runs for each scorer, in milliseconds.
+
+import { baselineRevision, loadPage, option, random, time } from './page.mjs';
+
+const entries = option('entries', 10000);
+const words = option('words', 60);
+const baseline = option('baseline', baselineRevision());
+
+const legacy = loadPage(['analyzeSentiment'], { revision: baseline });
+const current = loadPage(['analyzeSentiment', 'analyzeSentimentBatch', 'SENTIMENT_LEXICON']);
+
+const next = random();
+const vocabulary = [
+  ...Object.keys(current.SENTIMENT_LEXICON),
+  'not', 'never', "didn't",
+  ...'today the a and of to in my was felt after before session breath mind body morning evening work home'.split(' ')
+];
+const texts = Array.from({ length: entries }, () =>
+  Array.from({ length: words }, () => vocabulary[Math.floor(next() * vocabulary.length)]).join(' '));
+
+const legacyMs = time(() => texts.map(text => legacy.analyzeSentiment(text)));
+const currentMs = time(() => current.analyzeSentimentBatch(texts));
+
+console.log(JSON.stringify({
+  entries,
+  words,
+  baseline,
+  lexicon: Object.keys(current.SENTIMENT_LEXICON).length,
+  legacyMs,
+  currentMs,
+  speedup: legacyMs / currentMs
+}));
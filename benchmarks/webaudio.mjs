@@ -0,0 +1,164 @@
+// A Web Audio stand-in for running the page's sound engine under Node.
+//
+// Contexts record every node they create and every scheduled parameter change;
+// OfflineAudioContext renders silence after a short delay.
+
+class MockParam {
+  constructor(value) {
+    this.value = value;
+    this.events = [];
+  }
+  
+  record(type, ...args) {
+    this.events.push({ type, args });
+  }
+  
+  cancelScheduledValues(time) { this.record('cancel', time); }
+  
+  setValueAtTime(value, time) {
+    this.record('set', value, time);
+    this.value = value;
+  }
+  
+  linearRampToValueAtTime(value, time) { this.record('linear', value, time); }
+  
+  exponentialRampToValueAtTime(value, time) { this.record('exponential', value, time); }
+  
+  setTargetAtTime(value, time, constant) {
+    this.record('target', value, time, constant);
+    this.value = value;
+  }
+  
+  setValueCurveAtTime(curve, time, duration) {
+    this.record('curve', Float32Array.from(curve), time, duration);
+    this.value = curve[curve.length - 1];
+  }
+}
+
+class MockNode {
+  constructor(context, kind) {
+    this.context = context;
+    this.kind = kind;
+    this.outputs = new Set();
+    this.started = false;
+    this.stopped = false;
+    context.nodes.push(this);
+  }
+  
+  connect(destination) {
+    this.outputs.add(destination);
+    return destination;
+  }
+  
+  disconnect() {
+    this.outputs.clear();
+  }
+  
+  start() {
+    this.started = true;
+  }
+  
+  stop() {
+    this.stopped = true;
+  }
+}
+
+export class MockAudioBuffer {
+  constructor({ length, sampleRate, numberOfChannels = 1 }) {
+    this.length = length;
+    this.sampleRate = sampleRate;
+    this.channels = Array.from({ length: numberOfChannels }, () => new Float32Array(length));
+  }
+  
+  getChannelData(channel) {
+    return this.channels[channel];
+  }
+  
+  copyToChannel(samples, channel) {
+    this.channels[channel].set(samples);
+  }
+}
+
+export class MockAudioContext {
+  constructor({ sampleRate = 44100 } = {}) {
+    this.sampleRate = sampleRate;
+    this.currentTime = 0;
+    this.state = 'running';
+    this.nodes = [];
+    this.destination = new MockNode(this, 'destination');
+  }
+  
+  resume() {
+    this.state = 'running';
+    return Promise.resolve();
+  }
+  
+  suspend() {
+    this.state = 'suspended';
+    return Promise.resolve();
+  }
+  
+  createGain() {
+    const node = new MockNode(this, 'gain');
+    node.gain = new MockParam(1);
+    return node;
+  }
+  
+  createBiquadFilter() {
+    const node = new MockNode(this, 'filter');
+    node.frequency = new MockParam(350);
+    return node;
+  }
+  
+  createOscillator() {
+    const node = new MockNode(this, 'oscillator');
+    node.frequency = new MockParam(440);
+    return node;
+  }
+  
+  createBufferSource() {
+    return new MockNode(this, 'buffer-source');
+  }
+  
+  createScriptProcessor(bufferSize, inputs, outputs) {
+    const node = new MockNode(this, 'script-processor');
+    node.bufferSize = bufferSize;
+    node.outputBuffer = new MockAudioBuffer({ length: bufferSize, sampleRate: this.sampleRate, numberOfChannels: outputs });
+    return node;
+  }
+  
+  createBuffer(channels, length, sampleRate) {
+    return new MockAudioBuffer({ length, sampleRate, numberOfChannels: channels });
+  }
+  
+  live() {
+    const reachable = new Set();
+    const visit = (node) => {
+      if (reachable.has(node)) return;
+      reachable.add(node);
+      this.nodes.filter(other => other.outputs.has(node)).forEach(visit);
+    };
+    visit(this.destination);
+    reachable.delete(this.destination);
+    return [...reachable];
+  }
+}
+
+export class MockOfflineAudioContext extends MockAudioContext {
+  constructor(channels, length, sampleRate) {
+    super({ sampleRate });
+    this.length = length;
+  }
+  
+  startRendering() {
+    return new Promise(resolve => setTimeout(() => resolve(new MockAudioBuffer({ length: this.length, sampleRate: this.sampleRate })), 10));
+  }
+}
+
+export const audioGlobals = () => ({
+  window: { AudioContext: MockAudioContext, OfflineAudioContext: MockOfflineAudioContext },
+  OfflineAudioContext: MockOfflineAudioContext,
+  AudioBuffer: MockAudioBuffer,
+  setTimeout,
+  clearTimeout
+});
@@ -0,0 +1,67 @@
+"""Rebuild the content pack indexes and manifest under ``content/``.
+
+Guides live in ``content/guides/<type>.json`` and articles in
+``content/articles/<id>.json``. This script content-hashes every file and
+writes ``guides/index.json``, ``articles/index.json`` and ``manifest.json``,
+so clients only re-download the packs whose hash changed. Existing article
+order is kept and new articles are appended::
+
+    python build_content.py
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+CONTENT = Path(__file__).resolve().parent / 'content'
+VERSION = 1
+ARTICLE_SUMMARY = ('id', 'title', 'description', 'category', 'icon')
+
+
+def content_hash(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+
+
+def write_json(path, value):
+    path.write_text(json.dumps(value, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+    return content_hash(path)
+
+
+def entry(path):
+    return {'path': path.relative_to(CONTENT).as_posix(), 'hash': content_hash(path)}
+
+
+def build_guides():
+    items = {path.stem: entry(path) for path in sorted((CONTENT / 'guides').glob('*.json')) if path.stem != 'index'}
+    return write_json(CONTENT / 'guides' / 'index.json', {'version': VERSION, 'items': items})
+
+
+def build_articles():
+    index_path = CONTENT / 'articles' / 'index.json'
+    previous = json.loads(index_path.read_text(encoding='utf-8'))['items'] if index_path.exists() else []
+    paths = {path.stem: path for path in (CONTENT / 'articles').glob('*.json') if path.stem != 'index'}
+    order = [item['id'] for item in previous if item['id'] in paths]
+    order += sorted(set(paths) - set(order))
+
+    items = []
+    for article_id in order:
+        article = json.loads(paths[article_id].read_text(encoding='utf-8'))
+        summary = {key: article[key] for key in ARTICLE_SUMMARY}
+        items.append({**summary, **entry(paths[article_id])})
+    return write_json(index_path, {'version': VERSION, 'items': items})
+
+
+def main():
+    manifest = {
+        'version': VERSION,
+        'packs': {
+            'affirmations': entry(CONTENT / 'affirmations.json'),
+            'guides': {'path': 'guides/index.json', 'hash': build_guides()},
+            'articles': {'path': 'articles/index.json', 'hash': build_articles()},
+        },
+    }
+    write_json(CONTENT / 'manifest.json', manifest)
+
+
+if __name__ == '__main__':
+    main()
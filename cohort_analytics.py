@@ -0,0 +1,377 @@
+"""Cohort analytics over Sukoon session logs.
+
+Computes the metrics ``ProgressView`` shows per browser (total minutes,
+average mood improvement, most effective practice, type distribution and
+current streak) for every user at once.
+
+Sessions are ingested either from the sync service database
+(``sync_server.py``) or from the app's NDJSON history exports. Export lines
+carry a ``kind``; only ``session`` lines are used. The app does not write a
+user into the export, so each file is given as ``USER=PATH`` unless its
+lines carry their own ``user`` field. Lines that are not valid sessions or
+have no user are counted and skipped.
+
+Each batch is folded into per-(user, day, type) rollups kept in a small
+SQLite database, together with the ``(user, id)`` of every session already
+counted. Exports are full snapshots that are re-written in place, so NDJSON
+files are re-read on every run and only unseen sessions are aggregated;
+the sync database is read from the last sequence number. The report is
+computed from the compact rollups::
+
+    python cohort_analytics.py --rollups rollups.db --sync-db sukoon.db
+    python cohort_analytics.py --rollups rollups.db --ndjson alice=exports/alice.ndjson bob=exports/bob.ndjson
+    python cohort_analytics.py --rollups rollups.db --report --utc-offset 330
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily (
+    user TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    sessions INTEGER NOT NULL,
+    minutes INTEGER NOT NULL,
+    improvement INTEGER NOT NULL,
+    PRIMARY KEY (user, day, type)
+);
+CREATE TABLE IF NOT EXISTS sources (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS seen (
+    user TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    PRIMARY KEY (user, id)
+) WITHOUT ROWID;
+CREATE TEMP TABLE IF NOT EXISTS claims (
+    position INTEGER PRIMARY KEY,
+    user TEXT NOT NULL,
+    id INTEGER NOT NULL
+);
+"""
+
+BATCH_ROWS = 100_000
+MS_PER_DAY = 86_400_000
+
+
+def day_numbers(dates, utc_offset_minutes):
+    """Map ISO timestamps to local day numbers (days since 1970-01-01)."""
+    stamps = np.array([date[:-1] if date.endswith('Z') else date for date in dates], dtype='datetime64[ms]')
+    local = stamps.astype(np.int64) + utc_offset_minutes * 60_000
+    return np.floor_divide(local, MS_PER_DAY)
+
+
+def rollup(users, dates, types, durations, improvements, utc_offset_minutes):
+    """Aggregate one batch of sessions into ``(user, day, type, sessions, minutes, improvement)`` rows."""
+    if len(users) == 0:
+        return []
+    user_names, user_codes = np.unique(np.asarray(users), return_inverse=True)
+    type_names, type_codes = np.unique(np.asarray(types), return_inverse=True)
+    days = day_numbers(dates, utc_offset_minutes)
+    keys = np.stack([user_codes, days, type_codes], axis=1)
+    groups, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    sessions = np.bincount(inverse, minlength=len(groups))
+    minutes = np.bincount(inverse, weights=np.asarray(durations, dtype=np.float64), minlength=len(groups))
+    improvement = np.bincount(inverse, weights=np.asarray(improvements, dtype=np.float64), minlength=len(groups))
+    return [
+        (str(user_names[u]), int(d), str(type_names[t]), int(n), int(m), int(i))
+        for (u, d, t), n, m, i in zip(groups.tolist(), sessions, minutes, improvement)
+    ]
+
+
+class RollupStore:
+    """Daily rollups, the ``(user, id)`` of every counted session and the sync database position."""
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(ROLLUP_SCHEMA)
+
+    def position(self, source):
+        row = self.connection.execute('SELECT position FROM sources WHERE name = ?', (source,)).fetchone()
+        return row[0] if row else 0
+
+    def merge(self, source, position, sessions, utc_offset_minutes):
+        """Fold the sessions not counted before into the rollups in one transaction.
+
+        ``sessions`` is a tuple of parallel ``users, ids, dates, types,
+        durations, improvements`` sequences. ``source`` is advanced to
+        ``position`` unless it is ``None``. Returns the number of new sessions.
+        """
+        users, ids = sessions[0], sessions[1]
+        with self.connection:
+            self.connection.execute('DELETE FROM claims')
+            self.connection.executemany('INSERT INTO claims VALUES (?, ?, ?)', zip(range(len(ids)), users, ids))
+            fresh = [row[0] for row in self.connection.execute(
+                'SELECT MIN(position) FROM claims AS c '
+                'WHERE NOT EXISTS (SELECT 1 FROM seen AS s WHERE s.user = c.user AND s.id = c.id) '
+                'GROUP BY user, id ORDER BY 1'
+            )]
+            self.connection.execute('INSERT OR IGNORE INTO seen SELECT user, id FROM claims')
+            users, _, dates, types, durations, improvements = ([column[i] for i in fresh] for column in sessions)
+            rows = rollup(users, dates, types, durations, improvements, utc_offset_minutes)
+            self.connection.executemany(
+                'INSERT INTO daily VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (user, day, type) DO UPDATE SET '
+                'sessions = sessions + excluded.sessions, '
+                'minutes = minutes + excluded.minutes, '
+                'improvement = improvement + excluded.improvement',
+                rows,
+            )
+            if source is not None:
+                self.connection.execute(
+                    'INSERT INTO sources VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET position = excluded.position',
+                    (source, position),
+                )
+        return len(fresh)
+
+    def columns(self):
+        rows = self.connection.execute('SELECT user, day, type, sessions, minutes, improvement FROM daily').fetchall()
+        if not rows:
+            return None
+        users, days, types, sessions, minutes, improvement = zip(*rows)
+        return {
+            'users': np.asarray(users),
+            'days': np.asarray(days, dtype=np.int64),
+            'types': np.asarray(types),
+            'sessions': np.asarray(sessions, dtype=np.int64),
+            'minutes': np.asarray(minutes, dtype=np.int64),
+            'improvement': np.asarray(improvement, dtype=np.int64),
+        }
+
+    def close(self):
+        self.connection.close()
+
+
+def ingest_sync_db(store, path, utc_offset_minutes):
+    """Fold sessions added to a sync service database since the last run."""
+    source = f'sync:{Path(path).resolve()}'
+    position = store.position(source)
+    connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    counts = Counter()
+    try:
+        while True:
+            rows = connection.execute(
+                'SELECT seq, user, id, date, type, duration, mood_after - mood_before FROM sessions '
+                'WHERE seq > ? ORDER BY seq LIMIT ?',
+                (position, BATCH_ROWS),
+            ).fetchall()
+            if not rows:
+                break
+            seqs, *sessions = zip(*rows)
+            position = seqs[-1]
+            new = store.merge(source, position, sessions, utc_offset_minutes)
+            counts['sessions'] += new
+            counts['duplicates'] += len(rows) - new
+    finally:
+        connection.close()
+    return +counts
+
+
+def is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool) and -2**63 <= value < 2**63
+
+
+def is_timestamp(value):
+    if not isinstance(value, str):
+        return False
+    try:
+        np.datetime64(value[:-1] if value.endswith('Z') else value, 'ms')
+    except ValueError:
+        return False
+    return True
+
+
+def session_columns(record, user):
+    """``(user, id, date, type, duration, improvement)`` for a valid session record, else ``None``."""
+    if not isinstance(user, str) or not user:
+        return None
+    id_, date, type_, duration = record.get('id'), record.get('date'), record.get('type'), record.get('duration')
+    before, after = record.get('moodBefore'), record.get('moodAfter')
+    if not (is_int(id_) and is_timestamp(date) and isinstance(type_, str)):
+        return None
+    if not (isinstance(duration, (int, float)) and not isinstance(duration, bool) and is_int(before) and is_int(after)):
+        return None
+    return user, id_, date, type_, duration, after - before
+
+
+def ingest_ndjson(store, path, utc_offset_minutes, user=None):
+    """Fold the sessions in an NDJSON export that have not been counted yet.
+
+    ``user`` is used for lines without a ``user`` field. Returns counts of new
+    and duplicate sessions, non-session lines, lines without a user and
+    invalid lines.
+    """
+    counts = Counter()
+    batch = []
+
+    def flush():
+        new = store.merge(None, None, tuple(zip(*batch)), utc_offset_minutes)
+        counts['sessions'] += new
+        counts['duplicates'] += len(batch) - new
+        batch.clear()
+
+    with Path(path).open('rb') as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                counts['invalid'] += 1
+                continue
+            if not isinstance(record, dict):
+                counts['invalid'] += 1
+                continue
+            if record.get('kind', 'session') != 'session':
+                counts['skipped'] += 1
+                continue
+            owner = record.get('user', user)
+            if owner is None:
+                counts['unattributed'] += 1
+                continue
+            columns = session_columns(record, owner)
+            if columns is None:
+                counts['invalid'] += 1
+                continue
+            batch.append(columns)
+            if len(batch) >= BATCH_ROWS:
+                flush()
+    if batch:
+        flush()
+    return +counts
+
+
+def current_streaks(users, days, today):
+    """Vectorised ``countStreak``: consecutive active days ending today or yesterday."""
+    active = days <= today
+    users, days = users[active], days[active]
+    if len(users) == 0:
+        return {}
+    order = np.lexsort((days, users))
+    users, days = users[order], days[order]
+    distinct = np.ones(len(days), dtype=bool)
+    distinct[1:] = (users[1:] != users[:-1]) | (days[1:] != days[:-1])
+    users, days = users[distinct], days[distinct]
+
+    run_start = np.ones(len(days), dtype=bool)
+    run_start[1:] = (users[1:] != users[:-1]) | (days[1:] != days[:-1] + 1)
+    starts = np.flatnonzero(run_start)
+    ends = np.append(starts[1:], len(days)) - 1
+    last_run = np.ones(len(starts), dtype=bool)
+    last_run[:-1] = users[starts[1:]] != users[starts[:-1]]
+    starts, ends = starts[last_run], ends[last_run]
+    lengths = np.where(days[ends] >= today - 1, ends - starts + 1, 0)
+    return dict(zip(users[starts].tolist(), lengths.tolist()))
+
+
+def most_effective(type_names, codes, sessions, improvement):
+    """Type with the highest mean improvement, as ``getMostEffectiveType`` picks it."""
+    counts = np.bincount(codes, weights=sessions, minlength=len(type_names))
+    totals = np.bincount(codes, weights=improvement, minlength=len(type_names))
+    seen = counts > 0
+    if not seen.any():
+        return None
+    means = np.full(len(type_names), -np.inf)
+    means[seen] = totals[seen] / counts[seen]
+    return str(type_names[int(np.argmax(means))])
+
+
+def report(store, today):
+    """Cohort and per-user metrics computed from the rollups."""
+    columns = store.columns()
+    if columns is None:
+        return {'users': 0, 'sessions': 0}
+    user_names, user_codes = np.unique(columns['users'], return_inverse=True)
+    type_names, type_codes = np.unique(columns['types'], return_inverse=True)
+    sessions, minutes, improvement = columns['sessions'], columns['minutes'], columns['improvement']
+
+    user_sessions = np.bincount(user_codes, weights=sessions, minlength=len(user_names))
+    user_minutes = np.bincount(user_codes, weights=minutes, minlength=len(user_names))
+    user_improvement = np.bincount(user_codes, weights=improvement, minlength=len(user_names))
+    type_sessions = np.bincount(type_codes, weights=sessions, minlength=len(type_names))
+    streaks = current_streaks(columns['users'], columns['days'], today)
+
+    pair_codes = user_codes * len(type_names) + type_codes
+    pair_sessions = np.bincount(pair_codes, weights=sessions, minlength=len(user_names) * len(type_names))
+    pair_improvement = np.bincount(pair_codes, weights=improvement, minlength=len(user_names) * len(type_names))
+    pair_sessions = pair_sessions.reshape(len(user_names), len(type_names))
+    pair_means = np.divide(
+        pair_improvement.reshape(len(user_names), len(type_names)),
+        pair_sessions,
+        out=np.full(pair_sessions.shape, -np.inf),
+        where=pair_sessions > 0,
+    )
+    best_types = type_names[np.argmax(pair_means, axis=1)]
+
+    streak_values = np.array([streaks.get(name, 0) for name in user_names.tolist()])
+    return {
+        'users': len(user_names),
+        'sessions': int(sessions.sum()),
+        'totalMinutes': int(minutes.sum()),
+        'averageMoodImprovement': round(float(improvement.sum() / sessions.sum()), 2),
+        'mostEffectiveType': most_effective(type_names, type_codes, sessions, improvement),
+        'typeDistribution': {str(name): int(count) for name, count in zip(type_names, type_sessions)},
+        'streaks': {
+            'active': int((streak_values > 0).sum()),
+            'mean': round(float(streak_values.mean()), 2),
+            'max': int(streak_values.max()),
+        },
+        'perUser': {
+            str(name): {
+                'sessions': int(user_sessions[i]),
+                'totalMinutes': int(user_minutes[i]),
+                'averageMoodImprovement': round(float(user_improvement[i] / user_sessions[i]), 2),
+                'mostEffectiveType': str(best_types[i]),
+                'streak': int(streak_values[i]),
+            }
+            for i, name in enumerate(user_names.tolist())
+        },
+    }
+
+
+def format_counts(counts):
+    return ', '.join(f'{count} {name}' for name, count in counts.items()) or 'nothing new'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rollups', default='rollups.db')
+    parser.add_argument('--sync-db')
+    parser.add_argument('--ndjson', nargs='*', default=[], metavar='[USER=]PATH',
+                        help='history exports; USER is required unless every line has a user field')
+    parser.add_argument('--utc-offset', type=int, default=0, help='local time offset in minutes, e.g. 330 for IST')
+    parser.add_argument('--report', action='store_true')
+    parser.add_argument('--today', help='YYYY-MM-DD used for streaks (defaults to the current local day)')
+    args = parser.parse_args()
+
+    store = RollupStore(args.rollups)
+    try:
+        if args.sync_db:
+            print(f'{args.sync_db}: {format_counts(ingest_sync_db(store, args.sync_db, args.utc_offset))}', file=sys.stderr)
+        for entry in args.ndjson:
+            user, _, path = entry.partition('=') if '=' in entry else (None, '', entry)
+            counts = ingest_ndjson(store, path, args.utc_offset, user)
+            print(f'{path}: {format_counts(counts)}', file=sys.stderr)
+        if args.report:
+            if args.today:
+                today = int(np.datetime64(args.today, 'D').astype(np.int64))
+            else:
+                now = np.datetime64('now', 'ms').astype(np.int64) + args.utc_offset * 60_000
+                today = int(now // MS_PER_DAY)
+            json.dump(report(store, today), sys.stdout, indent=2)
+            print()
+    finally:
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
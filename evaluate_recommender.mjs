@@ -0,0 +1,58 @@
+// Replay exported Sukoon histories through the recommendation model.
+//
+// The model code is loaded from index.html, and every session in each NDJSON
+// history export (Progress > Export NDJSON) is fed to evaluateRecommender in
+// date order. One JSON report is printed per file: how often the user
+// followed the recommendation, the mood change when they did and did not,
+// and the model's mean absolute error against a running-mean baseline:
+//
+//     node evaluate_recommender.mjs sukoon-history.ndjson [more.ndjson ...]
+
+import { createReadStream, readFileSync } from 'node:fs';
+import { createInterface } from 'node:readline';
+import { runInNewContext } from 'node:vm';
+
+const loadModel = () => {
+  const html = readFileSync(new URL('./index.html', import.meta.url), 'utf8');
+  const prelude = html
+    .slice(0, html.indexOf('export default function SukoonApp'))
+    .split('\n')
+    .filter(line => !line.startsWith('import '))
+    .join('\n');
+  return runInNewContext(`${prelude}\n({ evaluateRecommender, IMPORT_VALIDATORS });`, {});
+};
+
+const readSessions = async (path, isSession) => {
+  const sessions = [];
+  let invalid = 0;
+  for await (const line of createInterface({ input: createReadStream(path), crlfDelay: Infinity })) {
+    if (!line.trim()) continue;
+    try {
+      const { kind = 'session', ...record } = JSON.parse(line);
+      if (kind !== 'session') continue;
+      if (isSession(record)) {
+        sessions.push(record);
+      } else {
+        invalid++;
+      }
+    } catch (error) {
+      invalid++;
+    }
+  }
+  return { sessions: sessions.sort((a, b) => Date.parse(a.date) - Date.parse(b.date)), invalid };
+};
+
+const main = async (paths) => {
+  if (paths.length === 0) {
+    console.error('usage: node evaluate_recommender.mjs HISTORY.ndjson [...]');
+    process.exitCode = 2;
+    return;
+  }
+  const { evaluateRecommender, IMPORT_VALIDATORS } = loadModel();
+  for (const path of paths) {
+    const { sessions, invalid } = await readSessions(path, IMPORT_VALIDATORS.session);
+    console.log(JSON.stringify({ file: path, ...evaluateRecommender(sessions), invalid }));
+  }
+};
+
+main(process.argv.slice(2));
@@ -1,7 +1,6 @@
 import React;
-import { useState, useEffect, useRef } from 'react';
+import { useState, useEffect, useLayoutEffect, useMemo, useRef } from 'react';
 import { Heart, Music, BookOpen, TrendingUp, Play, Pause, Volume2, VolumeX, Clock, Calendar, Award, Sparkles, Star, Home } from 'lucide-react';
-import { LineChart, Line, BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer } from 'recharts';
 
 const MEDITATION_TYPES = [
   { id: 'calm', name: 'Calm', icon: '🌊', color: 'bg-blue-100', description: 'Find inner peace' },
@@ -26,18 +25,7 @@ const MUSIC_TRACKS = [
   { id: 8, name: 'Forest Stream', category: 'nature', emoji: '🏞️' }
 ];
 
-const AFFIRMATIONS = [
-  "I am present in this moment",
-  "Peace begins with me",
-  "I trust the journey of my life",
-  "Every breath brings calm",
-  "I am worthy of inner peace",
-  "My mind is clear and focused",
-  "I release what I cannot control",
-  "I am grateful for this moment",
-  "Stillness is my natural state",
-  "I honor my healing process"
-];
+const LOG_CHUNK_SIZE = 50;
 
 const MOODS = [
   { emoji: '😊', label: 'Happy', value: 5 },
@@ -48,433 +36,2330 @@ const MOODS = [
   { emoji: '🙏', label: 'Grateful', value: 5 }
 ];
 
-const MEDITATION_GUIDES = {
-  calm: {
-    title: "Calm Meditation Guide",
-    instructions: [
-      "Find a comfortable seated position with your spine straight but relaxed",
-      "Close your eyes gently or maintain a soft downward gaze",
-      "Take three deep breaths - inhale through your nose, exhale through your mouth",
-      "Let your breathing return to its natural rhythm",
-      "Focus your attention on the sensation of breath at your nostrils or chest",
-      "When your mind wanders (and it will), gently bring it back to your breath",
-      "Notice the pause between inhale and exhale",
-      "Allow any thoughts to pass like clouds in the sky",
-      "Rest in the stillness between thoughts",
-      "Feel the waves of calm washing over you with each exhale"
-    ],
-    mantra: "I am calm. I am peace. I am stillness."
-  },
-  focus: {
-    title: "Focus Meditation Guide",
-    instructions: [
-      "Sit upright with alertness in your posture",
-      "Choose a single point of focus - your breath, a candle flame, or a mantra",
-      "Set your intention: 'I dedicate this time to developing concentration'",
-      "Gently place your full attention on your chosen object",
-      "Count your breaths from 1 to 10, then start again",
-      "When distracted, acknowledge the thought and return to counting",
-      "Strengthen your focus like training a muscle",
-      "Notice when your mind is sharp versus dull",
-      "Maintain steady, continuous awareness",
-      "End by noticing your enhanced mental clarity"
-    ],
-    mantra: "One breath. One moment. One point of focus."
-  },
-  healing: {
-    title: "Healing Meditation Guide",
-    instructions: [
-      "Settle into a position that feels nurturing and safe",
-      "Place one hand on your heart, one on your belly",
-      "Breathe deeply into your hands, feeling them rise and fall",
-      "Visualize a warm, golden light at your heart center",
-      "With each inhale, draw in healing energy",
-      "With each exhale, release pain, tension, and what no longer serves you",
-      "Let the golden light expand through your entire body",
-      "Send healing energy to any area that needs it",
-      "Acknowledge your wounds with compassion",
-      "Affirm: 'I am healing. I am whole. I am enough.'"
-    ],
-    mantra: "Every breath heals me. Every moment restores me."
-  },
-  awareness: {
-    title: "Awareness Meditation Guide",
-    instructions: [
-      "Sit in a position of dignified presence",
-      "Open your awareness like the vast sky",
-      "Notice whatever arises - sounds, sensations, thoughts, emotions",
-      "Don't focus on anything specifically; remain open to everything",
-      "Observe without labeling or judging",
-      "Notice the spacious awareness that contains all experiences",
-      "Recognize that you are the awareness, not the content",
-      "Expand your consciousness beyond the boundaries of your body",
-      "Rest as pure witnessing presence",
-      "Simply be aware that you are aware"
-    ],
-    mantra: "I am the witness. I am consciousness itself."
-  },
-  gratitude: {
-    title: "Gratitude Meditation Guide",
-    instructions: [
-      "Settle into your seat with a gentle smile",
-      "Place your hands over your heart",
-      "Take a moment to feel the gift of this breath",
-      "Bring to mind three things you're grateful for today",
-      "Really feel the appreciation in your body",
-      "Thank your body for carrying you through life",
-      "Appreciate someone who has helped you",
-      "Feel gratitude for challenges that helped you grow",
-      "Extend thanks to the air you breathe, the earth beneath you",
-      "Let your heart overflow with appreciation for this precious life"
-    ],
-    mantra: "Thank you. I am grateful. I am blessed."
-  },
-  balance: {
-    title: "Balance Meditation Guide",
-    instructions: [
-      "Find your center - physically and mentally",
-      "Notice the balance between effort and ease in your posture",
-      "Breathe equally through both nostrils if possible",
-      "Visualize yourself as a mountain - stable yet flexible",
-      "Acknowledge both light and shadow within you",
-      "Balance acceptance with aspiration",
-      "Honor rest as much as action",
-      "Find equilibrium between giving and receiving",
-      "Notice the still point at the center of all movement",
-      "Rest in the balance of being"
-    ],
-    mantra: "I am centered. I am balanced. I am whole."
-  },
-  sleep: {
-    title: "Sleep Meditation Guide",
-    instructions: [
-      "Lie down in a comfortable position for sleep",
-      "Let your body sink into the surface beneath you",
-      "Take several deep, slow breaths, releasing tension with each exhale",
-      "Progressively relax each part of your body from head to toes",
-      "Let go of the day - all tasks, worries, and thoughts",
-      "Imagine yourself floating on calm, warm water",
-      "With each breath, drift deeper into relaxation",
-      "Allow thoughts to dissolve like mist",
-      "Trust that sleep will come naturally",
-      "Surrender completely to rest"
-    ],
-    mantra: "I release the day. I welcome deep, peaceful sleep."
-  },
-  energy: {
-    title: "Energy Boost Meditation Guide",
-    instructions: [
-      "Sit upright with an energized posture",
-      "Take several quick, energizing breaths (breath of fire)",
-      "Visualize bright, vibrant light entering your body",
-      "Feel energy gathering at your solar plexus",
-      "With each inhale, draw in vitality and life force",
-      "Imagine roots growing from your feet, drawing energy from the earth",
-      "Feel your spine as a channel of flowing energy",
-      "Clench and release your fists to activate your body",
-      "Affirm your strength and vitality",
-      "End with lion's breath - exhale forcefully with tongue out"
-    ],
-    mantra: "I am alive. I am energized. I am powerful."
-  },
-  release: {
-    title: "Emotional Release Meditation Guide",
-    instructions: [
-      "Find a private space where you can express freely",
-      "Allow yourself to feel whatever emotions are present",
-      "Take deep breaths into the center of the emotion",
-      "Don't suppress or judge - just feel and observe",
-      "Visualize the emotion as a color or energy",
-      "With each exhale, imagine releasing this energy",
-      "You might cry, shake, or feel waves of sensation - this is healing",
-      "Place your hands on any area holding tension",
-      "Speak or write what needs to be expressed",
-      "Conclude by filling the space with light and peace"
-    ],
-    mantra: "I release what no longer serves me. I am free."
-  }
-};
+const MOOD_BY_VALUE = MOODS.reduceRight((map, mood) => ({ ...map, [mood.value]: mood }), {});
 
-const LEARN_CONTENT = [
-  {
-    title: "How Meditation Calms the Nervous System",
-    description: "Understanding the science behind mindful breathing and stress reduction",
-    category: "Science",
-    icon: "🧠",
-    fullContent: `Meditation activates the parasympathetic nervous system, which is responsible for the body "rest and digest" response. When you meditate:
-
- "Your heart rate slows down"
- "Blood pressure decreases"
- "Stress hormones like cortisol are reduced"
- "The amygdala (fear center) becomes less reactive"
- "The prefrontal cortex (reasoning center) becomes more active"
-
-Regular practice can actually change the structure of your brain, increasing gray matter in areas associated with emotional regulation, learning, and memory. Even 10 minutes a day can make a significant difference in how your nervous system responds to stress.`
-  },
-  {
-    title: "Self-Realization through Chakra Meditation",
-    description: "Ancient practices for balancing your energy centers",
-    category: "Spiritual",
-    icon: "🕉️",
-    fullContent: `The chakra system represents seven energy centers in your body, from the base of your spine to the crown of your head:
-
-1. Root Chakra (Muladhara) - Grounding and survival
-2. Sacral Chakra (Svadhisthana) - Creativity and emotions
-3. Solar Plexus (Manipura) - Personal power and confidence
-4. Heart Chakra (Anahata) - Love and compassion
-5. Throat Chakra (Vishuddha) - Communication and truth
-6. Third Eye (Ajna) - Intuition and insight
-7. Crown Chakra (Sahasrara) - Spiritual connection
-
-To practice: Sit comfortably, focus on each chakra location, visualize its associated color, and breathe into that area. Notice any sensations, emotions, or blockages.`
-  },
-  {
-    title: "Grounding Techniques for Anxiety",
-    description: "Quick exercises to return to the present moment",
-    category: "Practice",
-    icon: "🌱",
-    fullContent: `When anxiety strikes, these grounding techniques can bring you back to the present:
-
-5-4-3-2-1 Method:
- "Name 5 things you can see"
- "4 things you can touch"
- "3 things you can hear"
- "2 things you can smell"
- "1 thing you can taste"
-
-Physical Grounding:
- "Press your feet firmly into the floor"
- "Hold ice cubes in your hands"
- "Splash cold water on your face"
- "Do progressive muscle relaxation"`
-  },
-  {
-    title: "The Art of Body Scan Meditation",
-    description: "Progressive relaxation for deep healing",
-    category: "Technique",
-    icon: "✨",
-    fullContent: `Body scan meditation is a systematic way to release tension and develop body awareness:
-
-How to Practice:
-1. Lie down or sit comfortably
-2. Close your eyes and take several deep breaths
-3. Start at the top of your head
-4. Slowly move attention down through each body part
-5. Notice sensations without judgment
-6. Breathe into areas of tension
-7. Continue down to your toes
-
-Practice for 10-30 minutes daily.`
-  },
-  {
-    title: "Loving-Kindness Meditation",
-    description: "Cultivate compassion for yourself and others",
-    category: "Heart",
-    icon: "💗",
-    fullContent: `Loving-kindness (Metta) meditation develops unconditional love and compassion:
-
-Phrases to repeat:
- 1. May I/you be safe
- 2. May I/you be healthy
- 3. May I/you be happy
- 4. May I/you live with ease
-
-Begin with yourself, then extend to loved ones, neutral people, difficult people, and all beings.`
-  }
-];
+const MEDITATION_TYPE_BY_ID = MEDITATION_TYPES.reduce((map, type) => ({ ...map, [type.id]: type }), {});
+
+const JOURNAL_DATE_FORMAT = new Intl.DateTimeFormat('en-US', {
+  weekday: 'long',
+  year: 'numeric',
+  month: 'long',
+  day: 'numeric'
+});
+
+const NOISE_LOOP_SECONDS = 5;
+const CROSSFADE_SECONDS = 1.5;
+const CROSSFADE_STEPS = 64;
+const RENDERED_LOOP_SECONDS = 16;
+const RENDERED_SAMPLE_RATE = 22050;
+const AUDIO_CACHE = 'sukoon-audio-v1';
+
+const VOICE_KINDS = ['ocean', 'rain', 'bowls', 'wind', 'calm'];
+const VOICE_FOR_TRACK = { 1: 'ocean', 2: 'rain', 3: 'bowls', 5: 'wind', 6: 'rain', 7: 'bowls', 8: 'wind' };
+
+const renderedLoopUrl = (kind) => `/sukoon-audio/${kind}-${RENDERED_SAMPLE_RATE}-${RENDERED_LOOP_SECONDS}.pcm`;
 
 class AmbientSoundEngine {
   constructor() {
     this.audioContext = null;
-    this.oscillators = [];
-    this.gainNodes = [];
+    this.masterGain = null;
+    this.noiseBuffer = null;
+    this.loops = {};
+    this.voices = {};
+    this.activeVoice = null;
+    this.volume = 0.5;
+    this.suspendTimer = null;
     this.isPlaying = false;
   }
   
   init() {
     if (!this.audioContext) {
       this.audioContext = new (window.AudioContext || window.webkitAudioContext)();
+      this.masterGain = this.audioContext.createGain();
+      this.masterGain.gain.value = 0.3 * this.volume;
+      this.masterGain.connect(this.audioContext.destination);
+    }
+  }
+  
+  async prepare() {
+    if (!window.OfflineAudioContext) return;
+    let cache = null;
+    try {
+      if (window.caches) cache = await window.caches.open(AUDIO_CACHE);
+    } catch (error) {}
+    
+    for (const kind of VOICE_KINDS) {
+      try {
+        this.loops[kind] = (await this.readCachedLoop(cache, kind)) || (await this.renderLoop(cache, kind));
+        this.useRenderedLoop(kind);
+      } catch (error) {
+        console.error('Error:', error);
+      }
     }
   }
   
+  async readCachedLoop(cache, kind) {
+    const response = cache && await cache.match(renderedLoopUrl(kind));
+    if (!response) return null;
+    const samples = new Float32Array(await response.arrayBuffer());
+    const buffer = new AudioBuffer({ length: samples.length, sampleRate: RENDERED_SAMPLE_RATE });
+    buffer.copyToChannel(samples, 0);
+    return buffer;
+  }
+  
+  async renderLoop(cache, kind) {
+    const context = new OfflineAudioContext(1, RENDERED_SAMPLE_RATE * RENDERED_LOOP_SECONDS, RENDERED_SAMPLE_RATE);
+    const voice = { gain: context.createGain(), envelopes: [], sources: [] };
+    voice.gain.connect(context.destination);
+    this.createSources(context, kind, voice);
+    this.triggerEnvelopes(context, voice, 0.01);
+    
+    const buffer = await context.startRendering();
+    if (cache) {
+      await cache.put(renderedLoopUrl(kind), new Response(buffer.getChannelData(0).slice().buffer));
+    }
+    return buffer;
+  }
+  
   play(trackType) {
     this.init();
-    this.stop();
+    clearTimeout(this.suspendTimer);
+    if (this.audioContext.state === 'suspended') this.audioContext.resume();
     
-    const masterGain = this.audioContext.createGain();
-    masterGain.gain.value = 0.3;
-    masterGain.connect(this.audioContext.destination);
-    
-    if (trackType === 1) {
-      this.createOceanWaves(masterGain);
-    } else if (trackType === 2 || trackType === 6) {
-      this.createRain(masterGain);
-    } else if (trackType === 3 || trackType === 7) {
-      this.createSingingBowls(masterGain);
-    } else if (trackType === 5 || trackType === 8) {
-      this.createWind(masterGain);
-    } else {
-      this.createCalm(masterGain);
+    const voice = this.getVoice(VOICE_FOR_TRACK[trackType] || 'calm');
+    if (voice !== this.activeVoice) {
+      if (this.activeVoice) this.fade(this.activeVoice, 0);
+      this.triggerEnvelopes(this.audioContext, voice, 0);
+      this.fade(voice, 1);
+      this.activeVoice = voice;
     }
     
     this.isPlaying = true;
   }
   
-  createOceanWaves(destination) {
-    const bufferSize = 4096;
-    const whiteNoise = this.audioContext.createScriptProcessor(bufferSize, 1, 1);
-    whiteNoise.onaudioprocess = (e) => {
-      const output = e.outputBuffer.getChannelData(0);
-      for (let i = 0; i < bufferSize; i++) {
-        output[i] = Math.random() * 2 - 1;
-      }
-    };
-    
-    const filter = this.audioContext.createBiquadFilter();
-    filter.type = 'lowpass';
-    filter.frequency.value = 800;
-    
-    const gainNode = this.audioContext.createGain();
-    gainNode.gain.value = 0.5;
+  getVoice(kind) {
+    if (!this.voices[kind]) this.voices[kind] = this.createVoice(kind);
+    return this.voices[kind];
+  }
+  
+  createVoice(kind) {
+    const gain = this.audioContext.createGain();
+    gain.gain.value = 0;
+    gain.connect(this.masterGain);
+    const voice = { gain, envelopes: [], sources: [], live: !this.loops[kind], curve: new Float32Array(CROSSFADE_STEPS) };
     
-    whiteNoise.connect(filter);
-    filter.connect(gainNode);
-    gainNode.connect(destination);
+    if (this.loops[kind]) {
+      this.createRenderedLoop(voice, this.loops[kind]);
+    } else {
+      this.createSources(this.audioContext, kind, voice);
+    }
+    return voice;
+  }
+  
+  useRenderedLoop(kind) {
+    const voice = this.voices[kind];
+    if (!voice || !voice.live) return;
+    const rendered = this.createVoice(kind);
+    this.voices[kind] = rendered;
+    if (voice === this.activeVoice) {
+      this.fade(voice, 0);
+      this.fade(rendered, 1);
+      this.activeVoice = rendered;
+    }
+    setTimeout(() => this.releaseVoice(voice), CROSSFADE_SECONDS * 1000 + 100);
+  }
+  
+  releaseVoice(voice) {
+    voice.sources.forEach(source => source.stop());
+    voice.gain.disconnect();
+  }
+  
+  createSources(context, kind, voice) {
+    if (kind === 'ocean') {
+      this.createOceanWaves(context, voice);
+    } else if (kind === 'rain') {
+      this.createRain(context, voice);
+    } else if (kind === 'bowls') {
+      this.createSingingBowls(context, voice);
+    } else if (kind === 'wind') {
+      this.createWind(context, voice);
+    } else {
+      this.createCalm(context, voice);
+    }
+  }
+  
+  createRenderedLoop(voice, buffer) {
+    const source = this.audioContext.createBufferSource();
+    source.buffer = buffer;
+    source.loop = true;
+    source.connect(voice.gain);
+    source.start();
+    voice.sources.push(source);
+  }
+  
+  fade(voice, target) {
+    const param = voice.gain.gain;
+    const now = this.audioContext.currentTime;
+    const value = Math.min(1, Math.max(0, param.value));
+    const from = Math.asin(value);
+    const to = target * Math.PI / 2;
+    const { curve } = voice;
+    for (let i = 0; i < curve.length; i++) {
+      curve[i] = Math.sin(from + (to - from) * i / (curve.length - 1));
+    }
     
-    this.oscillators.push(whiteNoise);
-    this.gainNodes.push(gainNode);
+    param.cancelScheduledValues(now);
+    param.setValueAtTime(value, now);
+    param.setValueCurveAtTime(curve, now + 0.01, CROSSFADE_SECONDS);
   }
   
-  createRain(destination) {
-    const bufferSize = 2048;
-    const whiteNoise = this.audioContext.createScriptProcessor(bufferSize, 1, 1);
-    whiteNoise.onaudioprocess = (e) => {
-      const output = e.outputBuffer.getChannelData(0);
-      for (let i = 0; i < bufferSize; i++) {
-        output[i] = Math.random() * 2 - 1;
-      }
-    };
+  triggerEnvelopes(context, voice, floor) {
+    const now = context.currentTime;
+    voice.envelopes.forEach(({ gain, interval }) => {
+      gain.gain.cancelScheduledValues(now);
+      gain.gain.setValueAtTime(floor, now);
+      gain.gain.linearRampToValueAtTime(0.15, now + 2);
+      gain.gain.exponentialRampToValueAtTime(0.01, now + interval);
+    });
+  }
+  
+  getNoiseBuffer(context) {
+    if (context === this.audioContext && this.noiseBuffer) return this.noiseBuffer;
+    const { sampleRate } = context;
+    const buffer = context.createBuffer(1, sampleRate * NOISE_LOOP_SECONDS, sampleRate);
+    const data = buffer.getChannelData(0);
+    for (let i = 0; i < data.length; i++) {
+      data[i] = Math.random() * 2 - 1;
+    }
+    if (context === this.audioContext) this.noiseBuffer = buffer;
+    return buffer;
+  }
+  
+  createFilteredNoise(context, voice, filterType, frequency, level) {
+    const noise = context.createBufferSource();
+    noise.buffer = this.getNoiseBuffer(context);
+    noise.loop = true;
     
-    const filter = this.audioContext.createBiquadFilter();
-    filter.type = 'bandpass';
-    filter.frequency.value = 2000;
+    const filter = context.createBiquadFilter();
+    filter.type = filterType;
+    filter.frequency.value = frequency;
     
-    const gainNode = this.audioContext.createGain();
-    gainNode.gain.value = 0.4;
+    const gainNode = context.createGain();
+    gainNode.gain.value = level;
     
-    whiteNoise.connect(filter);
+    noise.connect(filter);
     filter.connect(gainNode);
-    gainNode.connect(destination);
-    
-    this.oscillators.push(whiteNoise);
-    this.gainNodes.push(gainNode);
+    gainNode.connect(voice.gain);
+    noise.start(0, Math.random() * NOISE_LOOP_SECONDS);
+    voice.sources.push(noise);
   }
   
-  createSingingBowls(destination) {
+  createOceanWaves(context, voice) {
+    this.createFilteredNoise(context, voice, 'lowpass', 800, 0.5);
+  }
+  
+  createRain(context, voice) {
+    this.createFilteredNoise(context, voice, 'bandpass', 2000, 0.4);
+  }
+  
+  createSingingBowls(context, voice) {
     const frequencies = [256, 384, 512, 768];
     
     frequencies.forEach((freq, idx) => {
-      const osc = this.audioContext.createOscillator();
+      const osc = context.createOscillator();
       osc.type = 'sine';
       osc.frequency.value = freq;
       
-      const gainNode = this.audioContext.createGain();
+      const gainNode = context.createGain();
       gainNode.gain.value = 0;
       
       osc.connect(gainNode);
-      gainNode.connect(destination);
+      gainNode.connect(voice.gain);
       osc.start();
+      voice.sources.push(osc);
       
-      const now = this.audioContext.currentTime;
-      const interval = 8 + idx * 2;
-      
-      gainNode.gain.setValueAtTime(0, now);
-      gainNode.gain.linearRampToValueAtTime(0.15, now + 2);
-      gainNode.gain.exponentialRampToValueAtTime(0.01, now + interval);
-      
-      this.oscillators.push(osc);
-      this.gainNodes.push(gainNode);
+      voice.envelopes.push({ gain: gainNode, interval: 8 + idx * 2 });
     });
   }
   
-  createWind(destination) {
-    const bufferSize = 4096;
-    const whiteNoise = this.audioContext.createScriptProcessor(bufferSize, 1, 1);
-    whiteNoise.onaudioprocess = (e) => {
-      const output = e.outputBuffer.getChannelData(0);
-      for (let i = 0; i < bufferSize; i++) {
-        output[i] = Math.random() * 2 - 1;
-      }
-    };
-    
-    const filter = this.audioContext.createBiquadFilter();
-    filter.type = 'lowpass';
-    filter.frequency.value = 1200;
-    
-    const gainNode = this.audioContext.createGain();
-    gainNode.gain.value = 0.3;
-    
-    whiteNoise.connect(filter);
-    filter.connect(gainNode);
-    gainNode.connect(destination);
-    
-    this.oscillators.push(whiteNoise);
-    this.gainNodes.push(gainNode);
+  createWind(context, voice) {
+    this.createFilteredNoise(context, voice, 'lowpass', 1200, 0.3);
   }
   
-  createCalm(destination) {
+  createCalm(context, voice) {
     [200, 300, 400].forEach((freq) => {
-      const osc = this.audioContext.createOscillator();
+      const osc = context.createOscillator();
       osc.type = 'sine';
       osc.frequency.value = freq;
       
-      const gainNode = this.audioContext.createGain();
+      const gainNode = context.createGain();
       gainNode.gain.value = 0.08;
       
       osc.connect(gainNode);
-      gainNode.connect(destination);
+      gainNode.connect(voice.gain);
       osc.start();
-      
-      this.oscillators.push(osc);
-      this.gainNodes.push(gainNode);
+      voice.sources.push(osc);
+    });
+  }
+  
+  setVolume(volume) {
+    this.volume = volume;
+    if (this.masterGain) {
+      this.masterGain.gain.setTargetAtTime(0.3 * volume, this.audioContext.currentTime, 0.05);
+    }
+  }
+  
+  stop() {
+    if (this.activeVoice) {
+      this.fade(this.activeVoice, 0);
+      this.activeVoice = null;
+    }
+    this.isPlaying = false;
+    
+    clearTimeout(this.suspendTimer);
+    if (this.audioContext) {
+      this.suspendTimer = setTimeout(() => {
+        if (!this.isPlaying) this.audioContext.suspend();
+      }, CROSSFADE_SECONDS * 1000 + 100);
+    }
+  }
+}
+
+const WRITE_IDLE_TIMEOUT = 1000;
+const WRITE_RETRY_DELAY = 500;
+const WRITE_RETRY_MAX_DELAY = 30000;
+const WRITE_RETRY_LIMIT = 5;
+
+class WriteQueue {
+  constructor(storage = null) {
+    this.storage = storage;
+    this.pending = new Map();
+    this.inflight = new Map();
+    this.cancel = null;
+    this.flushing = null;
+    this.failures = 0;
+  }
+  
+  push(key, value) {
+    return new Promise((resolve, reject) => {
+      const previous = this.pending.get(key);
+      const waiters = previous ? previous.waiters : [];
+      waiters.push({ resolve, reject });
+      this.pending.delete(key);
+      this.pending.set(key, { value, waiters });
+      this.schedule();
+    });
+  }
+  
+  peek(key) {
+    const entry = this.pending.get(key) || this.inflight.get(key);
+    return entry ? entry.value : undefined;
+  }
+  
+  schedule(delay = 0) {
+    if (this.cancel || this.flushing) return;
+    const run = () => {
+      this.cancel = null;
+      this.flush();
+    };
+    if (delay === 0 && typeof requestIdleCallback === 'function') {
+      const handle = requestIdleCallback(run, { timeout: WRITE_IDLE_TIMEOUT });
+      this.cancel = () => cancelIdleCallback(handle);
+    } else {
+      const handle = setTimeout(run, delay);
+      this.cancel = () => clearTimeout(handle);
+    }
+  }
+  
+  flush() {
+    if (this.flushing) return this.flushing.then(() => this.flush());
+    if (this.cancel) {
+      this.cancel();
+      this.cancel = null;
+    }
+    if (this.pending.size === 0) return Promise.resolve();
+    this.flushing = this.write().finally(() => {
+      this.flushing = null;
+      if (this.pending.size > 0) {
+        this.schedule(this.failures > 0
+          ? Math.min(WRITE_RETRY_DELAY * 2 ** (this.failures - 1), WRITE_RETRY_MAX_DELAY)
+          : 0);
+      }
+    });
+    return this.flushing;
+  }
+  
+  async write() {
+    this.inflight = this.pending;
+    this.pending = new Map();
+    const batch = Array.from(this.inflight);
+    const storage = this.storage || window.storage;
+    
+    for (let i = 0; i < batch.length; i++) {
+      const [key, entry] = batch[i];
+      try {
+        if (entry.value === null) {
+          if (storage.delete) await storage.delete(key);
+        } else {
+          await storage.set(key, entry.value);
+        }
+        this.inflight.delete(key);
+        entry.waiters.forEach(waiter => waiter.resolve());
+      } catch (error) {
+        console.error('Error:', error);
+        this.requeue(batch.slice(i), error);
+        return;
+      }
+    }
+    this.failures = 0;
+  }
+  
+  requeue(failed, error) {
+    this.failures++;
+    const retry = new Map(failed);
+    if (this.failures >= WRITE_RETRY_LIMIT) {
+      retry.forEach(entry => {
+        entry.waiters.forEach(waiter => waiter.reject(error));
+        entry.waiters = [];
+      });
+    }
+    this.pending.forEach((entry, key) => {
+      const stale = retry.get(key);
+      if (stale) {
+        retry.delete(key);
+        entry.waiters = [...stale.waiters, ...entry.waiters];
+      }
+      retry.set(key, entry);
+    });
+    this.pending = retry;
+    this.inflight = new Map();
+  }
+}
+
+const storageQueue = new WriteQueue();
+
+const readRawStorage = async (key) => {
+  const queued = storageQueue.peek(key);
+  if (queued !== undefined) return queued;
+  try {
+    const result = await window.storage.get(key);
+    return result ? result.value : null;
+  } catch (error) {
+    return null;
+  }
+};
+
+const readStorage = async (key) => {
+  try {
+    const value = await readRawStorage(key);
+    return value === null ? null : JSON.parse(value);
+  } catch (error) {
+    return null;
+  }
+};
+
+const writeStorage = (key, value) => storageQueue.push(key, JSON.stringify(value));
+
+const deleteStorage = (key) => storageQueue.push(key, null).catch(() => {});
+
+const CHUNK_ENCODING_VERSION = 3;
+
+const isNestedValue = (value) =>
+  Boolean(value) && typeof value === 'object' && !Array.isArray(value) && Object.keys(value).length > 0;
+
+const encodeChunk = (records) => {
+  const nested = new Map();
+  records.forEach(record => Object.keys(record).forEach(key => {
+    nested.set(key, nested.get(key) !== false && isNestedValue(record[key]));
+  }));
+  
+  const columns = [];
+  const paths = new Set();
+  const addColumn = (key, child) => {
+    const path = child === undefined ? key : `${key}.${child}`;
+    if (!paths.has(path)) {
+      paths.add(path);
+      columns.push({ path, key, child, values: [] });
+    }
+  };
+  records.forEach(record => Object.keys(record).forEach(key => {
+    if (nested.get(key)) {
+      Object.keys(record[key]).forEach(child => addColumn(key, child));
+    } else {
+      addColumn(key);
+    }
+  }));
+  
+  const nulls = {};
+  const rows = records.map((record, r) => {
+    const row = columns.map(({ key, child }, i) => {
+      const value = child === undefined ? record[key] : record[key]?.[child];
+      if (value === null) (nulls[i] || (nulls[i] = [])).push(r);
+      return value === undefined ? null : value;
+    });
+    row.forEach((value, i) => {
+      if (value !== null) columns[i].values.push(value);
+    });
+    return row;
+  });
+  
+  let base = Infinity;
+  const kinds = columns.map(({ values }) => {
+    if (values.length === 0) return 'v';
+    if (values.every(v => Number.isInteger(v) && v > 1e11)) {
+      values.forEach(v => { base = Math.min(base, v); });
+      return 't';
+    }
+    if (values.every(v => typeof v === 'string') && new Set(values).size < values.length) return 's';
+    return 'v';
+  });
+  if (base === Infinity) base = 0;
+  
+  const dict = [];
+  const dictIndex = new Map();
+  rows.forEach(row => {
+    row.forEach((value, i) => {
+      if (value === null) return;
+      if (kinds[i] === 't') {
+        row[i] = value - base;
+      } else if (kinds[i] === 's') {
+        if (!dictIndex.has(value)) {
+          dictIndex.set(value, dict.length);
+          dict.push(value);
+        }
+        row[i] = dictIndex.get(value);
+      }
+    });
+    while (row.length > 0 && row[row.length - 1] === null) row.pop();
+  });
+  
+  return JSON.stringify({
+    v: CHUNK_ENCODING_VERSION,
+    base,
+    columns: columns.map(({ path }, i) => [path, kinds[i]]),
+    dict,
+    rows,
+    ...(Object.keys(nulls).length > 0 && { nulls })
+  });
+};
+
+const forEachChunkRecord = (text, visit, fields) => {
+  if (!text) return;
+  const chunk = JSON.parse(text);
+  if (Array.isArray(chunk)) {
+    chunk.forEach(visit);
+    return;
+  }
+  const { base, columns, dict, rows, nulls = {} } = chunk;
+  const wanted = [];
+  columns.forEach(([path, kind], i) => {
+    const dot = path.indexOf('.');
+    const key = dot === -1 ? path : path.slice(0, dot);
+    if (fields && !fields.includes(key)) return;
+    wanted.push({ i, kind, key, child: dot === -1 ? undefined : path.slice(dot + 1), explicit: nulls[i] && new Set(nulls[i]) });
+  });
+  for (let r = 0; r < rows.length; r++) {
+    const row = rows[r];
+    const record = {};
+    for (let w = 0; w < wanted.length; w++) {
+      const { i, kind, key, child, explicit } = wanted[w];
+      let value = i < row.length ? row[i] : null;
+      if (value === null) {
+        if (!explicit || !explicit.has(r)) continue;
+      } else if (kind === 't') {
+        value += base;
+      } else if (kind === 'd') {
+        value = new Date(base + value).toISOString();
+      } else if (kind === 's') {
+        value = dict[value];
+      }
+      if (child === undefined) {
+        record[key] = value;
+      } else {
+        (record[key] || (record[key] = {}))[child] = value;
+      }
+    }
+    visit(record);
+  }
+};
+
+const decodeChunk = (text) => {
+  const records = [];
+  forEachChunkRecord(text, record => records.push(record));
+  return records;
+};
+
+class SegmentedLog {
+  constructor(key, chunkSize = LOG_CHUNK_SIZE) {
+    this.key = key;
+    this.chunkSize = chunkSize;
+    this.manifest = null;
+    this.tail = [];
+    this.opening = null;
+    this.pending = Promise.resolve();
+  }
+  
+  manifestKey() {
+    return `${this.key}-manifest`;
+  }
+  
+  chunkKey(index) {
+    return `${this.key}-chunk-${index}`;
+  }
+  
+  tailKey(index) {
+    return `${this.key}-tail-${index}`;
+  }
+  
+  unmergedKey() {
+    return `${this.key}-unmerged`;
+  }
+  
+  get length() {
+    return this.manifest ? this.manifest.chunks * this.manifest.chunkSize + this.tail.length : 0;
+  }
+  
+  open() {
+    if (!this.opening) this.opening = this.load();
+    return this.opening;
+  }
+  
+  async load() {
+    const manifest = await readStorage(this.manifestKey());
+    if (!manifest) {
+      await this.migrate();
+      return;
+    }
+    this.manifest = manifest;
+    const tail = await Promise.all(
+      Array.from({ length: manifest.tail }, (_, i) => readStorage(this.tailKey(i)))
+    );
+    this.tail = tail.filter(Boolean);
+  }
+  
+  async migrate() {
+    const legacy = (await readStorage(this.key)) || [];
+    const written = this.writeAll(legacy);
+    if (legacy.length > 0) deleteStorage(this.key);
+    await written;
+  }
+  
+  writeAll(records) {
+    const previous = this.manifest || { chunks: 0, tail: 0 };
+    const chunks = Math.floor(records.length / this.chunkSize);
+    const writes = [];
+    for (let i = 0; i < chunks; i++) {
+      writes.push(storageQueue.push(this.chunkKey(i), encodeChunk(records.slice(i * this.chunkSize, (i + 1) * this.chunkSize))));
+    }
+    this.tail = records.slice(chunks * this.chunkSize);
+    this.tail.forEach((record, i) => writes.push(writeStorage(this.tailKey(i), record)));
+    this.manifest = { version: 1, chunkSize: this.chunkSize, chunks, tail: this.tail.length };
+    writes.push(writeStorage(this.manifestKey(), this.manifest));
+    for (let i = chunks; i < previous.chunks; i++) deleteStorage(this.chunkKey(i));
+    for (let i = this.tail.length; i < previous.tail; i++) deleteStorage(this.tailKey(i));
+    return Promise.all(writes);
+  }
+  
+  enqueue(task) {
+    const run = this.pending.then(async () => {
+      await this.open();
+      return [task()];
+    });
+    this.pending = run.catch(() => {});
+    return run.then(([written]) => written);
+  }
+  
+  append(record) {
+    return this.enqueue(() => this.writeRecord(record));
+  }
+  
+  async appendBatch(records) {
+    const ids = await this.recordIds();
+    const inserted = records.filter(record => !ids.has(record.id) && ids.add(record.id));
+    await this.enqueue(() => Promise.all(inserted.map(record => this.writeRecord(record))));
+    return inserted;
+  }
+  
+  async recordIds() {
+    if (!this.ids) {
+      const ids = new Set();
+      const readPage = this.pageReader();
+      for (let page = await readPage(); page; page = await readPage()) {
+        page.forEach(record => ids.add(record.id));
+      }
+      this.ids = this.ids || ids;
+    }
+    return this.ids;
+  }
+  
+  reset(records) {
+    this.ids = null;
+    return this.enqueue(() => this.writeAll(records));
+  }
+  
+  writeRecord(record) {
+    if (this.ids) this.ids.add(record.id);
+    const index = this.tail.length;
+    this.tail.push(record);
+    const written = writeStorage(this.tailKey(index), record);
+    if (this.tail.length >= this.manifest.chunkSize) {
+      return Promise.all([written, this.compact()]);
+    }
+    this.manifest = { ...this.manifest, tail: this.tail.length };
+    return Promise.all([written, writeStorage(this.manifestKey(), this.manifest)]);
+  }
+  
+  compact() {
+    const sealed = this.tail;
+    const written = storageQueue.push(this.chunkKey(this.manifest.chunks), encodeChunk(sealed));
+    this.manifest = { ...this.manifest, chunks: this.manifest.chunks + 1, tail: 0 };
+    this.tail = [];
+    const committed = writeStorage(this.manifestKey(), this.manifest);
+    sealed.forEach((_, i) => deleteStorage(this.tailKey(i)));
+    return Promise.all([written, committed]);
+  }
+  
+  async readChunks(start, end) {
+    await this.open();
+    const chunks = await Promise.all(
+      Array.from({ length: end - start }, (_, i) => readRawStorage(this.chunkKey(start + i)))
+    );
+    return chunks.flatMap(chunk => {
+      try {
+        return decodeChunk(chunk);
+      } catch (error) {
+        console.error('Error:', error);
+        return [];
+      }
+    });
+  }
+  
+  async readRecent() {
+    await this.open();
+    const olderChunks = Math.max(0, this.manifest.chunks - 1);
+    const lastChunk = await this.readChunks(olderChunks, this.manifest.chunks);
+    return { records: [...lastChunk, ...this.tail], olderChunks };
+  }
+  
+  async readAll() {
+    await this.open();
+    return [...(await this.readChunks(0, this.manifest.chunks)), ...this.tail];
+  }
+  
+  async readRawChunks() {
+    await this.open();
+    const chunks = await Promise.all(
+      Array.from({ length: this.manifest.chunks }, (_, i) => readRawStorage(this.chunkKey(i)))
+    );
+    return [...chunks.filter(Boolean), JSON.stringify(this.tail)];
+  }
+  
+  async analyticsSource() {
+    return { chunks: await this.readRawChunks() };
+  }
+  
+  async annotate(field, ids, values) {
+    await this.open();
+    const updates = new Map(Array.from(ids, (id, i) => [id, values[i]]));
+    const annotated = record => updates.has(record.id) ? { ...record, [field]: updates.get(record.id) } : record;
+    const writes = [];
+    for (let i = 0; i < this.manifest.chunks; i++) {
+      const records = await this.readChunks(i, i + 1);
+      if (records.some(record => updates.has(record.id))) {
+        writes.push(storageQueue.push(this.chunkKey(i), encodeChunk(records.map(annotated))));
+      }
+    }
+    this.tail.forEach((record, i) => {
+      if (!updates.has(record.id)) return;
+      this.tail[i] = annotated(record);
+      writes.push(writeStorage(this.tailKey(i), this.tail[i]));
+    });
+    return Promise.all(writes);
+  }
+  
+  async query(filter) {
+    return (await this.readAll()).filter(record => matchesQuery(record, filter));
+  }
+  
+  pageReader() {
+    let next = 0;
+    return async () => {
+      await this.open();
+      const index = next++;
+      if (index < this.manifest.chunks) return this.readChunks(index, index + 1);
+      return index === this.manifest.chunks && this.tail.length > 0 ? [...this.tail] : null;
+    };
+  }
+}
+
+const matchesQuery = (record, { from, to, type, tag } = {}) =>
+  (!from || record.date >= from) &&
+  (!to || record.date < to) &&
+  (!type || record.type === type) &&
+  (!tag || (record.tags || []).includes(tag));
+
+const DATABASE_NAME = 'sukoon';
+const DATABASE_VERSION = 1;
+const RECORD_STORES = ['sessions', 'journals'];
+
+const idbRequest = (request) => new Promise((resolve, reject) => {
+  request.onsuccess = () => resolve(request.result);
+  request.onerror = () => reject(request.error);
+});
+
+const idbTransaction = (transaction) => new Promise((resolve, reject) => {
+  transaction.oncomplete = () => resolve();
+  transaction.onerror = () => reject(transaction.error);
+  transaction.onabort = () => reject(transaction.error);
+});
+
+let databaseOpening = null;
+
+const openDatabase = () => {
+  if (!databaseOpening) {
+    databaseOpening = new Promise(resolve => {
+      if (typeof indexedDB === 'undefined') {
+        resolve(null);
+        return;
+      }
+      try {
+        const request = indexedDB.open(DATABASE_NAME, DATABASE_VERSION);
+        request.onupgradeneeded = () => {
+          const db = request.result;
+          RECORD_STORES.forEach(name => {
+            const store = db.createObjectStore(name, { keyPath: 'id' });
+            store.createIndex('date', 'date');
+            store.createIndex('type', 'type');
+            store.createIndex('tags', 'tags', { multiEntry: true });
+          });
+          db.createObjectStore('bookmarks');
+          db.createObjectStore('meta');
+        };
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => resolve(null);
+        request.onblocked = () => resolve(null);
+      } catch (error) {
+        resolve(null);
+      }
+    });
+  }
+  return databaseOpening;
+};
+
+const markMigrated = (db, name) => {
+  const transaction = db.transaction('meta', 'readwrite');
+  transaction.objectStore('meta').put(true, `migrated-${name}`);
+  return idbTransaction(transaction);
+};
+
+const isMigrated = (db, name) =>
+  idbRequest(db.transaction('meta').objectStore('meta').get(`migrated-${name}`)).then(Boolean);
+
+class IndexedDBLog {
+  constructor(db, storeName, legacy) {
+    this.db = db;
+    this.storeName = storeName;
+    this.legacy = legacy;
+    this.chunkSize = legacy.chunkSize;
+    this.count = 0;
+  }
+  
+  get length() {
+    return this.count;
+  }
+  
+  store(mode) {
+    return this.db.transaction(this.storeName, mode).objectStore(this.storeName);
+  }
+  
+  async open() {
+    const unmerged = await readStorage(this.legacy.unmergedKey());
+    if (unmerged || !(await isMigrated(this.db, this.storeName))) {
+      await this.writeAll(await this.legacy.readAll(), false);
+      await markMigrated(this.db, this.storeName);
+      if (unmerged) deleteStorage(this.legacy.unmergedKey());
+    }
+    this.count = await idbRequest(this.store().count());
+  }
+  
+  writeAll(records, replace = true) {
+    const transaction = this.db.transaction(this.storeName, 'readwrite');
+    const store = transaction.objectStore(this.storeName);
+    if (replace) store.clear();
+    records.forEach(record => store.put(record));
+    return idbTransaction(transaction);
+  }
+  
+  append(record) {
+    this.count++;
+    const transaction = this.db.transaction(this.storeName, 'readwrite');
+    transaction.objectStore(this.storeName).put(record);
+    return idbTransaction(transaction);
+  }
+  
+  appendBatch(records) {
+    const transaction = this.db.transaction(this.storeName, 'readwrite');
+    const store = transaction.objectStore(this.storeName);
+    const inserted = [];
+    records.forEach(record => {
+      const request = store.add(record);
+      request.onsuccess = () => inserted.push(record);
+      request.onerror = (event) => {
+        if (request.error && request.error.name === 'ConstraintError') event.preventDefault();
+      };
+    });
+    return idbTransaction(transaction).then(() => {
+      this.count += inserted.length;
+      return inserted;
+    });
+  }
+  
+  reset(records) {
+    this.count = records.length;
+    return this.writeAll(records);
+  }
+  
+  readRange(offset, limit) {
+    return new Promise((resolve, reject) => {
+      const records = [];
+      const request = this.store().openCursor();
+      let skipped = offset === 0;
+      request.onsuccess = () => {
+        const cursor = request.result;
+        if (!cursor || records.length >= limit) {
+          resolve(records);
+        } else if (!skipped) {
+          skipped = true;
+          cursor.advance(offset);
+        } else {
+          records.push(cursor.value);
+          cursor.continue();
+        }
+      };
+      request.onerror = () => reject(request.error);
+    });
+  }
+  
+  readChunks(start, end) {
+    return this.readRange(start * this.chunkSize, (end - start) * this.chunkSize);
+  }
+  
+  async readRecent() {
+    const chunks = Math.floor(this.count / this.chunkSize);
+    const olderChunks = Math.max(0, chunks - 1);
+    return { records: await this.readRange(olderChunks * this.chunkSize, Infinity), olderChunks };
+  }
+  
+  readAll() {
+    return idbRequest(this.store().getAll());
+  }
+  
+  analyticsSource() {
+    return { database: DATABASE_NAME, store: this.storeName };
+  }
+  
+  annotate(field, ids, values) {
+    const transaction = this.db.transaction(this.storeName, 'readwrite');
+    const store = transaction.objectStore(this.storeName);
+    ids.forEach((id, i) => {
+      const request = store.get(id);
+      request.onsuccess = () => {
+        if (request.result) store.put({ ...request.result, [field]: values[i] });
+      };
+    });
+    return idbTransaction(transaction);
+  }
+  
+  async query(filter = {}) {
+    const { from, to, type, tag } = filter;
+    let request;
+    if (type) {
+      request = this.store().index('type').getAll(type);
+    } else if (tag) {
+      request = this.store().index('tags').getAll(tag);
+    } else if (from || to) {
+      const range = from && to
+        ? IDBKeyRange.bound(from, to, false, true)
+        : from ? IDBKeyRange.lowerBound(from) : IDBKeyRange.upperBound(to, true);
+      request = this.store().index('date').getAll(range);
+    } else {
+      request = this.store().getAll();
+    }
+    return (await idbRequest(request)).filter(record => matchesQuery(record, filter));
+  }
+  
+  pageReader() {
+    let after = null;
+    return async () => {
+      const range = after === null ? undefined : IDBKeyRange.lowerBound(after, true);
+      const records = await idbRequest(this.store().getAll(range, this.chunkSize));
+      if (records.length === 0) return null;
+      after = records[records.length - 1].id;
+      return records;
+    };
+  }
+}
+
+class RecordLog {
+  constructor(key, storeName) {
+    this.storeName = storeName;
+    this.fallback = new SegmentedLog(key);
+    this.backend = null;
+    this.opening = null;
+  }
+  
+  get length() {
+    return this.backend ? this.backend.length : 0;
+  }
+  
+  get chunkSize() {
+    return this.fallback.chunkSize;
+  }
+  
+  open() {
+    if (!this.opening) this.opening = this.select();
+    return this.opening;
+  }
+  
+  async select() {
+    const db = await openDatabase();
+    if (db) {
+      try {
+        const backend = new IndexedDBLog(db, this.storeName, this.fallback);
+        await backend.open();
+        this.backend = backend;
+        return;
+      } catch (error) {
+        console.error('Error:', error);
+      }
+    }
+    await this.fallback.open();
+    this.backend = this.fallback;
+    writeStorage(this.fallback.unmergedKey(), true).catch(error => console.error('Error:', error));
+  }
+  
+  async append(record) {
+    await this.open();
+    return this.backend.append(record);
+  }
+  
+  async appendBatch(records) {
+    await this.open();
+    return this.backend.appendBatch(records);
+  }
+  
+  async reset(records) {
+    await this.open();
+    return this.backend.reset(records);
+  }
+  
+  async readChunks(start, end) {
+    await this.open();
+    return this.backend.readChunks(start, end);
+  }
+  
+  async readRecent() {
+    await this.open();
+    return this.backend.readRecent();
+  }
+  
+  async readAll() {
+    await this.open();
+    return this.backend.readAll();
+  }
+  
+  async analyticsSource() {
+    await this.open();
+    return this.backend.analyticsSource();
+  }
+  
+  async annotate(field, ids, values) {
+    await this.open();
+    return this.backend.annotate(field, ids, values);
+  }
+  
+  async query(filter) {
+    await this.open();
+    return this.backend.query(filter);
+  }
+  
+  async pageReader() {
+    await this.open();
+    return this.backend.pageReader();
+  }
+}
+
+const updateBookmarkStore = async (update) => {
+  const db = await openDatabase();
+  const transaction = db.transaction('bookmarks', 'readwrite');
+  update(transaction.objectStore('bookmarks'));
+  return idbTransaction(transaction);
+};
+
+const bookmarkQueue = new WriteQueue({
+  set: (id) => updateBookmarkStore(store => store.put(id, id)),
+  delete: (id) => updateBookmarkStore(store => store.delete(id))
+});
+
+const readBookmarks = async () => {
+  const db = await openDatabase();
+  if (!db) return readStorage('sukoon-bookmarks');
+  try {
+    await bookmarkQueue.flush();
+    if (!(await isMigrated(db, 'bookmark-ids'))) {
+      const stored = (await isMigrated(db, 'bookmarks'))
+        ? await idbRequest(db.transaction('bookmarks').objectStore('bookmarks').getAll())
+        : await readStorage('sukoon-bookmarks');
+      await writeBookmarkStore([...toBookmarkIds(stored)]);
+      await markMigrated(db, 'bookmark-ids');
+    }
+    return await idbRequest(db.transaction('bookmarks').objectStore('bookmarks').getAll());
+  } catch (error) {
+    console.error('Error:', error);
+    return readStorage('sukoon-bookmarks');
+  }
+};
+
+const writeBookmarkStore = (bookmarks) => updateBookmarkStore(store => {
+  store.clear();
+  bookmarks.forEach(id => store.put(id, id));
+});
+
+const contentIdFor = (title) => title.toLowerCase().replace(/[^a-z0-9]+/g, '-').replace(/^-|-$/g, '');
+
+const toBookmarkIds = (stored) => new Set(
+  (stored || []).map(bookmark => typeof bookmark === 'string' ? bookmark : bookmark.id || contentIdFor(bookmark.title))
+);
+
+const writeBookmarks = async (bookmarks) => {
+  const db = await openDatabase();
+  return db ? writeBookmarkStore(bookmarks) : writeStorage('sukoon-bookmarks', bookmarks);
+};
+
+const writeBookmark = async (id, saved, bookmarks) => {
+  const db = await openDatabase();
+  return db ? bookmarkQueue.push(id, saved ? id : null) : writeStorage('sukoon-bookmarks', bookmarks);
+};
+
+const currentTimeZone = () => Intl.DateTimeFormat().resolvedOptions().timeZone;
+
+const localDayKey = (date) => {
+  const month = String(date.getMonth() + 1).padStart(2, '0');
+  const day = String(date.getDate()).padStart(2, '0');
+  return `${date.getFullYear()}-${month}-${day}`;
+};
+
+const countStreak = (hasSessionOn, today = new Date()) => {
+  const day = new Date(today.getFullYear(), today.getMonth(), today.getDate());
+  if (!hasSessionOn(day)) day.setDate(day.getDate() - 1);
+  let streak = 0;
+  while (hasSessionOn(day)) {
+    streak++;
+    day.setDate(day.getDate() - 1);
+  }
+  return streak;
+};
+
+class SessionIndex {
+  constructor(key) {
+    this.key = key;
+    this.data = this.empty();
+  }
+  
+  build(sessions) {
+    return sessions.reduce((data, session) => this.fold(data, session), this.empty());
+  }
+  
+  isCurrent(stored, log) {
+    return Boolean(stored) && stored.version === 1 && stored.count === log.length;
+  }
+  
+  async load(log) {
+    const stored = await readStorage(this.key);
+    await log.open();
+    if (this.isCurrent(stored, log)) {
+      this.data = stored;
+    } else {
+      await this.rebuild(await log.readAll());
+    }
+    return this.data;
+  }
+  
+  rebuild(sessions) {
+    this.data = this.build(sessions);
+    return writeStorage(this.key, this.data);
+  }
+  
+  add(session) {
+    this.data = this.fold(this.data, session);
+    return writeStorage(this.key, this.data);
+  }
+  
+  addMany(sessions) {
+    this.data = sessions.reduce((data, session) => this.fold(data, session), this.data);
+    return writeStorage(this.key, this.data);
+  }
+}
+
+class SessionStats extends SessionIndex {
+  empty() {
+    return { version: 1, count: 0, totalMinutes: 0, totalImprovement: 0, types: {} };
+  }
+  
+  fold(data, session) {
+    const improvement = session.moodAfter - session.moodBefore;
+    const type = data.types[session.type] || { count: 0, improvement: 0 };
+    return {
+      ...data,
+      count: data.count + 1,
+      totalMinutes: data.totalMinutes + session.duration,
+      totalImprovement: data.totalImprovement + improvement,
+      types: {
+        ...data.types,
+        [session.type]: { count: type.count + 1, improvement: type.improvement + improvement }
+      }
+    };
+  }
+  
+  matches({ typeCounts, typeImprovement }) {
+    return MEDITATION_TYPE_IDS.every((type, code) => {
+      const stored = this.data.types[type] || { count: 0, improvement: 0 };
+      return stored.count === typeCounts[code] && stored.improvement === typeImprovement[code];
+    });
+  }
+}
+
+const RECOMMENDER_PRIOR_DELTA = 0.5;
+const RECOMMENDER_PRIOR_WEIGHT = 2;
+const RECOMMENDER_CONTEXT_WEIGHT = 3;
+const RECOMMENDER_EXPLORATION = 0.15;
+
+const RECOMMENDATION_PRIORS = {
+  low: { healing: 0.3, release: 0.2, calm: 0.1 },
+  unsettled: { calm: 0.3, balance: 0.1 },
+  steady: { balance: 0.3, gratitude: 0.1, focus: 0.1 },
+  morning: { energy: 0.15, focus: 0.1 },
+  night: { sleep: 0.3 }
+};
+
+const timeOfDay = (date) => {
+  const hour = date.getHours();
+  if (hour < 12) return 'morning';
+  if (hour < 17) return 'afternoon';
+  if (hour < 21) return 'evening';
+  return 'night';
+};
+
+const GREETINGS = {
+  morning: '🌅 Good Morning',
+  afternoon: '☀️ Good Afternoon',
+  evening: '🌆 Good Evening',
+  night: '🌙 Good Night'
+};
+
+const moodBand = (mood) => {
+  if (mood < 2.5) return 'low';
+  if (mood < 3) return 'unsettled';
+  return 'steady';
+};
+
+class Recommender extends SessionIndex {
+  empty() {
+    return { version: 1, count: 0, types: {}, contexts: {} };
+  }
+  
+  fold(data, session) {
+    const delta = session.moodAfter - session.moodBefore;
+    const context = `${timeOfDay(new Date(session.date))}-${moodBand(session.moodBefore)}:${session.type}`;
+    [[data.types, session.type], [data.contexts, context]].forEach(([table, key]) => {
+      const entry = table[key] || (table[key] = { n: 0, sum: 0, minutes: 0 });
+      entry.n++;
+      entry.sum += delta;
+      entry.minutes += session.duration;
+    });
+    return { ...data, count: data.count + 1 };
+  }
+  
+  static estimate(data, type, date, mood) {
+    const hour = timeOfDay(date);
+    const band = moodBand(mood);
+    const prior = RECOMMENDER_PRIOR_DELTA +
+      (RECOMMENDATION_PRIORS[band]?.[type] || 0) +
+      (RECOMMENDATION_PRIORS[hour]?.[type] || 0);
+    const global = data.types[type] || { n: 0, sum: 0, minutes: 0 };
+    const local = data.contexts[`${hour}-${band}:${type}`] || { n: 0, sum: 0 };
+    const globalMean = (RECOMMENDER_PRIOR_WEIGHT * prior + global.sum) / (RECOMMENDER_PRIOR_WEIGHT + global.n);
+    const mean = (RECOMMENDER_CONTEXT_WEIGHT * globalMean + local.sum) / (RECOMMENDER_CONTEXT_WEIGHT + local.n);
+    return { type, mean, n: global.n, minutes: global.n > 0 ? global.minutes / global.n : null };
+  }
+  
+  static recommend(data, date, mood) {
+    let best = null;
+    let bestScore = -Infinity;
+    MEDITATION_TYPES.forEach(({ id }) => {
+      const estimate = Recommender.estimate(data, id, date, mood);
+      const score = estimate.mean + RECOMMENDER_EXPLORATION / Math.sqrt(1 + estimate.n);
+      if (score > bestScore) {
+        bestScore = score;
+        best = estimate;
+      }
+    });
+    return best;
+  }
+}
+
+const evaluateRecommender = (sessions) => {
+  const replay = new Recommender(null);
+  let data = replay.empty();
+  let followed = 0;
+  let followedDelta = 0;
+  let otherDelta = 0;
+  let modelError = 0;
+  let baselineError = 0;
+  let runningDelta = 0;
+  
+  sessions.forEach((session, i) => {
+    const date = new Date(session.date);
+    const delta = session.moodAfter - session.moodBefore;
+    const pick = Recommender.recommend(data, date, session.moodBefore);
+    const predicted = Recommender.estimate(data, session.type, date, session.moodBefore).mean;
+    
+    if (pick.type === session.type) {
+      followed++;
+      followedDelta += delta;
+    } else {
+      otherDelta += delta;
+    }
+    modelError += Math.abs(predicted - delta);
+    baselineError += Math.abs((i > 0 ? runningDelta / i : RECOMMENDER_PRIOR_DELTA) - delta);
+    runningDelta += delta;
+    data = replay.fold(data, session);
+  });
+  
+  const count = sessions.length || 1;
+  return {
+    sessions: sessions.length,
+    followed,
+    followedDelta: followed > 0 ? followedDelta / followed : null,
+    otherDelta: sessions.length > followed ? otherDelta / (sessions.length - followed) : null,
+    modelError: modelError / count,
+    baselineError: baselineError / count
+  };
+};
+
+const journalDateLabels = new Map();
+
+const formatJournalDate = (entry) => {
+  if (!journalDateLabels.has(entry.id)) {
+    journalDateLabels.set(entry.id, JOURNAL_DATE_FORMAT.format(new Date(entry.date)));
+  }
+  return journalDateLabels.get(entry.id);
+};
+
+class DayIndex extends SessionIndex {
+  empty() {
+    return { version: 1, timeZone: currentTimeZone(), count: 0, days: {} };
+  }
+  
+  isCurrent(stored, log) {
+    return super.isCurrent(stored, log) && stored.timeZone === currentTimeZone();
+  }
+  
+  fold(data, session) {
+    const day = localDayKey(new Date(session.date));
+    data.days[day] = (data.days[day] || 0) + 1;
+    return { ...data, count: data.count + 1 };
+  }
+  
+  sessionsOn(date) {
+    return this.data.days[localDayKey(date)] || 0;
+  }
+  
+  streak(today = new Date()) {
+    return countStreak(day => this.sessionsOn(day) > 0, today);
+  }
+}
+
+const sessionLog = new RecordLog('sukoon-sessions', 'sessions');
+const journalLog = new RecordLog('sukoon-journals', 'journals');
+const sessionStats = new SessionStats('sukoon-stats');
+const dayIndex = new DayIndex('sukoon-days');
+const recommender = new Recommender('sukoon-recommender');
+
+const parseLocalDay = (value) => {
+  const [year, month, day] = value.split('-').map(Number);
+  return new Date(year, month - 1, day).getTime();
+};
+
+const tokenize = (text) => text.toLowerCase().split(/\s+/).filter(Boolean);
+
+const searchDocument = (kind, entry) => {
+  const text = kind === 'journal'
+    ? entry.reflection || ''
+    : [...Object.values(entry.prePrompts || {}), ...Object.values(entry.postPrompts || {})].join(' ');
+  return {
+    ref: `${kind}:${entry.id}`,
+    kind,
+    date: entry.date,
+    tags: kind === 'journal' ? entry.tags || [] : [entry.type],
+    label: kind === 'journal' ? entry.type : MEDITATION_TYPE_BY_ID[entry.type]?.name || entry.type,
+    snippet: text.trim().slice(0, 120),
+    tokens: [...new Set(tokenize(text))]
+  };
+};
+
+class SearchIndex {
+  constructor(key, sources) {
+    this.log = new SegmentedLog(key);
+    this.sources = sources;
+    this.docs = [];
+    this.times = [];
+    this.refs = new Map();
+    this.postings = new Map();
+    this.tokens = [];
+    this.sorted = true;
+    this.opening = null;
+  }
+  
+  open() {
+    if (!this.opening) this.opening = this.load();
+    return this.opening;
+  }
+  
+  async load() {
+    const kinds = Object.keys(this.sources);
+    await Promise.all([this.log.open(), ...kinds.map(kind => this.sources[kind].open())]);
+    const expected = kinds.reduce((sum, kind) => sum + this.sources[kind].length, 0);
+    
+    let records;
+    if (this.log.length === expected) {
+      records = await this.log.readAll();
+    } else {
+      const entries = await Promise.all(kinds.map(kind => this.sources[kind].readAll()));
+      records = kinds.flatMap((kind, i) => entries[i].map(entry => searchDocument(kind, entry)));
+      await this.log.reset(records);
+    }
+    records.forEach(record => this.indexDocument(record));
+  }
+  
+  add(kind, entry) {
+    const record = searchDocument(kind, entry);
+    if (this.opening) this.opening.then(() => this.indexDocument(record));
+    return this.log.append(record);
+  }
+  
+  indexDocument(record) {
+    if (this.refs.has(record.ref)) return;
+    const index = this.docs.length;
+    const doc = { ...record, time: new Date(record.date).getTime() };
+    this.docs.push(doc);
+    this.times.push(doc.time);
+    this.refs.set(doc.ref, index);
+    doc.tokens.forEach(token => {
+      if (!this.postings.has(token)) {
+        this.postings.set(token, []);
+        this.tokens.push(token);
+        this.sorted = false;
+      }
+      this.postings.get(token).push(index);
+    });
+  }
+  
+  lowerBound(term) {
+    let low = 0;
+    let high = this.tokens.length;
+    while (low < high) {
+      const mid = (low + high) >> 1;
+      if (this.tokens[mid] < term) low = mid + 1; else high = mid;
+    }
+    return low;
+  }
+  
+  search({ query = '', tags = [], from = null, to = null, limit = 50 }) {
+    if (!this.sorted) {
+      this.tokens.sort();
+      this.sorted = true;
+    }
+    
+    const terms = tokenize(query).map(term => {
+      const start = this.lowerBound(term);
+      let end = start;
+      let size = 0;
+      while (end < this.tokens.length && this.tokens[end].startsWith(term)) {
+        size += this.postings.get(this.tokens[end]).length;
+        end++;
+      }
+      return { term, start, end, size };
+    }).sort((a, b) => a.size - b.size);
+    const [seed, ...rest] = terms;
+    
+    const results = [];
+    const consider = (index) => {
+      const time = this.times[index];
+      if (results.length === limit && time <= results[limit - 1].time) return;
+      if ((from !== null && time < from) || (to !== null && time >= to)) return;
+      const doc = this.docs[index];
+      if (!tags.every(tag => doc.tags.includes(tag))) return;
+      if (!rest.every(({ term }) => doc.tokens.some(token => token.startsWith(term)))) return;
+      
+      let i = Math.min(results.length, limit - 1);
+      while (i > 0 && results[i - 1].time < time) {
+        results[i] = results[i - 1];
+        i--;
+      }
+      results[i] = doc;
+    };
+    
+    if (!seed) {
+      for (let index = this.docs.length - 1; index >= 0; index--) consider(index);
+    } else if (seed.end - seed.start === 1) {
+      this.postings.get(this.tokens[seed.start]).forEach(consider);
+    } else {
+      const seen = new Uint8Array(this.docs.length);
+      for (let i = seed.start; i < seed.end; i++) {
+        this.postings.get(this.tokens[i]).forEach(index => {
+          if (seen[index]) return;
+          seen[index] = 1;
+          consider(index);
+        });
+      }
+    }
+    return results;
+  }
+}
+
+const searchIndex = new SearchIndex('sukoon-search', { journal: journalLog, session: sessionLog });
+
+const filterHistory = async ({ tag = '', from = null, to = null, limit = 50 }) => {
+  const range = {
+    from: from === null ? null : new Date(from).toISOString(),
+    to: to === null ? null : new Date(to).toISOString()
+  };
+  const [journals, sessions] = await Promise.all([
+    journalLog.query({ ...range, tag }),
+    sessionLog.query({ ...range, type: tag })
+  ]);
+  return [
+    ...journals.map(entry => searchDocument('journal', entry)),
+    ...sessions.map(entry => searchDocument('session', entry))
+  ]
+    .map(doc => ({ ...doc, time: new Date(doc.date).getTime() }))
+    .sort((a, b) => b.time - a.time)
+    .slice(0, limit);
+};
+
+const SENTIMENT_LEXICON = {
+  happy: 0.5, peaceful: 0.5, calm: 0.5, grateful: 0.5, joy: 0.5, love: 0.5, good: 0.5, better: 0.5,
+  clear: 0.5, light: 0.5, relaxed: 0.5, hopeful: 0.5, thankful: 0.5, refreshed: 0.5, rested: 0.5,
+  centered: 0.5, grounded: 0.5, relieved: 0.5, energized: 0.5, content: 0.25, serene: 0.75, blissful: 0.75,
+  anxious: -0.5, stressed: -0.5, sad: -0.5, tired: -0.5, overwhelmed: -0.5, worried: -0.5, pain: -0.5,
+  difficult: -0.5, heavy: -0.5, angry: -0.5, lonely: -0.5, scared: -0.5, afraid: -0.5, nervous: -0.5,
+  restless: -0.5, frustrated: -0.5, upset: -0.5, hurt: -0.5, drained: -0.5, exhausted: -0.75,
+  hopeless: -0.75, depressed: -0.75, panic: -0.75
+};
+
+const NEGATIONS = new Set([
+  'not', 'no', 'never', 'hardly', 'barely', 'without', 'cannot',
+  "don't", "didn't", "doesn't", "isn't", "wasn't", "aren't", "weren't", "can't", "won't"
+]);
+const NEGATION_SCOPE = 3;
+
+const isWhitespace = (code) =>
+  code === 32 || (code >= 9 && code <= 13) || code === 160 || code === 0x1680 ||
+  (code >= 0x2000 && code <= 0x200a) || code === 0x2028 || code === 0x2029 ||
+  code === 0x202f || code === 0x205f || code === 0x3000 || code === 0xfeff;
+
+const compileSentimentLexicon = (lexicon) => {
+  const children = [new Map()];
+  const weights = [{ positive: 0, negative: 0 }];
+  
+  Object.entries(lexicon).forEach(([word, weight]) => {
+    let node = 0;
+    for (const char of word.toLowerCase()) {
+      if (!children[node].has(char)) {
+        children[node].set(char, children.length);
+        children.push(new Map());
+        weights.push({ positive: 0, negative: 0 });
+      }
+      node = children[node].get(char);
+    }
+    if (weight > 0) weights[node].positive = Math.max(weights[node].positive, weight);
+    else weights[node].negative = Math.min(weights[node].negative, weight);
+  });
+  
+  const states = children.length;
+  const delta = new Int32Array(states * 128);
+  const positive = new Float32Array(states);
+  const negative = new Float32Array(states);
+  const fail = new Int32Array(states);
+  const queue = [0];
+  
+  for (let head = 0; head < queue.length; head++) {
+    const node = queue[head];
+    positive[node] = Math.max(weights[node].positive, node ? positive[fail[node]] : 0);
+    negative[node] = Math.min(weights[node].negative, node ? negative[fail[node]] : 0);
+    for (let code = 0; code < 128; code++) {
+      const char = String.fromCharCode(code).toLowerCase();
+      const child = children[node].get(char);
+      if (child !== undefined) {
+        delta[node * 128 + code] = child;
+        if (char.charCodeAt(0) === code) {
+          fail[child] = node ? delta[fail[node] * 128 + code] : 0;
+          queue.push(child);
+        }
+      } else {
+        delta[node * 128 + code] = node ? delta[fail[node] * 128 + code] : 0;
+      }
+    }
+  }
+  
+  return { delta, positive, negative };
+};
+
+const SENTIMENT_AUTOMATON = compileSentimentLexicon(SENTIMENT_LEXICON);
+
+const analyzeSentiment = (text, automaton = SENTIMENT_AUTOMATON) => {
+  const { delta, positive, negative } = automaton;
+  let score = 3;
+  let state = 0;
+  let best = 0;
+  let worst = 0;
+  let wordStart = -1;
+  let negated = 0;
+  
+  for (let i = 0; i <= text.length; i++) {
+    const code = i < text.length ? text.charCodeAt(i) : 32;
+    if (!isWhitespace(code)) {
+      if (wordStart < 0) wordStart = i;
+      state = code < 128 ? delta[state * 128 + code] : 0;
+      if (positive[state] > best) best = positive[state];
+      if (negative[state] < worst) worst = negative[state];
+      continue;
+    }
+    if (wordStart < 0) continue;
+    
+    let contribution = best + worst;
+    if (negated > 0) {
+      if (best !== 0 || worst !== 0) {
+        contribution = -contribution;
+        negated = 0;
+      } else {
+        negated--;
+      }
+    }
+    score += contribution;
+    if (i - wordStart <= 8 && NEGATIONS.has(text.slice(wordStart, i).toLowerCase())) negated = NEGATION_SCOPE;
+    
+    state = 0;
+    best = 0;
+    worst = 0;
+    wordStart = -1;
+  }
+  
+  return Math.max(1, Math.min(5, score));
+};
+
+const analyzeSentimentBatch = (texts, automaton = SENTIMENT_AUTOMATON) => {
+  const scores = new Float32Array(texts.length);
+  for (let i = 0; i < texts.length; i++) {
+    scores[i] = analyzeSentiment(texts[i] || '', automaton);
+  }
+  return scores;
+};
+
+const MEDITATION_TYPE_IDS = MEDITATION_TYPES.map(t => t.id);
+const UNKNOWN_TYPE_CODE = 255;
+
+class SessionColumns {
+  constructor(capacity = 64) {
+    this.length = 0;
+    this.typeCounts = new Uint32Array(MEDITATION_TYPE_IDS.length);
+    this.typeImprovement = new Float64Array(MEDITATION_TYPE_IDS.length);
+    this.days = new Set();
+    this.allocate(Math.max(1, capacity));
+  }
+  
+  allocate(capacity) {
+    const grow = (Type, column) => {
+      const next = new Type(capacity);
+      if (column) next.set(column.subarray(0, this.length));
+      return next;
+    };
+    this.ids = grow(Float64Array, this.ids);
+    this.times = grow(Float64Array, this.times);
+    this.types = grow(Uint8Array, this.types);
+    this.moodBefore = grow(Uint8Array, this.moodBefore);
+    this.moodAfter = grow(Uint8Array, this.moodAfter);
+    this.durations = grow(Uint16Array, this.durations);
+  }
+  
+  reserve() {
+    if (this.length === this.ids.length) this.allocate(this.length * 2);
+    return this.length++;
+  }
+  
+  push(session) {
+    const i = this.reserve();
+    const type = MEDITATION_TYPE_IDS.indexOf(session.type);
+    this.ids[i] = session.id;
+    this.times[i] = new Date(session.date).getTime();
+    this.types[i] = type >= 0 ? type : UNKNOWN_TYPE_CODE;
+    this.moodBefore[i] = session.moodBefore;
+    this.moodAfter[i] = session.moodAfter;
+    this.durations[i] = session.duration;
+    this.tally(i);
+  }
+  
+  copyRow(other, j) {
+    const i = this.reserve();
+    this.ids[i] = other.ids[j];
+    this.times[i] = other.times[j];
+    this.types[i] = other.types[j];
+    this.moodBefore[i] = other.moodBefore[j];
+    this.moodAfter[i] = other.moodAfter[j];
+    this.durations[i] = other.durations[j];
+    this.tally(i);
+  }
+  
+  tally(i) {
+    const type = this.types[i];
+    if (type < this.typeCounts.length) {
+      this.typeCounts[type]++;
+      this.typeImprovement[type] += this.moodAfter[i] - this.moodBefore[i];
+    }
+    this.days.add(localDayKey(new Date(this.times[i])));
+  }
+}
+
+class JournalColumns {
+  constructor(capacity = 64) {
+    this.length = 0;
+    this.sentimentTotal = 0;
+    this.allocate(Math.max(1, capacity));
+  }
+  
+  allocate(capacity) {
+    const grow = (Type, column) => {
+      const next = new Type(capacity);
+      if (column) next.set(column.subarray(0, this.length));
+      return next;
+    };
+    this.ids = grow(Float64Array, this.ids);
+    this.sentiment = grow(Float32Array, this.sentiment);
+  }
+  
+  push(id, sentiment) {
+    if (this.length === this.ids.length) this.allocate(this.length * 2);
+    const i = this.length++;
+    this.ids[i] = id;
+    this.sentiment[i] = sentiment;
+    this.sentimentTotal += sentiment;
+  }
+  
+  score(i, sentiment) {
+    this.sentimentTotal += sentiment - this.sentiment[i];
+    this.sentiment[i] = sentiment;
+  }
+  
+  recent(count) {
+    return this.sentiment.slice(Math.max(0, this.length - count), this.length);
+  }
+}
+
+const computeAnalytics = (sessions, journals, today) => {
+  const { length, moodBefore, moodAfter, typeCounts, typeImprovement } = sessions;
+  let mostEffectiveType = null;
+  let bestAvg = -Infinity;
+  for (let type = 0; type < typeCounts.length; type++) {
+    if (typeCounts[type] > 0 && typeImprovement[type] / typeCounts[type] > bestAvg) {
+      bestAvg = typeImprovement[type] / typeCounts[type];
+      mostEffectiveType = MEDITATION_TYPE_IDS[type];
+    }
+  }
+  
+  const start = Math.max(0, length - 10);
+  const moodTrend = new Float32Array((length - start) * 2);
+  for (let i = start; i < length; i++) {
+    moodTrend[(i - start) * 2] = moodBefore[i];
+    moodTrend[(i - start) * 2 + 1] = moodAfter[i];
+  }
+  
+  return {
+    sessions: length,
+    typeCounts: typeCounts.slice(),
+    typeImprovement: typeImprovement.slice(),
+    mostEffectiveType,
+    streak: countStreak(day => sessions.days.has(localDayKey(day)), today),
+    moodTrend,
+    sentiment: journals.recent(20),
+    sentimentAverage: journals.length > 0 ? journals.sentimentTotal / journals.length : null
+  };
+};
+
+const createAnalyticsStore = () => ({
+  session: new SessionColumns(),
+  journal: new JournalColumns(),
+  unscored: { rows: [], texts: [] },
+  scored: [],
+  ids: { session: new Set(), journal: new Set() }
+});
+
+const ANALYTICS_FIELDS = {
+  session: ['id', 'type', 'date', 'moodBefore', 'moodAfter', 'duration'],
+  journal: ['id', 'reflection', 'sentiment']
+};
+
+const ANALYTICS_PAGE_SIZE = 1000;
+
+const forEachStoredRecord = async ({ database, store }, visit) => {
+  const db = await idbRequest(indexedDB.open(database));
+  try {
+    let after = null;
+    let records;
+    do {
+      const range = after === null ? undefined : IDBKeyRange.lowerBound(after, true);
+      records = await idbRequest(db.transaction(store).objectStore(store).getAll(range, ANALYTICS_PAGE_SIZE));
+      records.forEach(visit);
+      if (records.length > 0) after = records[records.length - 1].id;
+    } while (records.length === ANALYTICS_PAGE_SIZE);
+  } finally {
+    db.close();
+  }
+};
+
+const addAnalyticsRecord = (store, kind, record) => {
+  if (store.ids[kind].has(record.id)) return;
+  store.ids[kind].add(record.id);
+  if (kind === 'session') {
+    store.session.push(record);
+  } else if (record.sentiment >= 1 && record.sentiment <= 5) {
+    store.journal.push(record.id, record.sentiment);
+  } else {
+    store.unscored.rows.push(store.journal.length);
+    store.unscored.texts.push(record.reflection || '');
+    store.journal.push(record.id, 0);
+    if (store.unscored.rows.length >= ANALYTICS_PAGE_SIZE) scoreJournals(store);
+  }
+};
+
+const scoreJournals = (store) => {
+  const { rows, texts } = store.unscored;
+  if (rows.length === 0) return;
+  const scores = analyzeSentimentBatch(texts);
+  rows.forEach((row, i) => store.journal.score(row, scores[i]));
+  store.scored.push(...rows);
+  store.unscored = { rows: [], texts: [] };
+};
+
+const reportBackfill = (store, reply) => {
+  scoreJournals(store);
+  if (store.scored.length === 0) return;
+  const ids = Float64Array.from(store.scored, row => store.journal.ids[row]);
+  const values = Float32Array.from(store.scored, row => store.journal.sentiment[row]);
+  store.scored = [];
+  reply({ backfill: { kind: 'journal', field: 'sentiment', ids, values } }, [ids.buffer, values.buffer]);
+};
+
+const handleAnalyticsMessage = async (store, data, reply) => {
+  if (data.type === 'load') {
+    const previous = store[data.kind];
+    store.ids[data.kind] = new Set();
+    store[data.kind] = data.kind === 'session' ? new SessionColumns(previous.length) : new JournalColumns(previous.length);
+    const add = record => addAnalyticsRecord(store, data.kind, record);
+    if (data.source.chunks) {
+      data.source.chunks.forEach(chunk => forEachChunkRecord(chunk, add, ANALYTICS_FIELDS[data.kind]));
+    } else {
+      await forEachStoredRecord(data.source, add);
+    }
+    
+    for (let i = 0; i < previous.length; i++) {
+      if (store.ids[data.kind].has(previous.ids[i])) continue;
+      store.ids[data.kind].add(previous.ids[i]);
+      if (data.kind === 'session') {
+        store.session.copyRow(previous, i);
+      } else {
+        store.journal.push(previous.ids[i], previous.sentiment[i]);
+      }
+    }
+    reportBackfill(store, reply);
+  } else if (data.type === 'append') {
+    addAnalyticsRecord(store, data.kind, data.record);
+    reportBackfill(store, reply);
+  } else if (data.type === 'compute') {
+    const result = computeAnalytics(store.session, store.journal, new Date(data.today));
+    reply({ id: data.id, result }, [
+      result.typeCounts.buffer,
+      result.typeImprovement.buffer,
+      result.moodTrend.buffer,
+      result.sentiment.buffer
+    ]);
+  }
+};
+
+const analyticsWorkerSource = () => [
+  `const SENTIMENT_LEXICON = ${JSON.stringify(SENTIMENT_LEXICON)};`,
+  `const NEGATIONS = new Set(${JSON.stringify([...NEGATIONS])});`,
+  `const NEGATION_SCOPE = ${NEGATION_SCOPE};`,
+  `const isWhitespace = ${isWhitespace};`,
+  `const compileSentimentLexicon = ${compileSentimentLexicon};`,
+  'const SENTIMENT_AUTOMATON = compileSentimentLexicon(SENTIMENT_LEXICON);',
+  `const analyzeSentiment = ${analyzeSentiment};`,
+  `const analyzeSentimentBatch = ${analyzeSentimentBatch};`,
+  `const forEachChunkRecord = ${forEachChunkRecord};`,
+  `const idbRequest = ${idbRequest};`,
+  `const ANALYTICS_PAGE_SIZE = ${ANALYTICS_PAGE_SIZE};`,
+  `const forEachStoredRecord = ${forEachStoredRecord};`,
+  `const localDayKey = ${localDayKey};`,
+  `const countStreak = ${countStreak};`,
+  `const MEDITATION_TYPE_IDS = ${JSON.stringify(MEDITATION_TYPE_IDS)};`,
+  `const UNKNOWN_TYPE_CODE = ${UNKNOWN_TYPE_CODE};`,
+  `const SessionColumns = ${SessionColumns};`,
+  `const JournalColumns = ${JournalColumns};`,
+  `const computeAnalytics = ${computeAnalytics};`,
+  `const ANALYTICS_FIELDS = ${JSON.stringify(ANALYTICS_FIELDS)};`,
+  `const createAnalyticsStore = ${createAnalyticsStore};`,
+  `const addAnalyticsRecord = ${addAnalyticsRecord};`,
+  `const scoreJournals = ${scoreJournals};`,
+  `const reportBackfill = ${reportBackfill};`,
+  `const handleAnalyticsMessage = ${handleAnalyticsMessage};`,
+  'const store = createAnalyticsStore();',
+  'const reply = (message, transfer) => self.postMessage(message, transfer);',
+  'let queue = Promise.resolve();',
+  'self.onmessage = ({ data }) => {',
+  '  queue = queue.then(() => handleAnalyticsMessage(store, data, reply)).catch(error => setTimeout(() => { throw error; }));',
+  '};'
+].join('\n');
+
+class AnalyticsClient {
+  constructor(logs) {
+    this.logs = logs;
+    this.worker = null;
+    this.store = null;
+    this.requests = new Map();
+    this.nextId = 0;
+    this.ready = null;
+    this.queue = Promise.resolve();
+  }
+  
+  start() {
+    if (!this.ready) {
+      this.spawn();
+      this.ready = this.load();
+    }
+    return this.ready;
+  }
+  
+  spawn() {
+    try {
+      const url = URL.createObjectURL(new Blob([analyticsWorkerSource()], { type: 'text/javascript' }));
+      this.worker = new Worker(url);
+      this.worker.onmessage = ({ data }) => this.receive(data);
+      this.worker.onerror = (event) => {
+        event.preventDefault();
+        console.error('Error:', event.message);
+        this.useMainThread();
+        this.ready = this.load().then(() => {
+          this.requests.forEach((_, id) => this.post(this.computeMessage(id)));
+        });
+      };
+    } catch (error) {
+      this.useMainThread();
+    }
+  }
+  
+  useMainThread() {
+    if (this.worker) this.worker.terminate();
+    this.worker = null;
+    this.store = createAnalyticsStore();
+  }
+  
+  reload() {
+    this.ready = this.start().then(() => this.load());
+    return this.ready;
+  }
+  
+  async load() {
+    for (const kind of Object.keys(this.logs)) {
+      this.post({ type: 'load', kind, source: await this.logs[kind].analyticsSource() });
+    }
+  }
+  
+  post(message) {
+    if (this.worker) {
+      this.worker.postMessage(message);
+    } else if (this.store) {
+      this.queue = this.queue
+        .then(() => handleAnalyticsMessage(this.store, message, (data) => this.receive(data)))
+        .catch(error => console.error('Error:', error));
+    }
+  }
+  
+  receive(data) {
+    if (data.backfill) {
+      const { kind, field, ids, values } = data.backfill;
+      this.logs[kind].annotate(field, ids, values).catch(error => console.error('Error:', error));
+    } else {
+      this.resolve(data);
+    }
+  }
+  
+  resolve({ id, result }) {
+    const resolver = this.requests.get(id);
+    this.requests.delete(id);
+    if (resolver) resolver(result);
+  }
+  
+  append(kind, record) {
+    this.post({ type: 'append', kind, record });
+  }
+  
+  computeMessage(id) {
+    return { type: 'compute', id, today: Date.now() };
+  }
+  
+  async compute() {
+    await this.start();
+    const id = ++this.nextId;
+    const result = new Promise(resolve => this.requests.set(id, resolve));
+    this.post(this.computeMessage(id));
+    return result;
+  }
+}
+
+const analyticsClient = new AnalyticsClient({ session: sessionLog, journal: journalLog });
+
+const CONTENT_BASE = 'content/';
+const CONTENT_CACHE = 'sukoon-content-v1';
+
+class ContentLibrary {
+  constructor(base) {
+    this.base = base;
+    this.requests = new Map();
+  }
+  
+  url(path, hash) {
+    return `${this.base}${path}${hash ? `?v=${hash}` : ''}`;
+  }
+  
+  fetchJson(path, hash) {
+    const url = this.url(path, hash);
+    if (!this.requests.has(url)) {
+      const request = this.load(url, Boolean(hash));
+      request.catch(() => this.requests.delete(url));
+      this.requests.set(url, request);
+    }
+    return this.requests.get(url);
+  }
+  
+  async openCache() {
+    if (typeof caches === 'undefined') return null;
+    try {
+      return await caches.open(CONTENT_CACHE);
+    } catch (error) {
+      return null;
+    }
+  }
+  
+  async load(url, immutable) {
+    const cache = await this.openCache();
+    if (immutable && cache) {
+      const cached = await cache.match(url);
+      if (cached) return cached.json();
+    }
+    try {
+      const response = await fetch(url, { cache: immutable ? 'force-cache' : 'no-cache' });
+      if (!response.ok) throw new Error(`${url}: ${response.status}`);
+      if (cache) await cache.put(url, response.clone());
+      return await response.json();
+    } catch (error) {
+      const cached = cache && await cache.match(url);
+      if (cached) return cached.json();
+      throw error;
+    }
+  }
+  
+  async pack(name) {
+    const manifest = await this.fetchJson('manifest.json');
+    const entry = manifest.packs[name];
+    return this.fetchJson(entry.path, entry.hash);
+  }
+  
+  affirmations() {
+    return this.pack('affirmations');
+  }
+  
+  async guide(typeId) {
+    const entry = (await this.pack('guides')).items[typeId];
+    return entry ? this.fetchJson(entry.path, entry.hash) : null;
+  }
+  
+  async articles() {
+    return (await this.pack('articles')).items;
+  }
+  
+  async article(id) {
+    const entry = (await this.articles()).find(item => item.id === id);
+    return entry ? this.fetchJson(entry.path, entry.hash) : null;
+  }
+  
+  async prune() {
+    const cache = await this.openCache();
+    if (!cache) return;
+    const manifest = await this.fetchJson('manifest.json');
+    const version = Object.values(manifest.packs).map(({ hash }) => hash).join(',');
+    if ((await readStorage('sukoon-content-pruned')) === version) return;
+    const [guides, articles] = await Promise.all([this.pack('guides'), this.pack('articles')]);
+    const live = new Set(
+      [...Object.values(manifest.packs), ...Object.values(guides.items), ...articles.items]
+        .map(({ path, hash }) => new URL(this.url(path, hash), document.baseURI).href)
+    );
+    const keys = await cache.keys();
+    await Promise.all(keys
+      .filter(request => new URL(request.url).searchParams.has('v') && !live.has(request.url))
+      .map(request => cache.delete(request)));
+    await writeStorage('sukoon-content-pruned', version);
+  }
+}
+
+const contentLibrary = new ContentLibrary(CONTENT_BASE);
+
+let chartsModule = null;
+let chartsLoading = null;
+
+const loadCharts = () => {
+  if (!chartsLoading) {
+    chartsLoading = import('recharts').then(module => {
+      chartsModule = module;
+      return module;
+    });
+    chartsLoading.catch(() => {
+      chartsLoading = null;
     });
   }
+  return chartsLoading;
+};
+
+const prefetchPack = (name) => () => {
+  contentLibrary.pack(name).catch(() => {});
+};
+
+const measureStartup = () => {
+  if (typeof performance === 'undefined' || !performance.measure) return;
+  const warm = typeof navigator !== 'undefined' && Boolean(navigator.serviceWorker?.controller);
+  try {
+    performance.measure(warm ? 'sukoon-warm-start' : 'sukoon-cold-start');
+  } catch (error) {
+    console.error('Error:', error);
+  }
+};
+
+const IMPORT_BATCH_SIZE = 500;
+const CSV_COLUMNS = ['kind', 'id', 'date', 'type', 'duration', 'moodBefore', 'moodAfter', 'mood', 'reflection', 'tags', 'prePrompts', 'postPrompts'];
+
+const csvField = (value) => {
+  if (value === undefined || value === null) return '';
+  const text = typeof value === 'object' ? JSON.stringify(value) : String(value);
+  return /[",\n\r]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+};
+
+const exportLine = (format, kind, record) => format === 'csv'
+  ? `${CSV_COLUMNS.map(column => csvField(column === 'kind' ? kind : record[column])).join(',')}\n`
+  : `${JSON.stringify({ kind, ...record })}\n`;
+
+const createExportStream = (format, onProgress = () => {}) => {
+  const sources = [['session', sessionLog], ['journal', journalLog]];
+  let current = 0;
+  let readPage = null;
+  let exported = 0;
+  let total = 0;
   
-  setVolume(volume) {
-    this.gainNodes.forEach(gain => {
-      gain.gain.value = volume * 0.5;
-    });
+  return new ReadableStream({
+    async start(controller) {
+      await Promise.all(sources.map(([, log]) => log.open()));
+      total = sources.reduce((sum, [, log]) => sum + log.length, 0);
+      if (format === 'csv') controller.enqueue(`${CSV_COLUMNS.join(',')}\n`);
+    },
+    
+    async pull(controller) {
+      while (current < sources.length) {
+        const [kind, log] = sources[current];
+        if (!readPage) readPage = await log.pageReader();
+        const records = await readPage();
+        if (records) {
+          exported += records.length;
+          controller.enqueue(records.map(record => exportLine(format, kind, record)).join(''));
+          onProgress({ exported, total });
+          return;
+        }
+        current++;
+        readPage = null;
+      }
+      const bookmarks = toBookmarkIds(await readBookmarks());
+      if (bookmarks.size > 0) {
+        controller.enqueue([...bookmarks].map(id => exportLine(format, 'bookmark', { id })).join(''));
+      }
+      controller.close();
+    }
+  }, { highWaterMark: 1 });
+};
+
+const isMood = (value) => Number.isInteger(value) && value >= 1 && value <= 5;
+const isDate = (value) => typeof value === 'string' && !Number.isNaN(Date.parse(value));
+
+const IMPORT_VALIDATORS = {
+  session: (record) => Number.isFinite(record.id) && isDate(record.date) && typeof record.type === 'string' &&
+    Number.isFinite(record.duration) && record.duration > 0 && isMood(record.moodBefore) && isMood(record.moodAfter),
+  journal: (record) => Number.isFinite(record.id) && isDate(record.date) && typeof record.reflection === 'string' &&
+    (record.tags === undefined || Array.isArray(record.tags)),
+  bookmark: (record) => typeof record.id === 'string'
+};
+
+const importHistory = async (stream, onProgress = () => {}) => {
+  const reader = stream.pipeThrough(new TextDecoderStream()).getReader();
+  const batches = { session: [], journal: [] };
+  const bookmarks = [];
+  const result = { lines: 0, imported: 0, duplicates: 0, invalid: 0 };
+  let buffer = '';
+  
+  const flush = async (kind) => {
+    const records = batches[kind];
+    if (records.length === 0) return;
+    batches[kind] = [];
+    const inserted = await (kind === 'session' ? sessionLog : journalLog).appendBatch(records);
+    const indexWrites = inserted.map(record => searchIndex.add(kind, record));
+    if (kind === 'session') {
+      indexWrites.push(sessionStats.addMany(inserted), dayIndex.addMany(inserted), recommender.addMany(inserted));
+    }
+    await Promise.all(indexWrites);
+    result.imported += inserted.length;
+    result.duplicates += records.length - inserted.length;
+    onProgress({ ...result });
+  };
+  
+  const handleLine = async (line) => {
+    if (!line.trim()) return;
+    result.lines++;
+    let entry;
+    try {
+      entry = JSON.parse(line);
+    } catch (error) {
+      result.invalid++;
+      return;
+    }
+    const { kind, ...record } = entry || {};
+    if (!IMPORT_VALIDATORS[kind] || !IMPORT_VALIDATORS[kind](record)) {
+      result.invalid++;
+      return;
+    }
+    if (kind === 'bookmark') {
+      bookmarks.push(record.id);
+      return;
+    }
+    batches[kind].push(record);
+    if (batches[kind].length >= IMPORT_BATCH_SIZE) await flush(kind);
+  };
+  
+  for (let chunk = await reader.read(); !chunk.done; chunk = await reader.read()) {
+    const lines = (buffer + chunk.value).split('\n');
+    buffer = lines.pop();
+    for (const line of lines) await handleLine(line);
   }
+  await handleLine(buffer);
+  await flush('session');
+  await flush('journal');
+  onProgress({ ...result });
   
-  stop() {
-    this.oscillators.forEach(osc => {
-      try {
-        if (osc.stop) osc.stop();
-        if (osc.disconnect) osc.disconnect();
-      } catch (e) {}
-    });
-    this.oscillators = [];
-    this.gainNodes = [];
-    this.isPlaying = false;
+  if (bookmarks.length > 0) {
+    const ids = toBookmarkIds(await readBookmarks());
+    bookmarks.forEach(id => ids.add(id));
+    await writeBookmarks([...ids]);
   }
-}
+  await analyticsClient.reload();
+  return result;
+};
+
+const EXPORT_PART_BYTES = 32 * 1024 * 1024;
 
-const analyzeSentiment = (text) => {
-  const positive = ['happy', 'peaceful', 'calm', 'grateful', 'joy', 'love', 'good', 'better', 'clear', 'light'];
-  const negative = ['anxious', 'stressed', 'sad', 'tired', 'overwhelmed', 'worried', 'pain', 'difficult', 'heavy'];
+const downloadUrl = (url, name) => {
+  const link = document.createElement('a');
+  link.href = url;
+  link.download = name;
+  link.click();
+};
+
+const streamToServiceWorker = (worker, stream, name) => new Promise((resolve, reject) => {
+  const reader = stream.getReader();
+  const { port1, port2 } = new MessageChannel();
+  const url = new URL(`sukoon-export/${Date.now()}/${encodeURIComponent(name)}`, document.baseURI).href;
   
-  const words = text.toLowerCase().split(/\s+/);
-  let score = 3;
+  port1.onmessage = async ({ data }) => {
+    if (data === 'ready') {
+      downloadUrl(url, name);
+    } else if (data === 'cancel') {
+      reader.cancel().catch(() => {});
+      port1.close();
+      resolve();
+    } else if (data === 'pull') {
+      try {
+        const { done, value } = await reader.read();
+        if (done) {
+          port1.postMessage({ done: true });
+          port1.close();
+          resolve();
+        } else {
+          port1.postMessage({ value }, [value.buffer]);
+        }
+      } catch (error) {
+        port1.postMessage({ error: String(error) });
+        port1.close();
+        reject(error);
+      }
+    }
+  };
+  worker.postMessage({ type: 'sukoon-export', url, name }, [port2]);
+});
+
+const saveExportParts = async (stream, name, header) => {
+  const reader = stream.getReader();
+  const [base, extension] = name.split(/\.(?=[^.]+$)/);
+  let parts = [];
+  let size = 0;
+  let part = 0;
   
-  words.forEach(word => {
-    if (positive.some(p => word.includes(p))) score += 0.5;
-    if (negative.some(n => word.includes(n))) score -= 0.5;
-  });
+  const save = () => {
+    part++;
+    const url = URL.createObjectURL(new Blob(parts));
+    downloadUrl(url, part === 1 ? name : `${base}-${part}.${extension}`);
+    URL.revokeObjectURL(url);
+    parts = header ? [header] : [];
+    size = 0;
+  };
   
-  return Math.max(1, Math.min(5, score));
+  for (let chunk = await reader.read(); !chunk.done; chunk = await reader.read()) {
+    parts.push(chunk.value);
+    size += chunk.value.byteLength;
+    if (size >= EXPORT_PART_BYTES) save();
+  }
+  if (part === 0 || size > 0) save();
+};
+
+const saveExport = async (format, onProgress) => {
+  const name = `sukoon-history.${format === 'csv' ? 'csv' : 'ndjson'}`;
+  const stream = createExportStream(format, onProgress).pipeThrough(new TextEncoderStream());
+  if (window.showSaveFilePicker) {
+    const handle = await window.showSaveFilePicker({ suggestedName: name });
+    await stream.pipeTo(await handle.createWritable());
+    return;
+  }
+  const worker = navigator.serviceWorker?.controller;
+  if (worker) {
+    await streamToServiceWorker(worker, stream, name);
+    return;
+  }
+  await saveExportParts(stream, name, format === 'csv' ? `${CSV_COLUMNS.join(',')}\n` : null);
 };
 
-const getRecommendation = (sessions, journals) => {
+const getRecommendation = (sessions, journals, model = recommender.data, now = new Date()) => {
   if (sessions.length === 0) {
     return {
       type: 'calm',
@@ -483,14 +2368,30 @@ const getRecommendation = (sessions, journals) => {
   }
   
   const recentMoods = sessions.slice(-5).map(s => s.moodBefore);
-  const avgMood = recentMoods.reduce((a, b) => a + b, 0) / recentMoods.length;
+  let mood = recentMoods.reduce((a, b) => a + b, 0) / recentMoods.length;
+  const lastJournal = journals[journals.length - 1];
+  if (lastJournal && now - new Date(lastJournal.date) < 24 * 60 * 60 * 1000) {
+    mood = (mood * 2 + analyzeSentiment(lastJournal.reflection || '')) / 3;
+  }
+  
+  const pick = Recommender.recommend(model, now, mood);
+  const name = MEDITATION_TYPE_BY_ID[pick.type]?.name || pick.type;
+  const minutes = pick.minutes ? ` Around ${Math.round(pick.minutes)} minutes has suited you.` : '';
+  
+  if (pick.n >= 3 && pick.mean > 0) {
+    return {
+      type: pick.type,
+      message: `${name} sessions have lifted your mood by about ${pick.mean.toFixed(1)} points. Let's return to it today.${minutes}`
+    };
+  }
   
-  if (avgMood < 2.5) {
-    return { type: 'healing', message: "I sense you've been carrying some weight. A healing session might help you release and restore." };
-  } else if (avgMood < 3) {
-    return { type: 'calm', message: "You've felt anxious lately. Let's cultivate some calm together." };
+  const band = moodBand(mood);
+  if (band === 'low') {
+    return { type: pick.type, message: `I sense you've been carrying some weight. A ${name} session might help you release and restore.${minutes}` };
+  } else if (band === 'unsettled') {
+    return { type: pick.type, message: `You've felt anxious lately. Let's cultivate some calm together with ${name}.${minutes}` };
   } else {
-    return { type: 'balance', message: "Maintain your equilibrium with a balanced meditation today." };
+    return { type: pick.type, message: `Maintain your equilibrium with a ${name} meditation today.${minutes}` };
   }
 };
 
@@ -504,14 +2405,39 @@ export default function SukoonApp() {
   const [musicPlaying, setMusicPlaying] = useState(false);
   const [musicVolume, setMusicVolume] = useState(0.5);
   const [currentTrack, setCurrentTrack] = useState(MUSIC_TRACKS[0]);
-  const [bookmarkedContent, setBookmarkedContent] = useState([]);
+  const [bookmarkedIds, setBookmarkedIds] = useState(() => new Set());
+  const [olderChunks, setOlderChunks] = useState({ journals: 0 });
+  const [stats, setStats] = useState(sessionStats.data);
+  const [days, setDays] = useState(dayIndex.data);
+  const [analytics, setAnalytics] = useState(null);
+  const [dataVersion, setDataVersion] = useState(0);
+  const period = timeOfDay(new Date());
+  const recommendation = useMemo(() => getRecommendation(sessions, journals), [dataVersion, period]);
   const soundEngine = useRef(null);
   
   useEffect(() => {
     loadUserData();
     soundEngine.current = new AmbientSoundEngine();
+    soundEngine.current.prepare();
+    
+    if ('serviceWorker' in navigator) {
+      navigator.serviceWorker.register('sw.js').catch(error => console.error('Error:', error));
+    }
+    
+    const flushOnExit = () => {
+      storageQueue.flush();
+      bookmarkQueue.flush();
+    };
+    const flushOnHide = () => {
+      if (document.visibilityState === 'hidden') flushOnExit();
+    };
+    document.addEventListener('visibilitychange', flushOnHide);
+    window.addEventListener('pagehide', flushOnExit);
     
     return () => {
+      document.removeEventListener('visibilitychange', flushOnHide);
+      window.removeEventListener('pagehide', flushOnExit);
+      flushOnExit();
       if (soundEngine.current) {
         soundEngine.current.stop();
       }
@@ -535,82 +2461,138 @@ export default function SukoonApp() {
     }
   }, [musicVolume]);
   
-  const loadUserData = async () => {
+  const refreshAnalytics = () => {
+    analyticsClient.compute()
+      .then(async (result) => {
+        setAnalytics(result);
+        if (result.sessions === sessionStats.data.count && !sessionStats.matches(result)) {
+          await sessionStats.rebuild(await sessionLog.readAll());
+          setStats(sessionStats.data);
+        }
+      })
+      .catch(error => console.error('Error:', error));
+  };
+  
+  const reloadUserData = async () => {
     try {
-      const userResult = await window.storage.get('sukoon-user');
-      if (userResult) {
-        const userData = JSON.parse(userResult.value);
+      const [userData, recentSessions, recentJournals, bookmarks, storedStats, storedDays] = await Promise.all([
+        readStorage('sukoon-user'),
+        sessionLog.readRecent(),
+        journalLog.readRecent(),
+        readBookmarks(),
+        sessionStats.load(sessionLog),
+        dayIndex.load(sessionLog),
+        recommender.load(sessionLog)
+      ]);
+      if (userData) {
         setUsername(userData.username);
         setShowNamePrompt(false);
       }
       
-      const sessionsResult = await window.storage.get('sukoon-sessions');
-      if (sessionsResult) setSessions(JSON.parse(sessionsResult.value));
-      
-      const journalsResult = await window.storage.get('sukoon-journals');
-      if (journalsResult) setJournals(JSON.parse(journalsResult.value));
-      
-      const bookmarksResult = await window.storage.get('sukoon-bookmarks');
-      if (bookmarksResult) setBookmarkedContent(JSON.parse(bookmarksResult.value));
+      setSessions(recentSessions.records);
+      setJournals(recentJournals.records);
+      setOlderChunks({ journals: recentJournals.olderChunks });
+      if (bookmarks) {
+        const ids = toBookmarkIds(bookmarks);
+        setBookmarkedIds(ids);
+        if (bookmarks.some(bookmark => typeof bookmark !== 'string')) {
+          writeBookmarks([...ids]).catch(error => console.error('Error:', error));
+        }
+      }
+      setStats(storedStats);
+      setDays(storedDays);
+      setDataVersion(v => v + 1);
     } catch (error) {
       console.log('First time user');
     }
-    
-    setCurrentAffirmation(AFFIRMATIONS[Math.floor(Math.random() * AFFIRMATIONS.length)]);
+    refreshAnalytics();
+  };
+  
+  const loadUserData = async () => {
+    await reloadUserData();
+    contentLibrary.affirmations()
+      .then(affirmations => setCurrentAffirmation(affirmations[Math.floor(Math.random() * affirmations.length)]))
+      .then(() => contentLibrary.prune())
+      .catch(error => console.error('Error:', error));
+    measureStartup();
+  };
+  
+  const loadOlder = async (name, log, setRecords) => {
+    const end = olderChunks[name];
+    if (end === 0) return;
+    const start = end - 1;
+    try {
+      const records = await log.readChunks(start, end);
+      setRecords(prev => [...records, ...prev]);
+      setOlderChunks(prev => ({ ...prev, [name]: start }));
+    } catch (error) {
+      console.error('Error:', error);
+    }
   };
   
+  const loadOlderJournals = () => loadOlder('journals', journalLog, setJournals);
+  
   const saveUsername = async (name) => {
     setUsername(name);
     setShowNamePrompt(false);
     try {
-      await window.storage.set('sukoon-user', JSON.stringify({ username: name }));
+      await writeStorage('sukoon-user', { username: name });
     } catch (error) {
       console.error('Error:', error);
     }
   };
   
   const saveSession = async (sessionData) => {
-    const newSessions = [...sessions, { ...sessionData, id: Date.now(), date: new Date().toISOString() }];
-    setSessions(newSessions);
+    const session = { ...sessionData, id: Date.now(), date: new Date().toISOString() };
+    setSessions(prev => [...prev, session]);
+    analyticsClient.append('session', session);
+    refreshAnalytics();
+    const indexWrites = [sessionStats.add(session), dayIndex.add(session), recommender.add(session)];
+    setStats(sessionStats.data);
+    setDays(dayIndex.data);
+    setDataVersion(v => v + 1);
     try {
-      await window.storage.set('sukoon-sessions', JSON.stringify(newSessions));
+      await Promise.all([sessionLog.append(session), searchIndex.add('session', session), ...indexWrites]);
     } catch (error) {
       console.error('Error:', error);
     }
   };
   
   const saveJournal = async (journalData) => {
-    const newJournals = [...journals, { ...journalData, id: Date.now(), date: new Date().toISOString() }];
-    setJournals(newJournals);
+    const journal = {
+      ...journalData,
+      id: Date.now(),
+      date: new Date().toISOString(),
+      sentiment: analyzeSentiment(journalData.reflection || '')
+    };
+    setJournals(prev => [...prev, journal]);
+    setDataVersion(v => v + 1);
+    analyticsClient.append('journal', journal);
+    refreshAnalytics();
     try {
-      await window.storage.set('sukoon-journals', JSON.stringify(newJournals));
+      await Promise.all([journalLog.append(journal), searchIndex.add('journal', journal)]);
     } catch (error) {
       console.error('Error:', error);
     }
   };
   
-  const toggleBookmark = async (content) => {
-    const isBookmarked = bookmarkedContent.some(b => b.title === content.title);
-    const newBookmarks = isBookmarked
-      ? bookmarkedContent.filter(b => b.title !== content.title)
-      : [...bookmarkedContent, content];
+  const toggleBookmark = async (contentId) => {
+    const newBookmarks = new Set(bookmarkedIds);
+    const saved = !newBookmarks.has(contentId);
+    if (saved) {
+      newBookmarks.add(contentId);
+    } else {
+      newBookmarks.delete(contentId);
+    }
     
-    setBookmarkedContent(newBookmarks);
+    setBookmarkedIds(newBookmarks);
     try {
-      await window.storage.set('sukoon-bookmarks', JSON.stringify(newBookmarks));
+      await writeBookmark(contentId, saved, [...newBookmarks]);
     } catch (error) {
       console.error('Error:', error);
     }
   };
   
-  const getGreeting = () => {
-    const hour = new Date().getHours();
-    if (hour < 12) return '🌅 Good Morning';
-    if (hour < 17) return '☀️ Good Afternoon';
-    if (hour < 21) return '🌆 Good Evening';
-    return '🌙 Good Night';
-  };
-  
   if (showNamePrompt) {
     return (
       <div className="min-h-screen bg-gradient-to-br from-green-50 via-purple-50 to-blue-50 flex items-center justify-center p-4">
@@ -651,13 +2633,13 @@ export default function SukoonApp() {
     <div className="min-h-screen bg-gradient-to-br from-slate-50 via-purple-50 to-blue-50">
       {currentView === 'home' && <HomeView 
         username={username}
-        greeting={getGreeting()}
+        greeting={GREETINGS[period]}
         affirmation={currentAffirmation}
         setCurrentView={setCurrentView}
         musicPlaying={musicPlaying}
         setMusicPlaying={setMusicPlaying}
         sessions={sessions}
-        journals={journals}
+        recommendation={recommendation}
         musicVolume={musicVolume}
         setMusicVolume={setMusicVolume}
         currentTrack={currentTrack}
@@ -675,38 +2657,42 @@ export default function SukoonApp() {
         musicVolume={musicVolume}
         setMusicVolume={setMusicVolume}
         sessions={sessions}
-        journals={journals}
+        recommendation={recommendation}
       />}
       
       {currentView === 'journal' && <JournalView 
         setCurrentView={setCurrentView}
         journals={journals}
         saveJournal={saveJournal}
+        hasOlder={olderChunks.journals > 0}
+        loadOlder={loadOlderJournals}
       />}
       
       {currentView === 'progress' && <ProgressView 
         setCurrentView={setCurrentView}
         sessions={sessions}
         journals={journals}
+        stats={stats}
+        days={days}
+        analytics={analytics}
+        onImported={reloadUserData}
       />}
       
       {currentView === 'discover' && <DiscoverView 
         setCurrentView={setCurrentView}
-        bookmarkedContent={bookmarkedContent}
+        bookmarkedIds={bookmarkedIds}
         toggleBookmark={toggleBookmark}
       />}
     </div>
   );
 }
 
-function HomeView({ username, greeting, affirmation, setCurrentView, musicPlaying, setMusicPlaying, sessions, journals, musicVolume, setMusicVolume, currentTrack, setCurrentTrack }) {
-  const recommendation = getRecommendation(sessions, journals);
-  
+function HomeView({ username, greeting, affirmation, setCurrentView, musicPlaying, setMusicPlaying, sessions, recommendation, musicVolume, setMusicVolume, currentTrack, setCurrentTrack }) {
   return (
     <div className="max-w-6xl mx-auto p-6">
       <header className="text-center mb-12 relative">
         <div className="absolute top-0 right-0">
-          <img src="https://i.imgur.com/8qZ5K9M.png" alt="Amity University" className="h-16 w-16 object-contain" />
+          <img src="amity-logo.jpg" alt="Amity University" className="h-16 w-16 object-contain" />
         </div>
         <div className="text-5xl mb-4">🪷</div>
         <h1 className="text-5xl font-serif text-slate-800 mb-2">Sukoon</h1>
@@ -738,6 +2724,7 @@ function HomeView({ username, greeting, affirmation, setCurrentView, musicPlayin
           description="Begin your practice"
           color="from-blue-400 to-purple-500"
           onClick={() => setCurrentView('meditation')}
+          prefetch={prefetchPack('guides')}
         />
         <NavCard
           icon={<BookOpen size={32} />}
@@ -752,6 +2739,7 @@ function HomeView({ username, greeting, affirmation, setCurrentView, musicPlayin
           description="Track your journey"
           color="from-purple-400 to-pink-500"
           onClick={() => setCurrentView('progress')}
+          prefetch={loadCharts}
         />
         <NavCard
           icon={<Heart size={32} />}
@@ -759,6 +2747,7 @@ function HomeView({ username, greeting, affirmation, setCurrentView, musicPlayin
           description="Expand your practice"
           color="from-orange-400 to-red-500"
           onClick={() => setCurrentView('discover')}
+          prefetch={prefetchPack('articles')}
         />
       </div>
       
@@ -808,10 +2797,13 @@ function HomeView({ username, greeting, affirmation, setCurrentView, musicPlayin
   );
 }
 
-function NavCard({ icon, title, description, color, onClick }) {
+function NavCard({ icon, title, description, color, onClick, prefetch }) {
   return (
     <button
       onClick={onClick}
+      onMouseEnter={prefetch}
+      onFocus={prefetch}
+      onTouchStart={prefetch}
       className={`bg-gradient-to-br ${color} p-8 rounded-3xl text-white text-left hover:scale-105 transition-transform shadow-lg`}
     >
       <div className="mb-4">{icon}</div>
@@ -821,51 +2813,52 @@ function NavCard({ icon, title, description, color, onClick }) {
   );
 }
 
-function MeditationFlow({ setCurrentView, saveSession, saveJournal, currentTrack, setCurrentTrack, musicPlaying, setMusicPlaying, musicVolume, setMusicVolume, sessions, journals }) {
+function MeditationFlow({ setCurrentView, saveSession, saveJournal, currentTrack, setCurrentTrack, musicPlaying, setMusicPlaying, musicVolume, setMusicVolume, sessions, recommendation }) {
   const [step, setStep] = useState('setup');
   const [duration, setDuration] = useState(5);
   const [selectedType, setSelectedType] = useState(null);
   const [prePrompts, setPrePrompts] = useState({ bringing: '', feeling: '', intention: '' });
   const [moodBefore, setMoodBefore] = useState(3);
-  const [timeLeft, setTimeLeft] = useState(0);
-  const [isActive, setIsActive] = useState(false);
   const [postPrompts, setPostPrompts] = useState({ feelingNow: '', emotions: '', oneWord: '' });
   const [moodAfter, setMoodAfter] = useState(3);
   const [currentInstruction, setCurrentInstruction] = useState(0);
-  const timerRef = useRef(null);
+  const [guide, setGuide] = useState(null);
   
   useEffect(() => {
-    if (isActive && timeLeft > 0) {
-      timerRef.current = setInterval(() => {
-        setTimeLeft(t => t - 1);
-      }, 1000);
-    } else if (timeLeft === 0 && isActive) {
-      setIsActive(false);
-      setMusicPlaying(false);
-      setStep('post');
-    }
-    return () => clearInterval(timerRef.current);
-  }, [isActive, timeLeft]);
+    setGuide(null);
+    if (!selectedType) return;
+    let cancelled = false;
+    contentLibrary.guide(selectedType.id)
+      .then(loaded => {
+        if (!cancelled) setGuide(loaded);
+      })
+      .catch(error => console.error('Error:', error));
+    return () => {
+      cancelled = true;
+    };
+  }, [selectedType]);
   
   useEffect(() => {
-    if (step === 'active' && selectedType) {
-      const guide = MEDITATION_GUIDES[selectedType.id];
+    if (step === 'active' && guide) {
       const instructionInterval = setInterval(() => {
         setCurrentInstruction(prev => (prev + 1) % guide.instructions.length);
       }, 30000);
       
       return () => clearInterval(instructionInterval);
     }
-  }, [step, selectedType]);
+  }, [step, guide]);
   
   const startSession = () => {
-    setTimeLeft(duration * 60);
-    setIsActive(true);
     setMusicPlaying(true);
     setStep('active');
     setCurrentInstruction(0);
   };
   
+  const finishSession = () => {
+    setMusicPlaying(false);
+    setStep('post');
+  };
+  
   const completeSession = () => {
     const sessionData = {
       type: selectedType.id,
@@ -889,8 +2882,6 @@ function MeditationFlow({ setCurrentView, saveSession, saveJournal, currentTrack
     setCurrentView('home');
   };
   
-  const recommendation = getRecommendation(sessions, journals);
-  
   if (step === 'setup') {
     return (
       <div className="max-w-4xl mx-auto p-6">
@@ -1010,9 +3001,7 @@ function MeditationFlow({ setCurrentView, saveSession, saveJournal, currentTrack
   }
   
   if (step === 'active') {
-    const minutes = Math.floor(timeLeft / 60);
-    const seconds = timeLeft % 60;
-    const guide = MEDITATION_GUIDES[selectedType.id];
+    const activeGuide = guide || { title: selectedType.name, instructions: [selectedType.description], mantra: '' };
     
     return (
       <div className="min-h-screen flex flex-col items-center justify-center p-6 bg-gradient-to-br from-indigo-900 via-purple-900 to-blue-900">
@@ -1044,15 +3033,13 @@ function MeditationFlow({ setCurrentView, saveSession, saveJournal, currentTrack
         <div className="text-center max-w-3xl">
           <div className="mb-8">
             <div className="text-6xl mb-4">{selectedType.icon}</div>
-            <h2 className="text-3xl font-serif text-white mb-2">{guide.title}</h2>
+            <h2 className="text-3xl font-serif text-white mb-2">{activeGuide.title}</h2>
             <p className="text-white/70">{selectedType.description}</p>
           </div>
           
           <div className="mb-8">
             <div className="breathing-circle w-48 h-48 mx-auto rounded-full bg-white/10 backdrop-blur flex items-center justify-center">
-              <div className="text-6xl font-light text-white">
-                {minutes}:{seconds.toString().padStart(2, '0')}
-              </div>
+              <SessionTimer durationSeconds={duration * 60} onComplete={finishSession} />
             </div>
           </div>
           
@@ -1062,10 +3049,10 @@ function MeditationFlow({ setCurrentView, saveSession, saveJournal, currentTrack
             </div>
             <div className="instruction-text bg-white/5 backdrop-blur rounded-2xl p-6 mx-auto max-w-2xl">
               <p className="text-white/90 text-lg leading-relaxed">
-                {guide.instructions[currentInstruction]}
+                {activeGuide.instructions[currentInstruction]}
               </p>
               <div className="mt-4 flex gap-1 justify-center">
-                {guide.instructions.map((_, idx) => (
+                {activeGuide.instructions.map((_, idx) => (
                   <div
                     key={idx}
                     className={`h-1 w-8 rounded-full transition-all ${
@@ -1075,7 +3062,7 @@ function MeditationFlow({ setCurrentView, saveSession, saveJournal, currentTrack
                 ))}
               </div>
             </div>
-            <p className="text-white/60 italic mt-4 text-sm">{guide.mantra}</p>
+            <p className="text-white/60 italic mt-4 text-sm">{activeGuide.mantra}</p>
           </div>
           
           <div className="flex gap-4 justify-center mb-6">
@@ -1087,11 +3074,7 @@ function MeditationFlow({ setCurrentView, saveSession, saveJournal, currentTrack
             </button>
             
             <button
-              onClick={() => {
-                setIsActive(false);
-                setMusicPlaying(false);
-                setStep('post');
-              }}
+              onClick={finishSession}
               className="px-6 py-3 bg-white/10 backdrop-blur rounded-full text-white hover:bg-white/20 transition-all"
             >
               End Early
@@ -1201,9 +3184,80 @@ function MeditationFlow({ setCurrentView, saveSession, saveJournal, currentTrack
   return null;
 }
 
-function JournalView({ setCurrentView, journals, saveJournal }) {
+function SessionTimer({ durationSeconds, onComplete }) {
+  const [timeLeft, setTimeLeft] = useState(durationSeconds);
+  const onCompleteRef = useRef(onComplete);
+  onCompleteRef.current = onComplete;
+  
+  useEffect(() => {
+    const endsAt = performance.now() + durationSeconds * 1000;
+    let timer = null;
+    
+    const tick = () => {
+      const msLeft = endsAt - performance.now();
+      const remaining = Math.max(0, Math.ceil(msLeft / 1000));
+      setTimeLeft(remaining);
+      if (remaining === 0) {
+        onCompleteRef.current();
+        return;
+      }
+      timer = setTimeout(tick, msLeft - (remaining - 1) * 1000 + 5);
+    };
+    
+    timer = setTimeout(tick, 1000);
+    return () => clearTimeout(timer);
+  }, [durationSeconds]);
+  
+  const minutes = Math.floor(timeLeft / 60);
+  const seconds = timeLeft % 60;
+  
+  return (
+    <div className="text-6xl font-light text-white">
+      {minutes}:{seconds.toString().padStart(2, '0')}
+    </div>
+  );
+}
+
+function JournalView({ setCurrentView, journals, saveJournal, hasOlder, loadOlder }) {
   const [showNewEntry, setShowNewEntry] = useState(false);
   const [newEntry, setNewEntry] = useState({ reflection: '', mood: 3, tags: [] });
+  const [loadingOlder, setLoadingOlder] = useState(false);
+  const [search, setSearch] = useState({ query: '', tag: '', from: '', to: '' });
+  const [searchReady, setSearchReady] = useState(false);
+  const [results, setResults] = useState([]);
+  const textSearch = Boolean(search.query.trim());
+  const searching = Boolean(textSearch || search.tag || search.from || search.to);
+  const pending = results === null || (textSearch && !searchReady);
+  
+  useEffect(() => {
+    if (!textSearch || searchReady) return;
+    searchIndex.open().then(() => setSearchReady(true)).catch(error => console.error('Error:', error));
+  }, [textSearch, searchReady]);
+  
+  useEffect(() => {
+    if (!searching) return;
+    const from = search.from ? parseLocalDay(search.from) : null;
+    const to = search.to ? parseLocalDay(search.to) + 24 * 60 * 60 * 1000 : null;
+    if (!textSearch) {
+      let current = true;
+      setResults(null);
+      filterHistory({ tag: search.tag, from, to })
+        .then(docs => current && setResults(docs))
+        .catch(error => {
+          console.error('Error:', error);
+          if (current) setResults([]);
+        });
+      return () => { current = false; };
+    }
+    if (!searchReady) return;
+    setResults(searchIndex.search({ query: search.query, tags: search.tag ? [search.tag] : [], from, to }));
+  }, [search, searching, textSearch, searchReady, journals.length]);
+  
+  const handleLoadOlder = async () => {
+    setLoadingOlder(true);
+    await loadOlder();
+    setLoadingOlder(false);
+  };
   
   const handleSaveEntry = () => {
     if (newEntry.reflection.trim()) {
@@ -1278,90 +3332,206 @@ function JournalView({ setCurrentView, journals, saveJournal }) {
         </div>
       )}
       
-      <div className="space-y-4">
-        {journals.length === 0 ? (
-          <div className="text-center py-16">
-            <div className="text-6xl mb-4">📖</div>
-            <p className="text-xl text-slate-600">Your journal is empty</p>
-            <p className="text-slate-500">Start writing to track your journey</p>
-          </div>
-        ) : (
-          journals.slice().reverse().map((entry) => (
-            <div key={entry.id} className="bg-white rounded-2xl p-6 shadow-md hover:shadow-lg transition-shadow">
-              <div className="flex justify-between items-start mb-4">
-                <div>
-                  <div className="flex items-center gap-3 mb-2">
-                    <span className="text-3xl">{MOODS.find(m => m.value === entry.moodAfter)?.emoji || '😌'}</span>
-                    <div>
-                      <h3 className="text-lg font-semibold text-slate-800">{entry.type}</h3>
-                      <p className="text-sm text-slate-500">
-                        {new Date(entry.date).toLocaleDateString('en-US', { 
-                          weekday: 'long', 
-                          year: 'numeric', 
-                          month: 'long', 
-                          day: 'numeric' 
-                        })}
-                      </p>
-                    </div>
-                  </div>
+      <div className="flex gap-3 mb-6 flex-wrap">
+        <input
+          type="text"
+          value={search.query}
+          onChange={(e) => setSearch({...search, query: e.target.value})}
+          placeholder="Search reflections and prompts..."
+          className="flex-1 min-w-48 px-4 py-3 rounded-xl border-2 border-slate-200 focus:border-green-400 focus:outline-none"
+        />
+        <select
+          value={search.tag}
+          onChange={(e) => setSearch({...search, tag: e.target.value})}
+          className="px-4 py-3 bg-white rounded-xl border-2 border-slate-200"
+        >
+          <option value="">All practices</option>
+          {MEDITATION_TYPES.map(type => (
+            <option key={type.id} value={type.id}>{type.icon} {type.name}</option>
+          ))}
+        </select>
+        <input
+          type="date"
+          value={search.from}
+          onChange={(e) => setSearch({...search, from: e.target.value})}
+          className="px-4 py-3 rounded-xl border-2 border-slate-200"
+        />
+        <input
+          type="date"
+          value={search.to}
+          onChange={(e) => setSearch({...search, to: e.target.value})}
+          className="px-4 py-3 rounded-xl border-2 border-slate-200"
+        />
+      </div>
+      
+      {searching ? (
+        <div className="space-y-4">
+          {pending ? (
+            <p className="text-center text-slate-500 py-8">Preparing search...</p>
+          ) : results.length === 0 ? (
+            <p className="text-center text-slate-500 py-8">No matching entries</p>
+          ) : (
+            results.map(doc => (
+              <div key={doc.ref} className="bg-white rounded-2xl p-6 shadow-md">
+                <div className="flex justify-between items-start mb-2">
+                  <h3 className="text-lg font-semibold text-slate-800">{doc.label}</h3>
+                  <span className="px-3 py-1 bg-green-100 text-green-700 rounded-full text-sm">
+                    {doc.kind === 'journal' ? 'Journal' : 'Session'}
+                  </span>
                 </div>
-                {entry.moodBefore !== undefined && entry.moodAfter !== undefined && (
-                  <div className="text-right">
-                    <p className="text-sm text-slate-600">Mood Shift</p>
-                    <p className="text-lg font-semibold">
-                      {MOODS.find(m => m.value === entry.moodBefore)?.emoji} → {MOODS.find(m => m.value === entry.moodAfter)?.emoji}
-                    </p>
-                  </div>
-                )}
+                <p className="text-sm text-slate-500 mb-2">{JOURNAL_DATE_FORMAT.format(new Date(doc.time))}</p>
+                <p className="text-slate-700 leading-relaxed">{doc.snippet}</p>
               </div>
-              
-              <p className="text-slate-700 leading-relaxed">{entry.reflection}</p>
-              
-              {entry.tags && entry.tags.length > 0 && (
-                <div className="flex gap-2 mt-4">
-                  {entry.tags.map((tag, idx) => (
-                    <span key={idx} className="px-3 py-1 bg-purple-100 text-purple-700 rounded-full text-sm">
-                      {tag}
-                    </span>
-                  ))}
-                </div>
-              )}
+            ))
+          )}
+        </div>
+      ) : journals.length === 0 ? (
+        <div className="text-center py-16">
+          <div className="text-6xl mb-4">📖</div>
+          <p className="text-xl text-slate-600">Your journal is empty</p>
+          <p className="text-slate-500">Start writing to track your journey</p>
+        </div>
+      ) : (
+        <VirtualList
+          count={journals.length}
+          getKey={(index) => journals[journals.length - 1 - index].id}
+          renderItem={(index) => <JournalEntryCard entry={journals[journals.length - 1 - index]} />}
+          onEndReached={hasOlder && !loadingOlder ? handleLoadOlder : null}
+        />
+      )}
+      
+      {loadingOlder && (
+        <p className="text-center text-slate-500 mt-4">Loading older entries...</p>
+      )}
+    </div>
+  );
+}
+
+function JournalEntryCard({ entry }) {
+  return (
+    <div className="bg-white rounded-2xl p-6 shadow-md hover:shadow-lg transition-shadow">
+      <div className="flex justify-between items-start mb-4">
+        <div>
+          <div className="flex items-center gap-3 mb-2">
+            <span className="text-3xl">{MOOD_BY_VALUE[entry.moodAfter]?.emoji || '😌'}</span>
+            <div>
+              <h3 className="text-lg font-semibold text-slate-800">{entry.type}</h3>
+              <p className="text-sm text-slate-500">{formatJournalDate(entry)}</p>
             </div>
-          ))
+          </div>
+        </div>
+        {entry.moodBefore !== undefined && entry.moodAfter !== undefined && (
+          <div className="text-right">
+            <p className="text-sm text-slate-600">Mood Shift</p>
+            <p className="text-lg font-semibold">
+              {MOOD_BY_VALUE[entry.moodBefore]?.emoji} → {MOOD_BY_VALUE[entry.moodAfter]?.emoji}
+            </p>
+          </div>
         )}
       </div>
+      
+      <p className="text-slate-700 leading-relaxed">{entry.reflection}</p>
+      
+      {entry.tags && entry.tags.length > 0 && (
+        <div className="flex gap-2 mt-4">
+          {entry.tags.map((tag, idx) => (
+            <span key={idx} className="px-3 py-1 bg-purple-100 text-purple-700 rounded-full text-sm">
+              {tag}
+            </span>
+          ))}
+        </div>
+      )}
     </div>
   );
 }
 
-function ProgressView({ setCurrentView, sessions, journals }) {
-  const getTotalMinutes = () => sessions.reduce((sum, s) => sum + s.duration, 0);
+function VirtualList({ count, getKey, renderItem, onEndReached, estimatedHeight = 200, overscan = 3 }) {
+  const containerRef = useRef(null);
+  const nodes = useRef(new Map());
+  const heights = useRef(new Map());
+  const [scrollTop, setScrollTop] = useState(0);
+  const [viewportHeight, setViewportHeight] = useState(600);
+  const [, setMeasuredVersion] = useState(0);
   
-  const getStreak = () => {
-    if (sessions.length === 0) return 0;
-    let streak = 0;
-    const today = new Date();
-    today.setHours(0, 0, 0, 0);
-    
-    for (let i = 0; i < 30; i++) {
-      const checkDate = new Date(today);
-      checkDate.setDate(checkDate.getDate() - i);
-      const hasSession = sessions.some(s => {
-        const sessionDate = new Date(s.date);
-        sessionDate.setHours(0, 0, 0, 0);
-        return sessionDate.getTime() === checkDate.getTime();
-      });
-      
-      if (hasSession) {
-        streak++;
-      } else if (i > 0) {
-        break;
+  const offsets = new Float64Array(count + 1);
+  for (let i = 0; i < count; i++) {
+    offsets[i + 1] = offsets[i] + (heights.current.get(getKey(i)) || estimatedHeight);
+  }
+  
+  let low = 0;
+  let high = count;
+  while (low < high) {
+    const mid = (low + high + 1) >> 1;
+    if (offsets[mid] <= scrollTop) low = mid; else high = mid - 1;
+  }
+  const start = Math.max(0, low - overscan);
+  let end = low;
+  while (end < count && offsets[end] < scrollTop + viewportHeight) end++;
+  end = Math.min(count, end + overscan);
+  
+  useEffect(() => {
+    const updateViewport = () => setViewportHeight(containerRef.current.clientHeight);
+    updateViewport();
+    window.addEventListener('resize', updateViewport);
+    return () => window.removeEventListener('resize', updateViewport);
+  }, []);
+  
+  useLayoutEffect(() => {
+    let changed = false;
+    nodes.current.forEach((node, index) => {
+      const key = getKey(index);
+      if (heights.current.get(key) !== node.offsetHeight) {
+        heights.current.set(key, node.offsetHeight);
+        changed = true;
       }
-    }
-    return streak;
-  };
+    });
+    if (changed) setMeasuredVersion(version => version + 1);
+  });
+  
+  useEffect(() => {
+    if (end === count && onEndReached) onEndReached();
+  }, [end, count, onEndReached]);
+  
+  const items = [];
+  for (let i = start; i < end; i++) {
+    items.push(
+      <div
+        key={getKey(i)}
+        ref={node => node ? nodes.current.set(i, node) : nodes.current.delete(i)}
+        className="pb-4"
+      >
+        {renderItem(i)}
+      </div>
+    );
+  }
+  
+  return (
+    <div
+      ref={containerRef}
+      onScroll={(e) => setScrollTop(e.currentTarget.scrollTop)}
+      className="overflow-y-auto"
+      style={{ height: '70vh' }}
+    >
+      <div style={{ height: offsets[start] }} />
+      {items}
+      <div style={{ height: offsets[count] - offsets[end] }} />
+    </div>
+  );
+}
+
+function ProgressView({ setCurrentView, sessions, journals, stats, days, analytics, onImported }) {
+  const getTotalMinutes = () => stats.totalMinutes;
+  
+  const getStreak = () => analytics ? analytics.streak : dayIndex.streak();
   
   const getMoodTrend = () => {
+    if (analytics) {
+      return Array.from({ length: analytics.moodTrend.length / 2 }, (_, idx) => ({
+        session: idx + 1,
+        before: analytics.moodTrend[idx * 2],
+        after: analytics.moodTrend[idx * 2 + 1]
+      }));
+    }
     return sessions.slice(-10).map((s, idx) => ({
       session: idx + 1,
       before: s.moodBefore,
@@ -1369,46 +3539,41 @@ function ProgressView({ setCurrentView, sessions, journals }) {
     }));
   };
   
+  const getSentimentTrend = () => {
+    return Array.from(analytics.sentiment, (tone, idx) => ({ entry: idx + 1, tone }));
+  };
+  
   const getTypeDistribution = () => {
-    const counts = {};
-    sessions.forEach(s => {
-      counts[s.type] = (counts[s.type] || 0) + 1;
-    });
-    return Object.entries(counts).map(([type, count]) => ({
-      type: MEDITATION_TYPES.find(t => t.id === type)?.name || type,
-      count
+    if (analytics) {
+      return MEDITATION_TYPES
+        .map((type, code) => ({ type: type.name, count: analytics.typeCounts[code] }))
+        .filter(({ count }) => count > 0);
+    }
+    return Object.entries(stats.types).map(([type, data]) => ({
+      type: MEDITATION_TYPE_BY_ID[type]?.name || type,
+      count: data.count
     }));
   };
   
   const getAverageMoodImprovement = () => {
-    if (sessions.length === 0) return 0;
-    const improvements = sessions.map(s => s.moodAfter - s.moodBefore);
-    return (improvements.reduce((a, b) => a + b, 0) / improvements.length).toFixed(2);
+    if (stats.count === 0) return 0;
+    return (stats.totalImprovement / stats.count).toFixed(2);
   };
   
   const getMostEffectiveType = () => {
-    const typeImprovements = {};
-    sessions.forEach(s => {
-      const improvement = s.moodAfter - s.moodBefore;
-      if (!typeImprovements[s.type]) {
-        typeImprovements[s.type] = { total: 0, count: 0 };
-      }
-      typeImprovements[s.type].total += improvement;
-      typeImprovements[s.type].count += 1;
-    });
-    
+    if (analytics && analytics.mostEffectiveType) return MEDITATION_TYPE_BY_ID[analytics.mostEffectiveType].name;
     let bestType = null;
     let bestAvg = -Infinity;
     
-    Object.entries(typeImprovements).forEach(([type, data]) => {
-      const avg = data.total / data.count;
+    Object.entries(stats.types).forEach(([type, data]) => {
+      const avg = data.improvement / data.count;
       if (avg > bestAvg) {
         bestAvg = avg;
         bestType = type;
       }
     });
     
-    return MEDITATION_TYPES.find(t => t.id === bestType)?.name || bestType;
+    return MEDITATION_TYPE_BY_ID[bestType]?.name || bestType;
   };
   
   return (
@@ -1419,7 +3584,7 @@ function ProgressView({ setCurrentView, sessions, journals }) {
       
       <h2 className="text-4xl font-serif text-slate-800 mb-8">My Progress</h2>
       
-      {sessions.length === 0 ? (
+      {stats.count === 0 ? (
         <div className="text-center py-16">
           <div className="text-6xl mb-4">📊</div>
           <p className="text-xl text-slate-600">No data yet</p>
@@ -1445,7 +3610,7 @@ function ProgressView({ setCurrentView, sessions, journals }) {
             <StatCard
               icon={<Award className="text-purple-500" size={32} />}
               title="Sessions"
-              value={sessions.length}
+              value={stats.count}
               suffix=""
               color="bg-purple-50"
             />
@@ -1461,7 +3626,7 @@ function ProgressView({ setCurrentView, sessions, journals }) {
           <div className="grid md:grid-cols-2 gap-6 mb-8">
             <div className="bg-white rounded-3xl p-6 shadow-lg">
               <h3 className="text-xl font-semibold text-slate-800 mb-6">Mood Transformation</h3>
-              <ResponsiveContainer width="100%" height={300}>
+              <LazyChart height={300} render={({ LineChart, Line, CartesianGrid, XAxis, YAxis, Tooltip, Legend }) => (
                 <LineChart data={getMoodTrend()}>
                   <CartesianGrid strokeDasharray="3 3" />
                   <XAxis dataKey="session" />
@@ -1471,12 +3636,12 @@ function ProgressView({ setCurrentView, sessions, journals }) {
                   <Line type="monotone" dataKey="before" stroke="#8b5cf6" name="Before" strokeWidth={2} />
                   <Line type="monotone" dataKey="after" stroke="#10b981" name="After" strokeWidth={2} />
                 </LineChart>
-              </ResponsiveContainer>
+              )} />
             </div>
             
             <div className="bg-white rounded-3xl p-6 shadow-lg">
               <h3 className="text-xl font-semibold text-slate-800 mb-6">Practice Types</h3>
-              <ResponsiveContainer width="100%" height={300}>
+              <LazyChart height={300} render={({ BarChart, Bar, CartesianGrid, XAxis, YAxis, Tooltip }) => (
                 <BarChart data={getTypeDistribution()}>
                   <CartesianGrid strokeDasharray="3 3" />
                   <XAxis dataKey="type" angle={-45} textAnchor="end" height={100} />
@@ -1484,8 +3649,33 @@ function ProgressView({ setCurrentView, sessions, journals }) {
                   <Tooltip />
                   <Bar dataKey="count" fill="#8b5cf6" />
                 </BarChart>
-              </ResponsiveContainer>
+              )} />
+            </div>
+          </div>
+          
+          {analytics && analytics.sentiment.length > 0 && (
+            <div className="bg-white rounded-3xl p-6 shadow-lg mb-8">
+              <div className="flex justify-between items-center mb-6">
+                <h3 className="text-xl font-semibold text-slate-800">Reflection Tone</h3>
+                <span className="text-3xl" title={analytics.sentimentAverage.toFixed(2)}>
+                  {MOOD_BY_VALUE[Math.round(analytics.sentimentAverage)]?.emoji}
+                </span>
+              </div>
+              <LazyChart height={200} render={({ LineChart, Line, CartesianGrid, XAxis, YAxis, Tooltip }) => (
+                <LineChart data={getSentimentTrend()}>
+                  <CartesianGrid strokeDasharray="3 3" />
+                  <XAxis dataKey="entry" />
+                  <YAxis domain={[1, 5]} />
+                  <Tooltip />
+                  <Line type="monotone" dataKey="tone" stroke="#14b8a6" name="Tone" strokeWidth={2} />
+                </LineChart>
+              )} />
             </div>
+          )}
+          
+          <div className="bg-white rounded-3xl p-6 shadow-lg mb-8">
+            <h3 className="text-xl font-semibold text-slate-800 mb-6">Practice Calendar</h3>
+            <CalendarHeatmap days={days.days} />
           </div>
           
           <div className="bg-gradient-to-r from-purple-100 to-pink-100 rounded-3xl p-8">
@@ -1497,6 +3687,95 @@ function ProgressView({ setCurrentView, sessions, journals }) {
           </div>
         </>
       )}
+      
+      <HistoryTransfer onImported={onImported} />
+    </div>
+  );
+}
+
+function LazyChart({ height, render }) {
+  const [charts, setCharts] = useState(chartsModule);
+  
+  useEffect(() => {
+    if (!charts) {
+      loadCharts().then(setCharts).catch(error => console.error('Error:', error));
+    }
+  }, []);
+  
+  if (!charts) {
+    return <div className="bg-slate-50 rounded-2xl animate-pulse" style={{ height }} />;
+  }
+  
+  const { ResponsiveContainer } = charts;
+  return (
+    <ResponsiveContainer width="100%" height={height}>
+      {render(charts)}
+    </ResponsiveContainer>
+  );
+}
+
+function HistoryTransfer({ onImported }) {
+  const [status, setStatus] = useState('');
+  const [busy, setBusy] = useState(false);
+  
+  const runExport = async (format) => {
+    setBusy(true);
+    try {
+      await saveExport(format, ({ exported, total }) => setStatus(`Exported ${exported} of ${total} records`));
+      setStatus('Export complete');
+    } catch (error) {
+      console.error('Error:', error);
+      setStatus('Export cancelled');
+    }
+    setBusy(false);
+  };
+  
+  const runImport = async (file) => {
+    if (!file) return;
+    setBusy(true);
+    try {
+      const result = await importHistory(file.stream(), ({ lines, imported }) => setStatus(`Imported ${imported} of ${lines} records`));
+      setStatus(`Imported ${result.imported} records (${result.duplicates} already present, ${result.invalid} invalid)`);
+      await onImported();
+    } catch (error) {
+      console.error('Error:', error);
+      setStatus('Import failed');
+    }
+    setBusy(false);
+  };
+  
+  return (
+    <div className="bg-white rounded-3xl p-6 shadow-lg mt-8">
+      <h3 className="text-xl font-semibold text-slate-800 mb-4">Your Data</h3>
+      <div className="flex flex-wrap gap-3 items-center">
+        <button
+          disabled={busy}
+          onClick={() => runExport('ndjson')}
+          className="px-4 py-2 rounded-xl bg-purple-100 text-purple-700 hover:bg-purple-200 disabled:opacity-50"
+        >
+          Export NDJSON
+        </button>
+        <button
+          disabled={busy}
+          onClick={() => runExport('csv')}
+          className="px-4 py-2 rounded-xl bg-purple-100 text-purple-700 hover:bg-purple-200 disabled:opacity-50"
+        >
+          Export CSV
+        </button>
+        <label className={`px-4 py-2 rounded-xl bg-green-100 text-green-700 hover:bg-green-200 cursor-pointer ${busy ? 'opacity-50 pointer-events-none' : ''}`}>
+          Import NDJSON
+          <input
+            type="file"
+            accept=".ndjson,.jsonl,application/x-ndjson"
+            className="hidden"
+            onChange={(e) => {
+              runImport(e.target.files[0]);
+              e.target.value = '';
+            }}
+          />
+        </label>
+      </div>
+      {status && <p className="text-slate-600 mt-4">{status}</p>}
     </div>
   );
 }
@@ -1513,10 +3792,64 @@ function StatCard({ icon, title, value, suffix, color }) {
   );
 }
 
-function DiscoverView({ setCurrentView, bookmarkedContent, toggleBookmark }) {
+function CalendarHeatmap({ days, weeks = 12 }) {
+  const today = new Date();
+  const start = new Date(today.getFullYear(), today.getMonth(), today.getDate() - (weeks - 1) * 7 - today.getDay());
+  const cells = [];
+  for (let day = new Date(start); day <= today; day.setDate(day.getDate() + 1)) {
+    const key = localDayKey(day);
+    cells.push({ key, count: days[key] || 0 });
+  }
+  
+  const shade = (count) => {
+    if (count === 0) return 'bg-slate-100';
+    if (count === 1) return 'bg-green-200';
+    if (count === 2) return 'bg-green-400';
+    return 'bg-green-600';
+  };
+  
+  return (
+    <div className="grid grid-rows-7 grid-flow-col gap-1 w-max mx-auto">
+      {cells.map(cell => (
+        <div
+          key={cell.key}
+          className={`h-4 w-4 rounded-sm ${shade(cell.count)}`}
+          title={`${cell.key}: ${cell.count} session${cell.count === 1 ? '' : 's'}`}
+        />
+      ))}
+    </div>
+  );
+}
+
+function DiscoverView({ setCurrentView, bookmarkedIds, toggleBookmark }) {
   const [selectedContent, setSelectedContent] = useState(null);
+  const [articles, setArticles] = useState([]);
+  const [articleBody, setArticleBody] = useState(null);
+  
+  useEffect(() => {
+    contentLibrary.articles().then(setArticles).catch(error => console.error('Error:', error));
+  }, []);
+  
+  const articlesById = useMemo(() => new Map(articles.map(article => [article.id, article])), [articles]);
+  const bookmarkedContent = [...bookmarkedIds].map(id => articlesById.get(id)).filter(Boolean);
+  
+  useEffect(() => {
+    setArticleBody(null);
+    if (!selectedContent) return;
+    let cancelled = false;
+    contentLibrary.article(selectedContent.id)
+      .then(article => {
+        if (!cancelled && article) setArticleBody(article.fullContent);
+      })
+      .catch(error => console.error('Error:', error));
+    return () => {
+      cancelled = true;
+    };
+  }, [selectedContent]);
   
   if (selectedContent) {
+    const isBookmarked = bookmarkedIds.has(selectedContent.id);
+    
     return (
       <div className="max-w-4xl mx-auto p-6">
         <button 
@@ -1536,23 +3869,23 @@ function DiscoverView({ setCurrentView, bookmarkedContent, toggleBookmark }) {
           <h2 className="text-4xl font-serif text-slate-800 mb-6 text-center">{selectedContent.title}</h2>
           <div className="prose prose-lg max-w-none">
             <p className="text-slate-700 leading-relaxed whitespace-pre-line">
-              {selectedContent.fullContent}
+              {articleBody || 'Loading…'}
             </p>
           </div>
           <div className="mt-8 pt-6 border-t border-slate-200">
             <button
-              onClick={() => toggleBookmark(selectedContent)}
+              onClick={() => toggleBookmark(selectedContent.id)}
               className={`w-full py-4 rounded-2xl font-semibold transition-all flex items-center justify-center gap-2 ${
-                bookmarkedContent.some(b => b.title === selectedContent.title)
+                isBookmarked
                   ? 'bg-pink-100 text-pink-700 hover:bg-pink-200'
                   : 'bg-slate-100 text-slate-700 hover:bg-slate-200'
               }`}
             >
               <Star 
                 size={20} 
-                fill={bookmarkedContent.some(b => b.title === selectedContent.title) ? 'currentColor' : 'none'} 
+                fill={isBookmarked ? 'currentColor' : 'none'} 
               />
-              {bookmarkedContent.some(b => b.title === selectedContent.title) ? 'Bookmarked' : 'Bookmark This'}
+              {isBookmarked ? 'Bookmarked' : 'Bookmark This'}
             </button>
           </div>
         </div>
@@ -1569,14 +3902,14 @@ function DiscoverView({ setCurrentView, bookmarkedContent, toggleBookmark }) {
       <h2 className="text-4xl font-serif text-slate-800 mb-8">Discover & Learn</h2>
       
       <div className="grid md:grid-cols-2 gap-6">
-        {LEARN_CONTENT.map((content, idx) => {
-          const isBookmarked = bookmarkedContent.some(b => b.title === content.title);
+        {articles.map(content => {
+          const isBookmarked = bookmarkedIds.has(content.id);
           return (
-            <div key={idx} className="bg-white rounded-3xl p-8 shadow-lg hover:shadow-xl transition-shadow">
+            <div key={content.id} className="bg-white rounded-3xl p-8 shadow-lg hover:shadow-xl transition-shadow">
               <div className="flex justify-between items-start mb-4">
                 <div className="text-5xl mb-4">{content.icon}</div>
                 <button
-                  onClick={() => toggleBookmark(content)}
+                  onClick={() => toggleBookmark(content.id)}
                   className={`p-2 rounded-full transition-all ${
                     isBookmarked ? 'bg-pink-100 text-pink-600' : 'bg-slate-100 text-slate-400 hover:bg-pink-50'
                   }`}
@@ -1609,9 +3942,9 @@ function DiscoverView({ setCurrentView, bookmarkedContent, toggleBookmark }) {
         <div className="mt-12">
           <h3 className="text-2xl font-serif text-slate-800 mb-6">Your Bookmarks</h3>
           <div className="grid md:grid-cols-3 gap-4">
-            {bookmarkedContent.map((content, idx) => (
+            {bookmarkedContent.map(content => (
               <button
-                key={idx}
+                key={content.id}
                 onClick={() => setSelectedContent(content)}
                 className="bg-gradient-to-br from-pink-50 to-purple-50 rounded-2xl p-4 hover:shadow-lg transition-shadow text-left"
               >
@@ -0,0 +1,110 @@
+const SHELL_CACHE = 'sukoon-shell-v5';
+const SHELL_ASSETS = ['./', './index.html', './amity-logo.jpg'];
+const MODULE_DESTINATIONS = ['script', 'style', 'font'];
+
+const shellUrls = new Set(SHELL_ASSETS.map(asset => new URL(asset, self.registration.scope).href));
+
+const isCacheable = (request) => {
+  const url = new URL(request.url);
+  if (request.mode === 'navigate' || shellUrls.has(`${url.origin}${url.pathname}`)) return true;
+  return url.origin !== self.location.origin && MODULE_DESTINATIONS.includes(request.destination);
+};
+
+self.addEventListener('install', (event) => {
+  event.waitUntil(
+    caches.open(SHELL_CACHE)
+      .then(cache => cache.addAll(SHELL_ASSETS))
+      .then(() => self.skipWaiting())
+  );
+});
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil(
+    caches.keys()
+      .then(keys => Promise.all(
+        keys
+          .filter(key => key.startsWith('sukoon-shell-') && key !== SHELL_CACHE)
+          .map(key => caches.delete(key))
+      ))
+      .then(() => self.clients.claim())
+  );
+});
+
+const downloads = new Map();
+
+const downloadStream = (port) => new ReadableStream({
+  pull(controller) {
+    return new Promise((resolve) => {
+      port.onmessage = ({ data }) => {
+        if (data.error) {
+          controller.error(new Error(data.error));
+        } else if (data.done) {
+          controller.close();
+          port.close();
+        } else {
+          controller.enqueue(data.value);
+        }
+        resolve();
+      };
+      port.postMessage('pull');
+    });
+  },
+  cancel() {
+    port.postMessage('cancel');
+    port.close();
+  }
+});
+
+self.addEventListener('message', (event) => {
+  const { data, ports } = event;
+  if (!data || data.type !== 'sukoon-export' || ports.length === 0) return;
+  downloads.set(data.url, { name: data.name, stream: downloadStream(ports[0]) });
+  ports[0].postMessage('ready');
+});
+
+const revalidate = async (cache, request) => {
+  try {
+    const response = await fetch(request);
+    if (response.ok) {
+      await cache.put(request.mode === 'navigate' ? request.url.split('?')[0] : request, response.clone());
+    }
+    return response;
+  } catch (error) {
+    return null;
+  }
+};
+
+self.addEventListener('fetch', (event) => {
+  const { request } = event;
+  const download = downloads.get(request.url);
+  if (download) {
+    downloads.delete(request.url);
+    event.respondWith(new Response(download.stream, {
+      headers: {
+        'Content-Type': 'application/octet-stream',
+        'Content-Disposition': `attachment; filename="${download.name}"`
+      }
+    }));
+    return;
+  }
+  if (request.method !== 'GET' || !request.url.startsWith('http') || !isCacheable(request)) return;
+
+  event.respondWith((async () => {
+    const cache = await caches.open(SHELL_CACHE);
+    const cached = await cache.match(request, { ignoreSearch: request.mode === 'navigate' });
+    const network = revalidate(cache, request);
+
+    if (cached) {
+      event.waitUntil(network);
+      return cached;
+    }
+
+    const response = await network;
+    if (response) return response;
+    if (request.mode === 'navigate') {
+      const shell = await cache.match('./index.html');
+      if (shell) return shell;
+    }
+    return Response.error();
+  })());
+});
@@ -0,0 +1,418 @@
+"""Multi-user sync service for Sukoon sessions, journals and bookmarks.
+
+Clients POST to ``/users/<user>/sync`` with the records they created since
+their last sync and the cursor they last saw::
+
+    {
+        "cursor": {"sessions": 0, "journals": 0, "bookmarks": 0},
+        "sessions": [...],
+        "journals": [...],
+        "bookmarks": [...]
+    }
+
+and receive every record stored after that cursor together with the new
+cursor. Records use the same shape the app's ``saveSession``,
+``saveJournal`` and ``toggleBookmark`` produce. Session and journal ids are
+client timestamps and are only unique per user, so the cursor is a server
+sequence number rather than the record id.
+
+Writes from concurrent clients are queued and committed in batched
+transactions by a single writer; reads run on a small pool of WAL readers.
+Only the standard library is used::
+
+    python sync_server.py --db sukoon.db --port 8765
+"""
+
+import argparse
+import asyncio
+import json
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    user TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    type TEXT NOT NULL,
+    duration INTEGER NOT NULL,
+    mood_before INTEGER NOT NULL,
+    mood_after INTEGER NOT NULL,
+    pre_prompts TEXT NOT NULL,
+    post_prompts TEXT NOT NULL,
+    UNIQUE (user, id)
+);
+CREATE TABLE IF NOT EXISTS journals (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    user TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    type TEXT NOT NULL,
+    mood_before INTEGER,
+    mood_after INTEGER,
+    mood INTEGER,
+    reflection TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    UNIQUE (user, id)
+);
+CREATE TABLE IF NOT EXISTS bookmarks (
+    user TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    items TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_user_seq ON sessions (user, seq);
+CREATE INDEX IF NOT EXISTS journals_user_seq ON journals (user, seq);
+"""
+
+PAGE_SIZE = 500
+BATCH_SIZE = 1000
+BATCH_WINDOW = 0.01
+MAX_BODY = 4 * 1024 * 1024
+INT64_RANGE = range(-2**63, 2**63)
+CURSOR_TABLES = ('sessions', 'journals', 'bookmarks')
+
+
+class InvalidRecord(ValueError):
+    """Raised when a pushed record does not match the app's schema."""
+
+
+def _require(record, field, kind, optional=False):
+    if not isinstance(record, dict):
+        raise InvalidRecord('records must be objects')
+    value = record.get(field)
+    if value is None and optional:
+        return None
+    if not isinstance(value, kind) or isinstance(value, bool):
+        raise InvalidRecord(f'{field} must be {kind.__name__}')
+    if kind is int and value not in INT64_RANGE:
+        raise InvalidRecord(f'{field} must fit in 64 bits')
+    return value
+
+
+def _require_list(value, field, item_kind):
+    if value is None:
+        return None
+    if not isinstance(value, list) or not all(isinstance(item, item_kind) for item in value):
+        raise InvalidRecord(f'{field} must be a list of {item_kind.__name__}')
+    return value
+
+
+def session_row(user, record):
+    return (
+        user,
+        _require(record, 'id', int),
+        _require(record, 'date', str),
+        _require(record, 'type', str),
+        _require(record, 'duration', int),
+        _require(record, 'moodBefore', int),
+        _require(record, 'moodAfter', int),
+        json.dumps(_require(record, 'prePrompts', dict, optional=True) or {}),
+        json.dumps(_require(record, 'postPrompts', dict, optional=True) or {}),
+    )
+
+
+def journal_row(user, record):
+    return (
+        user,
+        _require(record, 'id', int),
+        _require(record, 'date', str),
+        _require(record, 'type', str),
+        _require(record, 'moodBefore', int, optional=True),
+        _require(record, 'moodAfter', int, optional=True),
+        _require(record, 'mood', int, optional=True),
+        _require(record, 'reflection', str, optional=True) or '',
+        json.dumps(_require_list(record.get('tags'), 'tags', str) or []),
+    )
+
+
+def parse_push(payload):
+    """Validate a sync request body and return ``(cursor, sessions, journals, bookmarks)``."""
+    if not isinstance(payload, dict):
+        raise InvalidRecord('body must be an object')
+    cursor = payload.get('cursor') or {}
+    if not isinstance(cursor, dict):
+        raise InvalidRecord('cursor must be an object')
+    cursor = {table: _require(cursor, table, int, optional=True) or 0 for table in CURSOR_TABLES}
+    sessions = _require_list(payload.get('sessions'), 'sessions', dict) or []
+    journals = _require_list(payload.get('journals'), 'journals', dict) or []
+    bookmarks = _require_list(payload.get('bookmarks'), 'bookmarks', str)
+    for record in sessions:
+        session_row(None, record)
+    for record in journals:
+        journal_row(None, record)
+    return cursor, sessions, journals, bookmarks
+
+
+def session_record(row):
+    seq, id_, date, type_, duration, before, after, pre, post = row
+    return seq, {
+        'id': id_,
+        'date': date,
+        'type': type_,
+        'duration': duration,
+        'moodBefore': before,
+        'moodAfter': after,
+        'prePrompts': json.loads(pre),
+        'postPrompts': json.loads(post),
+    }
+
+
+def journal_record(row):
+    seq, id_, date, type_, before, after, mood, reflection, tags = row
+    record = {'id': id_, 'date': date, 'type': type_, 'reflection': reflection, 'tags': json.loads(tags)}
+    for key, value in (('moodBefore', before), ('moodAfter', after), ('mood', mood)):
+        if value is not None:
+            record[key] = value
+    return seq, record
+
+
+class SyncStore:
+    """SQLite storage with one writer connection and per-thread readers."""
+
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+        self.writer = self.connect()
+        self.writer.executescript(SCHEMA)
+        self.writer.execute("INSERT OR IGNORE INTO counters VALUES ('bookmarks', 0)")
+        self.writer.commit()
+
+    def connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    def reader(self):
+        if self.path == ':memory:':
+            return self.writer
+        if not hasattr(self.local, 'connection'):
+            self.local.connection = self.connect()
+        return self.local.connection
+
+    def write_batch(self, pushes):
+        """Commit a list of ``(user, sessions, journals, bookmarks)`` in one transaction."""
+        sessions = []
+        journals = []
+        bookmarks = []
+        for user, user_sessions, user_journals, user_bookmarks in pushes:
+            sessions.extend(session_row(user, record) for record in user_sessions)
+            journals.extend(journal_row(user, record) for record in user_journals)
+            if user_bookmarks is not None:
+                bookmarks.append((user, json.dumps(user_bookmarks)))
+        with self.writer:
+            self.writer.executemany(
+                'INSERT INTO sessions (user, id, date, type, duration, mood_before, mood_after, '
+                'pre_prompts, post_prompts) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (user, id) DO NOTHING',
+                sessions,
+            )
+            self.writer.executemany(
+                'INSERT INTO journals (user, id, date, type, mood_before, mood_after, mood, '
+                'reflection, tags) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (user, id) DO NOTHING',
+                journals,
+            )
+            for user, items in bookmarks:
+                self.writer.execute("UPDATE counters SET value = value + 1 WHERE name = 'bookmarks'")
+                seq = self.writer.execute("SELECT value FROM counters WHERE name = 'bookmarks'").fetchone()[0]
+                self.writer.execute(
+                    'INSERT INTO bookmarks VALUES (?, ?, ?) '
+                    'ON CONFLICT (user) DO UPDATE SET seq = excluded.seq, items = excluded.items',
+                    (user, seq, items),
+                )
+
+    def changes(self, user, cursor):
+        """Return records stored for ``user`` after ``cursor`` and the advanced cursor."""
+        connection = self.reader()
+        result = {'cursor': dict(cursor), 'more': False}
+        for table, columns, decode in (
+            ('sessions', 'id, date, type, duration, mood_before, mood_after, pre_prompts, post_prompts',
+             session_record),
+            ('journals', 'id, date, type, mood_before, mood_after, mood, reflection, tags', journal_record),
+        ):
+            rows = connection.execute(
+                f'SELECT seq, {columns} FROM {table} WHERE user = ? AND seq > ? ORDER BY seq LIMIT ?',
+                (user, cursor.get(table, 0), PAGE_SIZE + 1),
+            ).fetchall()
+            if len(rows) > PAGE_SIZE:
+                rows = rows[:PAGE_SIZE]
+                result['more'] = True
+            records = [decode(row) for row in rows]
+            result[table] = [record for _, record in records]
+            if records:
+                result['cursor'][table] = records[-1][0]
+        row = connection.execute(
+            'SELECT seq, items FROM bookmarks WHERE user = ? AND seq > ?',
+            (user, cursor.get('bookmarks', 0)),
+        ).fetchone()
+        if row:
+            result['cursor']['bookmarks'] = row[0]
+            result['bookmarks'] = json.loads(row[1])
+        return result
+
+    def close(self):
+        self.writer.close()
+
+
+class SyncService:
+    """Batches concurrent pushes into shared transactions."""
+
+    def __init__(self, store, batch_size=BATCH_SIZE, batch_window=BATCH_WINDOW, readers=4):
+        self.store = store
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.queue = asyncio.Queue()
+        self.write_executor = ThreadPoolExecutor(max_workers=1)
+        self.read_executor = ThreadPoolExecutor(max_workers=readers)
+        self.writer_task = None
+
+    def start(self):
+        self.writer_task = asyncio.create_task(self.write_loop())
+
+    async def stop(self):
+        await self.queue.join()
+        if self.writer_task:
+            self.writer_task.cancel()
+        self.write_executor.shutdown()
+        self.read_executor.shutdown()
+
+    async def write_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await loop.run_in_executor(self.write_executor, self.store.write_batch, [push for push, _ in batch])
+                for _, future in batch:
+                    future.set_result(None)
+            except Exception:
+                await self.write_individually(loop, batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def write_individually(self, loop, batch):
+        for push, future in batch:
+            try:
+                await loop.run_in_executor(self.write_executor, self.store.write_batch, [push])
+                future.set_result(None)
+            except Exception as error:
+                future.set_exception(error)
+
+    async def sync(self, user, payload):
+        cursor, sessions, journals, bookmarks = parse_push(payload)
+        if sessions or journals or bookmarks is not None:
+            future = asyncio.get_running_loop().create_future()
+            await self.queue.put(((user, sessions, journals, bookmarks), future))
+            await future
+        return await asyncio.get_running_loop().run_in_executor(
+            self.read_executor, self.store.changes, user, cursor
+        )
+
+
+STATUS_TEXT = {
+    200: 'OK',
+    204: 'No Content',
+    400: 'Bad Request',
+    404: 'Not Found',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+}
+
+
+async def respond(writer, status, body=None):
+    payload = b'' if body is None else json.dumps(body).encode()
+    headers = [
+        f'HTTP/1.1 {status} {STATUS_TEXT.get(status, "Error")}',
+        'Access-Control-Allow-Origin: *',
+        'Access-Control-Allow-Methods: GET, POST, OPTIONS',
+        'Access-Control-Allow-Headers: Content-Type',
+        'Content-Type: application/json',
+        f'Content-Length: {len(payload)}',
+    ]
+    writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode() + payload)
+    await writer.drain()
+
+
+async def handle_connection(service, reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            method, path, _ = request_line.decode('latin-1').split(' ', 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get('content-length', 0))
+            if length > MAX_BODY:
+                await respond(writer, 413, {'error': 'payload too large'})
+                break
+            body = await reader.readexactly(length) if length else b''
+
+            parts = [unquote(part) for part in path.split('?')[0].strip('/').split('/')]
+            if method == 'OPTIONS':
+                await respond(writer, 204)
+            elif method == 'GET' and parts == ['health']:
+                await respond(writer, 200, {'status': 'ok'})
+            elif method == 'POST' and len(parts) == 3 and parts[0] == 'users' and parts[2] == 'sync':
+                try:
+                    payload = json.loads(body or b'{}')
+                    await respond(writer, 200, await service.sync(parts[1], payload))
+                except ValueError as error:
+                    await respond(writer, 400, {'error': str(error)})
+                except sqlite3.Error as error:
+                    await respond(writer, 500, {'error': f'storage error: {error}'})
+            else:
+                await respond(writer, 404, {'error': 'not found'})
+
+            if headers.get('connection', '').lower() == 'close':
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(db_path, host, port):
+    store = SyncStore(db_path)
+    service = SyncService(store)
+    service.start()
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(service, reader, writer), host, port, backlog=4096
+    )
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', default='sukoon.db')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    asyncio.run(serve(args.db, args.host, args.port))
+
+
+if __name__ == '__main__':
+    main()
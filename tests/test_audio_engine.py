@@ -0,0 +1,95 @@
+"""Checks of ``AmbientSoundEngine`` in ``index.html`` against a mock Web Audio graph.
+
+The engine is sliced out of the page with ``benchmarks/page.mjs`` and driven
+under Node with the contexts from ``benchmarks/webaudio.mjs``, so these tests
+are skipped where Node is not installed.
+"""
+
+import json
+import math
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+BENCHMARKS = Path(__file__).resolve().parent.parent / 'benchmarks'
+
+PRELUDE = f"""
+import {{ loadPage }} from '{(BENCHMARKS / 'page.mjs').as_uri()}';
+import {{ audioGlobals }} from '{(BENCHMARKS / 'webaudio.mjs').as_uri()}';
+const timers = [];
+const globals = {{ ...audioGlobals(), setTimeout: (callback) => timers.push(callback), clearTimeout: () => {{}} }};
+const {{ AmbientSoundEngine }} = loadPage(['AmbientSoundEngine'], {{ globals }});
+const engine = new AmbientSoundEngine();
+const runTimers = () => timers.splice(0).forEach(callback => callback());
+const curves = (voice) => voice.gain.gain.events.filter(event => event.type === 'curve').map(event => Array.from(event.args[0]));
+const print = (value) => process.stdout.write(JSON.stringify(value));
+"""
+
+pytestmark = pytest.mark.skipif(shutil.which('node') is None, reason='node is not installed')
+
+
+def run(script):
+    result = subprocess.run(
+        ['node', '--input-type=module', '-e', PRELUDE + script],
+        capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def test_voice_played_before_prepare_switches_to_rendered_loop():
+    report = run("""
+const prepared = engine.prepare();
+engine.play(2);
+engine.play(1);
+const live = { ocean: engine.voices.ocean, rain: engine.voices.rain };
+await prepared;
+const swapped = { ocean: engine.voices.ocean.live, rain: engine.voices.rain.live, active: engine.activeVoice === engine.voices.ocean };
+const beforeRelease = live.ocean.sources.some(source => source.stopped);
+runTimers();
+engine.play(2);
+print({
+  live: [live.ocean.live, live.rain.live],
+  swapped,
+  beforeRelease,
+  released: Object.values(live).map(voice => voice.sources.every(source => source.stopped) && voice.gain.outputs.size === 0),
+  sources: engine.voices.ocean.sources.map(source => [source.kind, source.loop]),
+  fadedOut: curves(live.ocean).at(-1).at(-1),
+  fadedIn: curves(engine.voices.ocean)[0].at(-1),
+});
+""")
+    assert report['live'] == [True, True]
+    assert report['swapped'] == {'ocean': False, 'rain': False, 'active': True}
+    assert report['beforeRelease'] is False
+    assert report['released'] == [True, True]
+    assert report['sources'] == [['buffer-source', True]]
+    assert report['fadedOut'] == pytest.approx(0, abs=1e-6)
+    assert report['fadedIn'] == pytest.approx(1, abs=1e-6)
+
+
+def test_track_switches_reuse_warm_voices():
+    report = run("""
+await engine.prepare();
+[1, 2, 3, 4, 5, 6, 7, 8].forEach(track => engine.play(track));
+const warm = engine.audioContext.nodes.length;
+const pairs = [];
+let previous = engine.activeVoice;
+for (let i = 0; i < 100; i++) {
+  engine.play(1 + (i * 3) % 8);
+  const next = engine.activeVoice;
+  if (next !== previous) pairs.push([curves(previous).at(-1), curves(next).at(-1)]);
+  previous = next;
+}
+engine.stop();
+print({ warm, after: engine.audioContext.nodes.length, voices: Object.keys(engine.voices).length, pairs });
+""")
+    assert report['after'] == report['warm']
+    assert report['voices'] <= 5
+    assert len(report['pairs']) > 50
+    for outgoing, incoming in report['pairs']:
+        assert outgoing[0] == pytest.approx(1, abs=1e-6)
+        assert incoming[0] == pytest.approx(0, abs=1e-6)
+        for a, b in zip(outgoing, incoming):
+            assert math.hypot(a, b) == pytest.approx(1, abs=1e-5)
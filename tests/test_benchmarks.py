@@ -0,0 +1,64 @@
+"""Smoke runs of the Node benchmark scripts in ``benchmarks/`` at small sizes.
+
+The benchmarks load code from ``index.html`` (and from the baseline commit via
+git), so these tests are skipped outside a git checkout or where Node is
+not installed.
+"""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+BENCHMARKS = ROOT / 'benchmarks'
+
+pytestmark = pytest.mark.skipif(
+    shutil.which('node') is None or shutil.which('git') is None or not (ROOT / '.git').exists(),
+    reason='node and a git checkout are required',
+)
+
+
+def run(script, *args):
+    result = subprocess.run(
+        ['node', str(BENCHMARKS / script), *map(str, args)],
+        capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def test_sentiment():
+    report = run('sentiment.mjs', '--entries', 200, '--words', 20)
+    assert report['entries'] == 200
+    assert report['lexicon'] > 19
+    assert report['legacyMs'] > 0
+    assert report['currentMs'] > 0
+
+
+def test_search():
+    [report] = run('search.mjs', '--sizes', 2000, '--words', 12)
+    assert report['size'] == 2000
+    assert set(report['queries']) == {'prefix', 'terms', 'tag', 'range', 'combined'}
+    for query in report['queries'].values():
+        assert query['matchesNaive']
+        assert query['indexMs'] >= 0
+
+
+def test_encoding():
+    report = run('encoding.mjs', '--records', 1000)
+    assert report['records'] == 1000
+    assert report['bytes']['encoded'] < report['bytes']['json']
+    assert set(report['parseMs']) == {'json', 'encoded', 'encodedAnalytics'}
+
+
+def test_audio():
+    report = run('audio.mjs', '--seconds', 2)
+    tracks = {track['kind']: track for track in report['tracks']}
+    assert set(tracks) == {'ocean', 'rain', 'bowls', 'wind', 'calm'}
+    for kind in ('ocean', 'rain', 'wind'):
+        assert tracks[kind]['legacyProcessors'] == 1
+        assert tracks[kind]['legacyMsPerSecond'] > 0
+    assert all(track['currentProcessors'] == 0 for track in tracks.values())
@@ -0,0 +1,39 @@
+"""Size budget for the main module that reaches first paint.
+
+``index.html`` is the whole app module. Charts are imported on demand and the
+guide and article texts live in the content packs under ``content/``, so the
+module must stay under ``MAIN_MODULE_BUDGET`` bytes and must not import
+``recharts`` statically.
+"""
+
+import re
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MAIN_MODULE_BUDGET = 140 * 1024
+
+STATIC_IMPORT = re.compile(r"^import\b[^;]*?\bfrom\s+['\"](?P<module>[^'\"]+)['\"]", re.MULTILINE)
+
+
+def main_module():
+    return (ROOT / 'index.html').read_text(encoding='utf-8')
+
+
+def test_main_module_is_within_budget():
+    size = len(main_module().encode('utf-8'))
+    assert size <= MAIN_MODULE_BUDGET, f'index.html is {size} bytes, budget is {MAIN_MODULE_BUDGET}'
+
+
+def test_recharts_is_only_imported_on_demand():
+    source = main_module()
+    modules = [match.group('module') for match in STATIC_IMPORT.finditer(source)]
+    assert 'react' in modules
+    assert 'recharts' not in modules
+    assert "import('recharts')" in source
+
+
+def test_content_is_not_inlined():
+    source = main_module()
+    assert 'MEDITATION_GUIDES' not in source
+    assert 'LEARN_CONTENT' not in source
+    assert (ROOT / 'content' / 'manifest.json').exists()
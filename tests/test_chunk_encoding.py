@@ -0,0 +1,175 @@
+"""Round-trip checks for the columnar log chunk encoding in ``index.html``.
+
+The codec is sliced out of the page and run under Node, so these tests are
+skipped where Node is not installed.
+"""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+INDEX = Path(__file__).resolve().parent.parent / 'index.html'
+
+ROUND_TRIP = """
+let input = '';
+process.stdin.on('data', data => { input += data; });
+process.stdin.on('end', () => {
+  const chunks = JSON.parse(input);
+  process.stdout.write(JSON.stringify(chunks.map(records => {
+    const text = encodeChunk(records);
+    return { columns: JSON.parse(text).columns, records: decodeChunk(text), legacy: decodeChunk(JSON.stringify(records)) };
+  })));
+});
+"""
+
+LONG_TEXT = (
+    'Today started with a long meeting and I could feel my shoulders tightening before lunch. '
+    'After the breathing practice I noticed the tension ease, although my mind kept drifting back '
+    'to the deadline. Grateful for a quiet walk in the evening - calmer now, not perfect, but better. '
+    'Tomorrow: 10 minutes before class. सुकून \U0001F33F'
+)
+
+pytestmark = pytest.mark.skipif(shutil.which('node') is None, reason='node is not installed')
+
+
+def codec_source():
+    source = INDEX.read_text(encoding='utf-8')
+    return source[source.index('const CHUNK_ENCODING_VERSION'):source.index('class SegmentedLog')]
+
+
+def decode(text):
+    script = 'process.stdout.write(JSON.stringify(decodeChunk(process.argv[1])));'
+    result = subprocess.run(['node', '-e', codec_source() + script, text], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def round_trip(*chunks):
+    result = subprocess.run(
+        ['node', '-e', codec_source() + ROUND_TRIP],
+        input=json.dumps(chunks),
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def iso(day, minute):
+    return f'2024-03-{day:02d}T{minute // 60:02d}:{minute % 60:02d}:00.000Z'
+
+
+def sessions(count):
+    return [
+        {
+            'type': ['breathing', 'body-scan', 'mindfulness', 'loving-kindness'][i % 4],
+            'duration': [5, 10, 15][i % 3],
+            'moodBefore': 1 + i % 5,
+            'moodAfter': 1 + (i + 2) % 5,
+            'prePrompts': {'bringing': LONG_TEXT if i % 3 == 0 else '', 'feeling': 'anxious and tired', 'intention': 'to slow down'},
+            'postPrompts': {'feelingNow': LONG_TEXT[i:], 'emotions': 'calm, hopeful', 'oneWord': 'lighter'},
+            'id': 1709251200000 + i * 3600_000,
+            'date': iso(1 + i % 28, i * 7 % 1440),
+        }
+        for i in range(count)
+    ]
+
+
+def journals(count):
+    return [
+        {
+            'reflection': f'2024-03-{1 + i % 28:02d} was a hard day. {LONG_TEXT}' if i % 2 else LONG_TEXT[: 20 + i],
+            'mood': 1 + i % 5,
+            'tags': ['work', 'sleep'][: i % 3],
+            'type': 'Manual Entry',
+            'moodBefore': 1 + i % 5,
+            'moodAfter': 1 + i % 5,
+            'id': 1709251200000 + i * 60_000,
+            'date': iso(1 + i % 28, i * 11 % 1440),
+        }
+        for i in range(count)
+    ]
+
+
+def search_documents(records, kind):
+    return [
+        {
+            'ref': f'{kind}:{record["id"]}',
+            'kind': kind,
+            'date': record['date'],
+            'tags': record.get('tags', [record['type']]),
+            'label': record['type'],
+            'snippet': record.get('reflection', LONG_TEXT)[:120],
+            'tokens': sorted(set(record.get('reflection', LONG_TEXT).lower().split())),
+        }
+        for record in records
+    ]
+
+
+def test_session_chunks_round_trip():
+    records = sessions(50)
+    [result] = round_trip(records)
+    assert result['records'] == records
+    assert result['legacy'] == records
+    assert dict(result['columns'])['date'] == 'v'
+    assert dict(result['columns'])['id'] == 't'
+
+
+def test_journal_chunks_with_long_free_text_round_trip():
+    records = journals(50)
+    [result] = round_trip(records)
+    assert result['records'] == records
+
+
+def test_search_document_chunks_round_trip():
+    chunks = [search_documents(sessions(50), 'session'), search_documents(journals(50), 'journal')]
+    for chunk, result in zip(chunks, round_trip(*chunks)):
+        assert result['records'] == chunk
+        assert dict(result['columns'])['ref'] == 'v'
+
+
+def test_mixed_and_partial_chunks_round_trip():
+    records = journals(3) + [{'id': 1709251200001, 'date': iso(2, 5), 'tags': []}] + sessions(3)
+    [result] = round_trip(records, records[:1])[:1]
+    assert result['records'] == records
+
+
+def test_empty_and_filled_objects_share_a_column():
+    records = sessions(4)
+    records[1]['prePrompts'] = {}
+    records[3]['postPrompts'] = {}
+    [result] = round_trip(records)
+    assert result['records'] == records
+    paths = [path for path, _ in result['columns']]
+    assert 'prePrompts' in paths
+    assert 'postPrompts' in paths
+    assert not any(path.startswith(('prePrompts.', 'postPrompts.')) for path in paths)
+
+
+def test_explicit_nulls_round_trip():
+    records = journals(6)
+    records[0]['reflection'] = None
+    records[2]['tags'] = None
+    records[5]['mood'] = None
+    nested = sessions(3)
+    nested[1]['prePrompts']['feeling'] = None
+    nested[2]['postPrompts']['oneWord'] = None
+    for chunk, result in zip([records, nested], round_trip(records, nested)):
+        assert result['records'] == chunk
+
+
+def test_version_2_date_columns_still_decode():
+    chunk = {
+        'v': 2,
+        'base': 1709251200000,
+        'columns': [['id', 't'], ['date', 'd'], ['type', 's']],
+        'dict': ['calm'],
+        'rows': [[0, 0, 0], [3600000, 3600000, 0]],
+    }
+    assert decode(json.dumps(chunk)) == [
+        {'id': 1709251200000, 'date': '2024-03-01T00:00:00.000Z', 'type': 'calm'},
+        {'id': 1709254800000, 'date': '2024-03-01T01:00:00.000Z', 'type': 'calm'},
+    ]
@@ -0,0 +1,73 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cohort_analytics  # noqa: E402
+
+
+def session(id_, day, type_='calm', before=2, after=4):
+    return {'kind': 'session', 'id': id_, 'date': f'2024-03-{day:02d}T08:00:00.000Z', 'type': type_,
+            'duration': 10, 'moodBefore': before, 'moodAfter': after, 'prePrompts': {}, 'postPrompts': {}}
+
+
+def journal(id_, day):
+    return {'kind': 'journal', 'id': id_, 'date': f'2024-03-{day:02d}T09:00:00.000Z', 'type': 'Manual Entry',
+            'reflection': 'A long, quiet day.', 'tags': []}
+
+
+def export(path, sessions, journals=(), bookmarks=()):
+    records = [*sessions, *journals, *({'kind': 'bookmark', 'id': id_} for id_ in bookmarks)]
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records), encoding='utf-8')
+    return path
+
+
+def test_reexported_snapshots_only_count_new_sessions(tmp_path):
+    store = cohort_analytics.RollupStore(str(tmp_path / 'rollups.db'))
+    path = export(tmp_path / 'sukoon-history.ndjson', [session(i, 1 + i % 5) for i in range(10)],
+                  [journal(100, 1)], ['breathing-basics'])
+    counts = cohort_analytics.ingest_ndjson(store, path, 0, 'alice')
+    assert counts == {'sessions': 10, 'skipped': 2}
+
+    export(path, [session(i, 1 + i % 5) for i in range(14)], [journal(100, 1), journal(101, 2)], ['breathing-basics'])
+    counts = cohort_analytics.ingest_ndjson(store, path, 0, 'alice')
+    assert counts == {'sessions': 4, 'duplicates': 10, 'skipped': 3}
+
+    report = cohort_analytics.report(store, today=19_787)
+    assert report['users'] == 1
+    assert report['sessions'] == 14
+    assert report['totalMinutes'] == 140
+
+
+def test_bad_lines_are_counted_and_skipped(tmp_path):
+    store = cohort_analytics.RollupStore(str(tmp_path / 'rollups.db'))
+    path = tmp_path / 'alice.ndjson'
+    lines = [
+        json.dumps(session(1, 1)),
+        '{"kind": "session", "id": 2, "date": ',
+        json.dumps({**session(3, 1), 'moodBefore': [1]}),
+        json.dumps({**session(4, 1), 'date': 'yesterday'}),
+        json.dumps({**session(5, 1), 'id': 10**30}),
+        '[1, 2]',
+        json.dumps(session(6, 2)),
+        json.dumps(session(6, 2)),
+    ]
+    path.write_text('\n'.join(lines), encoding='utf-8')
+    counts = cohort_analytics.ingest_ndjson(store, path, 0, 'alice')
+    assert counts == {'sessions': 2, 'duplicates': 1, 'invalid': 5}
+
+
+def test_sessions_need_an_explicit_user(tmp_path):
+    store = cohort_analytics.RollupStore(str(tmp_path / 'rollups.db'))
+    (tmp_path / 'alice').mkdir()
+    alice = export(tmp_path / 'alice' / 'sukoon-history.ndjson', [session(1, 1), session(2, 2)])
+    bob = export(tmp_path / 'sukoon-history.ndjson', [session(1, 1), {**session(3, 3), 'user': 'carol'}])
+
+    assert cohort_analytics.ingest_ndjson(store, bob, 0) == {'unattributed': 1, 'sessions': 1}
+    assert cohort_analytics.ingest_ndjson(store, alice, 0, 'alice') == {'sessions': 2}
+    assert cohort_analytics.ingest_ndjson(store, bob, 0, 'bob') == {'sessions': 1, 'duplicates': 1}
+
+    report = cohort_analytics.report(store, today=19_786)
+    assert sorted(report['perUser']) == ['alice', 'bob', 'carol']
+    assert report['perUser']['alice']['sessions'] == 2
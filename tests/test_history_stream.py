@@ -0,0 +1,169 @@
+"""Streaming import and export of a large history through ``index.html``.
+
+``importHistory`` and ``createExportStream`` are sliced out of the page with
+``benchmarks/page.mjs`` and run under Node against an in-memory
+``window.storage``, so this test is skipped where Node is not installed.
+"""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+BENCHMARKS = Path(__file__).resolve().parent.parent / 'benchmarks'
+RECORDS = 500_000
+
+SCRIPT = f"""
+import {{ loadPage }} from '{(BENCHMARKS / 'page.mjs').as_uri()}';
+
+const records = Number(process.argv[1]);
+const store = new Map();
+const storage = {{
+  async get(key) {{
+    if (!store.has(key)) throw new Error(`missing ${{key}}`);
+    return {{ key, value: store.get(key) }};
+  }},
+  async set(key, value) {{
+    store.set(key, value);
+    return {{ key, value }};
+  }},
+  async delete(key) {{
+    store.delete(key);
+    return {{ key, deleted: true }};
+  }},
+  async list(prefix = '') {{
+    return {{ keys: [...store.keys()].filter(key => key.startsWith(prefix)) }};
+  }}
+}};
+const page = loadPage(['createExportStream', 'importHistory', 'sessionLog', 'journalLog', 'IMPORT_BATCH_SIZE'], {{
+  globals: {{
+    window: {{ storage }}, console, setTimeout, clearTimeout, performance, URL, Blob,
+    ReadableStream, TextEncoder, TextDecoder, TextEncoderStream, TextDecoderStream
+  }}
+}});
+
+let peak = 0;
+let calls = 0;
+const sample = () => {{
+  if (++calls % 200 !== 0) return;
+  global.gc();
+  peak = Math.max(peak, process.memoryUsage().heapUsed);
+}};
+const settle = () => {{
+  global.gc();
+  peak = 0;
+  return process.memoryUsage().heapUsed;
+}};
+
+const START = Date.UTC(2020, 0, 1);
+const line = (i) => {{
+  if (i % 1000 === 999) return '{{"kind":"session","id":"broken"}}';
+  const id = START + (i % 10 === 9 ? i - 2 : i);
+  const date = new Date(START + Math.floor(i / 20) * 86400000).toISOString();
+  return JSON.stringify(i % 2 === 0
+    ? {{ kind: 'session', id, date, type: 'calm', duration: 10, moodBefore: 2, moodAfter: 4 }}
+    : {{ kind: 'journal', id, date, mood: 3, reflection: 'Calmer after the evening walk, grateful for the quiet.', tags: ['walk'] }});
+}};
+
+const encoder = new TextEncoder();
+let next = 0;
+let inputBytes = 0;
+const input = new ReadableStream({{
+  pull(controller) {{
+    sample();
+    if (next >= records) {{
+      controller.close();
+      return;
+    }}
+    const lines = [];
+    for (const end = Math.min(records, next + 2000); next < end; next++) lines.push(line(next));
+    const chunk = encoder.encode(`${{lines.join('\\n')}}\\n`);
+    inputBytes += chunk.byteLength;
+    controller.enqueue(chunk);
+  }}
+}}, {{ highWaterMark: 1 }});
+
+let base = settle();
+const imports = [];
+const result = await page.importHistory(input, (progress) => {{
+  sample();
+  imports.push(progress);
+}});
+const importPeak = peak - base;
+
+base = settle();
+const exports = [];
+let exportBytes = 0;
+let exportLines = 0;
+const reader = page.createExportStream('ndjson', (progress) => exports.push(progress))
+  .pipeThrough(new TextEncoderStream())
+  .getReader();
+for (let chunk = await reader.read(); !chunk.done; chunk = await reader.read()) {{
+  sample();
+  exportBytes += chunk.value.byteLength;
+  exportLines += chunk.value.filter(byte => byte === 10).length;
+}}
+
+process.stdout.write(JSON.stringify({{
+  result,
+  imports,
+  exports,
+  batchSize: page.IMPORT_BATCH_SIZE,
+  lengths: [page.sessionLog.length, page.journalLog.length],
+  inputBytes,
+  exportBytes,
+  exportLines,
+  storeBytes: [...store.values()].reduce((sum, value) => sum + value.length, 0),
+  importPeak,
+  exportPeak: peak - base
+}}));
+"""
+
+pytestmark = pytest.mark.skipif(shutil.which('node') is None, reason='node is not installed')
+
+
+@pytest.fixture(scope='module')
+def report():
+    result = subprocess.run(
+        ['node', '--expose-gc', '--input-type=module', '-e', SCRIPT, str(RECORDS)],
+        capture_output=True, text=True, timeout=600,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+
+def test_import_counts_duplicates_and_invalid_lines(report):
+    invalid = RECORDS // 1000
+    duplicates = RECORDS // 10 - invalid
+    assert report['result'] == {
+        'lines': RECORDS,
+        'imported': RECORDS - duplicates - invalid,
+        'duplicates': duplicates,
+        'invalid': invalid,
+    }
+    assert sum(report['lengths']) == report['result']['imported']
+
+
+def test_progress_is_reported_per_batch(report):
+    imports = report['imports']
+    assert imports[-1] == report['result']
+    assert len(imports) >= (RECORDS - RECORDS // 1000) // report['batchSize']
+    for previous, current in zip(imports, imports[1:]):
+        assert current['lines'] >= previous['lines']
+        assert current['imported'] >= previous['imported']
+
+    exports = report['exports']
+    imported = report['result']['imported']
+    assert len(exports) > 100
+    assert all(progress['total'] == imported for progress in exports)
+    assert [progress['exported'] for progress in exports] == sorted(progress['exported'] for progress in exports)
+    assert exports[-1]['exported'] == imported
+    assert report['exportLines'] == imported
+
+
+def test_peak_heap_is_bounded(report):
+    assert report['importPeak'] - report['storeBytes'] < report['inputBytes'] / 2
+    assert report['exportPeak'] < 32 * 2**20
+    assert report['exportPeak'] < report['exportBytes'] / 4
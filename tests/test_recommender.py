@@ -0,0 +1,74 @@
+"""Offline evaluation of the session recommender via ``evaluate_recommender.mjs``.
+
+The script runs the model code from ``index.html`` under Node, so these tests
+are skipped where Node is not installed.
+"""
+
+import json
+import random
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parent.parent / 'evaluate_recommender.mjs'
+TYPES = ['calm', 'focus', 'healing', 'awareness', 'gratitude', 'balance', 'energy', 'sleep', 'release']
+
+pytestmark = pytest.mark.skipif(shutil.which('node') is None, reason='node is not installed')
+
+
+def run(*paths):
+    return subprocess.run(['node', str(SCRIPT), *map(str, paths)], capture_output=True, text=True, timeout=60)
+
+
+def write_history(path, count=600, seed=1):
+    rng = random.Random(seed)
+    with open(path, 'w') as f:
+        for i in range(count):
+            hour = rng.choice([7, 13, 21])
+            kind = rng.choice(TYPES)
+            before = rng.randint(1, 3)
+            helps = (kind == 'sleep' and hour == 21) or (kind == 'focus' and hour == 7)
+            gain = 2 if helps else rng.choice([0, 0, 1])
+            f.write(json.dumps({
+                'kind': 'session',
+                'id': 1700000000000 + i,
+                'date': f'2024-{1 + i // 60:02d}-{1 + i % 28:02d}T{hour:02d}:00:00.000Z',
+                'type': kind,
+                'duration': 10,
+                'moodBefore': before,
+                'moodAfter': min(5, before + gain),
+            }) + '\n')
+
+
+def test_model_beats_running_mean(tmp_path):
+    path = tmp_path / 'history.ndjson'
+    write_history(path)
+    result = run(path)
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout)
+    assert report['file'] == str(path)
+    assert report['sessions'] == 600
+    assert report['invalid'] == 0
+    assert report['followed'] > 0
+    assert report['followedDelta'] > report['otherDelta']
+    assert report['modelError'] < report['baselineError']
+
+
+def test_skips_other_kinds_and_counts_bad_lines(tmp_path):
+    path = tmp_path / 'history.ndjson'
+    write_history(path, count=50)
+    with open(path, 'a') as f:
+        f.write(json.dumps({'kind': 'journal', 'id': 1, 'date': '2024-01-01T00:00:00.000Z', 'reflection': 'x'}) + '\n')
+        f.write(json.dumps({'kind': 'session', 'id': 2, 'date': '2024-01-01T00:00:00.000Z'}) + '\n')
+        f.write('{not json\n\n')
+    report = json.loads(run(path).stdout)
+    assert report['sessions'] == 50
+    assert report['invalid'] == 2
+
+
+def test_usage_without_arguments():
+    result = run()
+    assert result.returncode == 2
+    assert 'usage' in result.stderr
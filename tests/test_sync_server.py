@@ -0,0 +1,137 @@
+import asyncio
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sync_server  # noqa: E402
+
+
+def session(id_, **fields):
+    return {'id': id_, 'date': '2024-03-01T08:00:00.000Z', 'type': 'calm', 'duration': 10,
+            'moodBefore': 2, 'moodAfter': 4, 'prePrompts': {'intention': 'rest'}, 'postPrompts': {}, **fields}
+
+
+def journal(id_, **fields):
+    return {'id': id_, 'date': '2024-03-01T09:00:00.000Z', 'type': 'Manual Entry', 'mood': 3,
+            'moodBefore': 3, 'moodAfter': 3, 'reflection': 'Slept better.', 'tags': ['sleep'], **fields}
+
+
+async def request(port, method, path, body=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    payload = body if isinstance(body, bytes) else json.dumps(body).encode() if body is not None else b''
+    writer.write(f'{method} {path} HTTP/1.1\r\nContent-Length: {len(payload)}\r\nConnection: close\r\n\r\n'.encode()
+                 + payload)
+    await writer.drain()
+    response = await asyncio.wait_for(reader.read(), 5)
+    writer.close()
+    head, _, content = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(content) if content else None
+
+
+def run_server(tmp_path, scenario, store=None):
+    async def main():
+        service = sync_server.SyncService(store or sync_server.SyncStore(str(tmp_path / 'sync.db')))
+        service.start()
+        server = await asyncio.start_server(
+            lambda reader, writer: sync_server.handle_connection(service, reader, writer), '127.0.0.1', 0
+        )
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await scenario(lambda *args: request(port, *args))
+        finally:
+            server.close()
+            await service.stop()
+
+    return asyncio.run(main())
+
+
+def test_changes_are_paged_by_cursor(tmp_path):
+    async def scenario(call):
+        status, _ = await call('POST', '/users/alice/sync', {'sessions': [session(i) for i in range(1, 1201)]})
+        assert status == 200
+        cursor, ids, pages = {}, [], 0
+        while True:
+            status, body = await call('POST', '/users/alice/sync', {'cursor': cursor})
+            assert status == 200
+            ids += [record['id'] for record in body['sessions']]
+            cursor, pages = body['cursor'], pages + 1
+            if not body['more']:
+                return ids, pages
+
+    ids, pages = run_server(tmp_path, scenario)
+    assert ids == list(range(1, 1201))
+    assert pages == 3
+
+
+def test_pushes_are_idempotent_and_per_user(tmp_path):
+    async def scenario(call):
+        push = {'sessions': [session(1), session(2)], 'journals': [journal(1)], 'bookmarks': ['breathing-basics']}
+        _, first = await call('POST', '/users/alice/sync', push)
+        _, again = await call('POST', '/users/alice/sync', {**push, 'cursor': first['cursor']})
+        _, bob = await call('POST', '/users/bob/sync', {'sessions': [session(1, type='focus')]})
+        return first, again, bob
+
+    first, again, bob = run_server(tmp_path, scenario)
+    assert [record['id'] for record in first['sessions']] == [1, 2]
+    assert first['journals'] == [journal(1)]
+    assert first['bookmarks'] == ['breathing-basics']
+    assert again['sessions'] == [] and again['journals'] == []
+    assert again['cursor']['sessions'] == first['cursor']['sessions']
+    assert [record['type'] for record in bob['sessions']] == ['focus']
+
+
+def test_invalid_requests_get_400(tmp_path):
+    bad_bodies = [
+        b'{not json',
+        [1, 2],
+        {'cursor': [1]},
+        {'cursor': {'sessions': 10**30}},
+        {'sessions': {'id': 1}},
+        {'sessions': [session(10**30)]},
+        {'sessions': [session(1, moodBefore='2')]},
+        {'sessions': [session(1, prePrompts=['a'])]},
+        {'journals': [journal(1, moodBefore=[1])]},
+        {'journals': [journal(1, reflection=5)]},
+        {'journals': [journal(1, tags=[{'a': 1}])]},
+        {'bookmarks': 'breathing-basics'},
+    ]
+
+    async def scenario(call):
+        responses = [await call('POST', '/users/alice/sync', body) for body in bad_bodies]
+        _, after = await call('POST', '/users/alice/sync', {})
+        return responses, after
+
+    responses, after = run_server(tmp_path, scenario)
+    assert [status for status, _ in responses] == [400] * len(bad_bodies)
+    assert all(body['error'] for _, body in responses)
+    assert after['sessions'] == [] and after['journals'] == []
+
+
+def test_unknown_routes_get_404_and_health_is_ok(tmp_path):
+    async def scenario(call):
+        return [
+            await call('GET', '/health'),
+            await call('GET', '/users/alice/sync'),
+            await call('POST', '/users/alice'),
+            await call('POST', '/nowhere/alice/sync'),
+        ]
+
+    responses = run_server(tmp_path, scenario)
+    assert responses[0] == (200, {'status': 'ok'})
+    assert [status for status, _ in responses[1:]] == [404, 404, 404]
+
+
+def test_storage_errors_get_500(tmp_path):
+    class BrokenStore(sync_server.SyncStore):
+        def write_batch(self, pushes):
+            raise sqlite3.OperationalError('database is locked')
+
+    async def scenario(call):
+        return await call('POST', '/users/alice/sync', {'sessions': [session(1)]})
+
+    status, body = run_server(tmp_path, scenario, BrokenStore(str(tmp_path / 'sync.db')))
+    assert status == 500
+    assert 'database is locked' in body['error']